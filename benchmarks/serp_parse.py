@@ -0,0 +1,231 @@
+"""
+Search result page parsing benchmark
+
+Compares the lxml parsers in `meowdock.cmd.search.scrapers.parsers` with the BeautifulSoup
+(`html.parser`) parsers they replaced: checks that both produce the same results for every
+page, then measures pages parsed per second.
+
+Saved result pages can be passed with --fixtures, a directory of `baidu*.html` and
+`bing*.html` files (e.g. saved from the browser with "Save page as, HTML only"). Without it,
+generated pages shaped like real result pages are used.
+
+Usage:
+    python benchmarks/serp_parse.py
+    python benchmarks/serp_parse.py --fixtures ./serp_pages --iterations 50
+"""
+
+import argparse
+import glob
+import os
+import random
+import time
+from typing import Callable, Dict, List, Tuple
+
+import bs4
+
+from meowdock.cmd.search.scrapers.base import SearchResult
+from meowdock.cmd.search.scrapers.parsers import parse_baidu_page, parse_bing_page
+
+
+def legacy_parse_baidu(html: str) -> List[SearchResult]:
+    """`BaiduScraper._parse_page` before the lxml parsers"""
+    results = []
+    rank = 1
+    soup = bs4.BeautifulSoup(html, "html.parser")
+    for result_div in soup.select('#content_left > div'):
+        h3_tag = result_div.find('h3')
+        if not h3_tag:
+            continue
+        link_tag = h3_tag.find('a', href=True)
+        if not link_tag:
+            continue
+        link = link_tag['href']
+        title = link_tag.get_text().strip()
+        snippet = ""
+        snippet_candidates = [
+            result_div.find('div', {'class': 'c-abstract'}),
+            result_div.find('div', {'class': 'content-right'}),
+            result_div.find('div', {'class': 'c-span9'}),
+            result_div.find('span', {'class': 'content-right_8Zs40'}),
+            result_div.find('div', {'class': 'c-row'}),
+            result_div.find('p'),
+        ]
+        for candidate in snippet_candidates:
+            if candidate:
+                snippet = candidate.get_text().strip()
+                if snippet:
+                    break
+        if not snippet:
+            for h3 in result_div.find_all('h3'):
+                h3.decompose()
+            full_text = result_div.get_text().strip()
+            if full_text:
+                snippet = full_text[:150].strip()
+        results.append(SearchResult(rank, link, title, snippet))
+        rank += 1
+    return results
+
+
+def legacy_parse_bing(html: str) -> List[SearchResult]:
+    """`BingScraper._parse_page` before the lxml parsers"""
+    results = []
+    rank = 1
+    soup = bs4.BeautifulSoup(html, "html.parser")
+    for block in soup.find_all("li", attrs={"class": "b_algo"}):
+        link = block.find("a", href=True)
+        if link:
+            link = link["href"]
+        if not link:
+            continue
+        title = block.find("h2")
+        if title:
+            title = title.get_text()
+        description = block.find("div", {"class": "b_caption"})
+        if description:
+            description = description.find("p")
+            if description:
+                description = description.get_text()
+        results.append(SearchResult(rank, link, title, description))
+        rank += 1
+    return results
+
+
+PARSERS: Dict[str, Tuple[Callable[[str], List[SearchResult]], Callable[[str], List[SearchResult]]]] = {
+    "baidu": (legacy_parse_baidu, parse_baidu_page),
+    "bing": (legacy_parse_bing, parse_bing_page),
+}
+
+_WORDS = "搜索 结果 页面 解析 性能 测试 数据 网络 内容 新闻 search result page parser benchmark".split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return "，".join(" ".join(rng.choice(_WORDS) for _ in range(4)) for _ in range(words // 4))
+
+
+def _page_chrome(rng: random.Random, body: str) -> str:
+    """Wrap results in the scripts, styles and navigation that make up most of a real page"""
+    style = "".join(f".c{i}{{margin:{i}px;color:#{i:06x}}}" for i in range(3000))
+    script = "".join(f"var v{i}='{_sentence(rng, 8)}';" for i in range(400))
+    nav = "".join(f'<li><a href="/nav/{i}">{rng.choice(_WORDS)}</a></li>' for i in range(80))
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>benchmark</title>"
+        f"<style>{style}</style><script>{script}</script></head><body>"
+        f"<div id='head'><ul>{nav}</ul></div>{body}"
+        f"<div id='foot'><script>{script}</script></div></body></html>"
+    )
+
+
+def generate_baidu_page(rng: random.Random) -> str:
+    blocks = []
+    for i in range(10):
+        title = f"<em>{rng.choice(_WORDS)}</em> {_sentence(rng, 8)} &amp; {i}"
+        kind = i % 5
+        if kind == 0:
+            snippet = f"<div class='c-abstract c-gap'><span>2024年5月1日</span> {_sentence(rng, 40)}</div>"
+        elif kind == 1:
+            snippet = f"<span class='content-right_8Zs40 c-line'>{_sentence(rng, 40)}</span>"
+        elif kind == 2:
+            snippet = f"<div class='c-row'><div class='c-span9'>{_sentence(rng, 40)}</div></div>"
+        elif kind == 3:
+            snippet = f"<p>{_sentence(rng, 40)}<script>var x = 1;</script></p>"
+        else:
+            snippet = f"<div class='source'><span>{_sentence(rng, 60)}</span></div>"
+        blocks.append(
+            f"<div class='result c-container' id='{i + 1}'>"
+            f"<div class='c-tools'><script>var t = {i};</script></div>"
+            f"<h3 class='t'><a href='http://www.baidu.com/link?url=abc{i}' target='_blank'>{title}</a></h3>"
+            f"{snippet}<div class='c-row source'><a href='/s?tn=x'>{rng.choice(_WORDS)}</a></div></div>"
+        )
+    blocks.append("<div class='result-op'><div>related searches without a heading</div></div>")
+    return _page_chrome(rng, f"<div id='wrapper'><div id='content_left'>{''.join(blocks)}</div></div>")
+
+
+def generate_bing_page(rng: random.Random) -> str:
+    blocks = []
+    for i in range(10):
+        caption = (
+            f"<div class='b_caption'><div class='b_attribution'><cite>example.com/{i}</cite></div>"
+            f"<p class='b_lineclamp2'><span class='news_dt'>May 1, 2024</span> &middot; {_sentence(rng, 40)}</p></div>"
+            if i % 4
+            else f"<div class='b_caption'><div>{_sentence(rng, 20)}</div></div>"
+        )
+        blocks.append(
+            f"<li class='b_algo' data-id='{i}'><div class='b_tpcn'><a href='https://example.com/{i}'>"
+            f"<div class='tptt'>Example</div></a></div>"
+            f"<h2><a href='https://example.com/{i}'>{_sentence(rng, 8)} <strong>{i}</strong></a></h2>"
+            f"{caption}</li>"
+        )
+    blocks.append("<li class='b_ans'><h2>Related searches</h2></li>")
+    return _page_chrome(rng, f"<ol id='b_results'>{''.join(blocks)}</ol>")
+
+
+def load_fixtures(directory: str) -> List[Tuple[str, str, str]]:
+    fixtures = []
+    for engine in PARSERS:
+        for path in sorted(glob.glob(os.path.join(directory, f"{engine}*.html"))):
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                fixtures.append((engine, os.path.basename(path), f.read()))
+    return fixtures
+
+
+def generate_fixtures(count: int) -> List[Tuple[str, str, str]]:
+    rng = random.Random(42)
+    fixtures = []
+    for i in range(count):
+        fixtures.append(("baidu", f"generated-baidu-{i}", generate_baidu_page(rng)))
+        fixtures.append(("bing", f"generated-bing-{i}", generate_bing_page(rng)))
+    return fixtures
+
+
+def _as_tuples(results: List[SearchResult]) -> List[Tuple]:
+    return [(r.rank, r.link, r.title, r.snippet) for r in results]
+
+
+def _pages_per_second(parse: Callable[[str], List[SearchResult]], pages: List[str], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for html in pages:
+            parse(html)
+    return iterations * len(pages) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search result page parsers")
+    parser.add_argument("--fixtures", help="Directory with saved baidu*.html and bing*.html pages")
+    parser.add_argument("--generated", type=int, default=5, help="Pages per engine to generate without --fixtures")
+    parser.add_argument("--iterations", type=int, default=20, help="Passes over the pages per parser")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else generate_fixtures(args.generated)
+    if not fixtures:
+        parser.error(f"No baidu*.html or bing*.html files in {args.fixtures}")
+
+    mismatches = 0
+    for engine, name, html in fixtures:
+        legacy, current = PARSERS[engine]
+        expected, actual = _as_tuples(legacy(html)), _as_tuples(current(html))
+        if expected != actual:
+            mismatches += 1
+            print(f"MISMATCH {name}: {len(expected)} legacy results, {len(actual)} lxml results")
+            for old, new in zip(expected, actual):
+                if old != new:
+                    print(f"  legacy: {old!r}\n  lxml:   {new!r}")
+                    break
+
+    print(f"{'engine':<8}{'pages':>7}{'KiB/page':>10}{'bs4 pages/s':>14}{'lxml pages/s':>14}{'speedup':>9}")
+    for engine, (legacy, current) in PARSERS.items():
+        pages = [html for e, _, html in fixtures if e == engine]
+        if not pages:
+            continue
+        size = sum(len(html.encode("utf-8")) for html in pages) / len(pages) / 1024
+        old = _pages_per_second(legacy, pages, args.iterations)
+        new = _pages_per_second(current, pages, args.iterations)
+        print(f"{engine:<8}{len(pages):>7}{size:>10.0f}{old:>14.1f}{new:>14.1f}{new / old:>8.1f}x")
+
+    if mismatches:
+        raise SystemExit(f"{mismatches} of {len(fixtures)} pages parsed differently")
+    print(f"All {len(fixtures)} pages parsed identically")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from typing import List, Union, Dict, Any, Optional
 import json
 
 from meowdock.docking.docking_factory import DockingFactory
+from meowdock.docking.search import SearchDocking
 from meowdock.cmd.execute.executors.executors_factory import get_executor
 
 
@@ -11,6 +12,9 @@ async def async_deepsearch(
     engines: Union[List[str], str] = ["baidu", "bing"],
     count: int = 10,
     executor: str = "yuanbao",
+    fetch_deadline: Optional[float] = 30.0,
+    use_cache: bool = True,
+    fetch_engine: str = "auto",
     **kwargs,
 ) -> str:
     """
@@ -21,6 +25,10 @@ async def async_deepsearch(
         engines: Search engine or list of engines to use
         count: Total number of results to get
         executor: Executor for processing results, default is 'yuanbao'
+        fetch_deadline: Time budget for fetching the result pages of all search engines
+            together (seconds), pages not fetched in time are represented by their search snippet
+        use_cache: Whether to use the on-disk search and fetch caches
+        fetch_engine: Engine for fetching result pages: 'auto', 'http' or 'browser'
         **kwargs: Additional search parameters
 
     Returns:
@@ -32,19 +40,38 @@ async def async_deepsearch(
     # Ensure engines is a list type
     engines_list = [engines] if isinstance(engines, str) else engines
 
-    # Create multiple search tasks
-    tasks = []
+    # Search engines are handled by one docking, so that their results are fetched together
+    # and pages found by several engines (syndicated copies, mirrors) are collapsed across them
+    search_engines = []
+    other_dockings = []
     for engine in engines_list:
         # Get corresponding docking instance based on engine type
         docking = factory.get_docking(engine)
-        if docking:
-            # Create async task
-            task = asyncio.create_task(
-                asyncio.to_thread(
-                    docking.run, query, count=count // len(engines_list) + 1, **kwargs
-                )
+        if isinstance(docking, SearchDocking):
+            search_engines.append(engine)
+        elif docking:
+            other_dockings.append(docking)
+
+    per_engine_count = count // len(engines_list) + 1
+    tasks = []
+    if search_engines:
+        docking = SearchDocking(
+            search_engines,
+            fetch_deadline=fetch_deadline,
+            use_cache=use_cache,
+            fetch_engine=fetch_engine,
+        )
+        tasks.append(
+            asyncio.create_task(
+                asyncio.to_thread(docking.run, query, count=per_engine_count, **kwargs)
             )
-            tasks.append(task)
+        )
+    for docking in other_dockings:
+        # Create async task
+        task = asyncio.create_task(
+            asyncio.to_thread(docking.run, query, count=per_engine_count, **kwargs)
+        )
+        tasks.append(task)
 
     # Return empty result if no valid search engines
     if not tasks:
@@ -70,6 +97,9 @@ def deepsearch(
     engines: Union[List[str], str] = ["baidu", "bing"],
     count: int = 10,
     executor: str = "yuanbao",
+    fetch_deadline: Optional[float] = 30.0,
+    use_cache: bool = True,
+    fetch_engine: str = "auto",
     **kwargs,
 ) -> str:
     """
@@ -81,11 +111,24 @@ def deepsearch(
         engines: Search engine or list of engines to use
         count: Total number of results to get
         executor: Executor for processing results, default is 'yuanbao'
+        fetch_deadline: Time budget for fetching the result pages of all search engines
+            together (seconds), pages not fetched in time are represented by their search snippet
+        use_cache: Whether to use the on-disk search and fetch caches
+        fetch_engine: Engine for fetching result pages: 'auto', 'http' or 'browser'
         **kwargs: Additional search parameters
 
     Returns:
         Formatted search results
     """
     return asyncio.run(
-        async_deepsearch(query=query, engines=engines, count=count, executor=executor, **kwargs)
+        async_deepsearch(
+            query=query,
+            engines=engines,
+            count=count,
+            executor=executor,
+            fetch_deadline=fetch_deadline,
+            use_cache=use_cache,
+            fetch_engine=fetch_engine,
+            **kwargs,
+        )
     )
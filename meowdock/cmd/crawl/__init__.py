@@ -0,0 +1,4 @@
+# meowdock/cmd/crawl/__init__.py
+from .crawler import Crawler
+
+__all__ = ["Crawler"]
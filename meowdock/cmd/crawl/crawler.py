@@ -0,0 +1,262 @@
+"""
+Link-following crawler
+
+Starts from seed URLs and follows the links of every fetched page, breadth-first per host, up
+to a maximum depth and number of pages. All pages go through one `Fetcher`, so the browser
+pool, the HTTP fast path and the per-host scheduling are shared by the whole crawl instead of
+being set up again for every layer. Results are appended to a JSON Lines file as they arrive,
+and the frontier is saved to a state file so that an interrupted crawl can be resumed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from collections import deque
+from contextlib import nullcontext
+from dataclasses import asdict, replace
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from meowdock.cmd.fetch.fetcher import Fetcher, FetchOptions
+from meowdock.library.utils.fileio import atomic_write_json
+from meowdock.library.utils.url import get_host, normalize_url, registrable_domain
+
+
+# Links to files that are not web pages
+_SKIPPED_EXTENSIONS = {
+    ".7z", ".apk", ".avi", ".bin", ".bmp", ".css", ".dmg", ".doc", ".docx", ".exe", ".flv",
+    ".gif", ".gz", ".ico", ".iso", ".jpeg", ".jpg", ".js", ".m4a", ".mkv", ".mov", ".mp3",
+    ".mp4", ".msi", ".pdf", ".png", ".ppt", ".pptx", ".rar", ".svg", ".tar", ".tgz", ".wav",
+    ".webm", ".webp", ".woff", ".woff2", ".xls", ".xlsx", ".xml", ".zip",
+}
+
+
+def url_key(url: str) -> int:
+    """64-bit key of the normalized URL, the seen-set holds these instead of the URLs"""
+    digest = hashlib.blake2b(normalize_url(url).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def is_crawlable(url: str) -> bool:
+    """Whether a link points to something that may be a web page"""
+    try:
+        parts = urlsplit(url)
+        # Raises ValueError for ports that are not numbers or out of range
+        parts.port
+    except ValueError:
+        return False
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return False
+    path = parts.path.lower()
+    return os.path.splitext(path)[1] not in _SKIPPED_EXTENSIONS
+
+
+class Frontier:
+    """
+    URLs waiting to be fetched, with one FIFO queue per host.
+
+    Iterating hands out URLs round-robin over the hosts, so a site with many links does not
+    hold back the others (the per-host limits of the fetcher would otherwise leave most of
+    the window waiting for one host). Iteration stops when the frontier is empty but can be
+    continued after more URLs were added, which is what `Fetcher.fetch_iter` relies on.
+    """
+
+    def __init__(self):
+        self._queues: Dict[str, Deque[Tuple[str, int]]] = {}
+        self._hosts: Deque[str] = deque()
+        self._size = 0
+        self.limit: Optional[int] = None  # Stop handing out URLs after this many
+        self.handed_out = 0
+        # URL and depth of every handed-out URL that has not finished yet, by position
+        self.in_flight: Dict[int, Tuple[str, int]] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, url: str, depth: int) -> None:
+        host = get_host(url)
+        queue = self._queues.get(host)
+        if queue is None:
+            queue = self._queues[host] = deque()
+            self._hosts.append(host)
+        queue.append((url, depth))
+        self._size += 1
+
+    def entries(self) -> List[Tuple[str, int]]:
+        """Every queued URL with its depth, in-flight URLs first"""
+        entries = list(self.in_flight.values())
+        for queue in self._queues.values():
+            entries.extend(queue)
+        return entries
+
+    def __iter__(self) -> "Frontier":
+        return self
+
+    def __next__(self) -> str:
+        if not self._hosts or (self.limit is not None and self.handed_out >= self.limit):
+            raise StopIteration
+        host = self._hosts.popleft()
+        queue = self._queues[host]
+        url, depth = queue.popleft()
+        if queue:
+            self._hosts.append(host)
+        else:
+            del self._queues[host]
+        self._size -= 1
+        self.in_flight[self.handed_out] = (url, depth)
+        self.handed_out += 1
+        return url
+
+
+class Crawler:
+    """
+    Crawl from seed URLs into a JSON Lines file.
+
+    Every line is a fetch result with the `depth` at which the page was found (0 for seeds)
+    and the `links` of the page. A URL is only fetched once, after normalization (see
+    `normalize_url`); the final URL of a redirect counts as seen as well.
+
+    Usage:
+        crawler = Crawler(["https://example.com/"], "pages.jsonl", max_depth=2, max_pages=500)
+        success, fail = await crawler.run()
+    """
+
+    def __init__(
+        self,
+        seeds: Iterable[str],
+        output: str,
+        state: Optional[str] = None,
+        options: Optional[FetchOptions] = None,
+        max_depth: int = 2,
+        max_pages: Optional[int] = 100,
+        same_domain: bool = True,
+        concurrency: int = 5,
+        window: Optional[int] = None,
+        state_every: int = 50,
+        fetcher: Optional[Fetcher] = None,
+    ):
+        """
+        Args:
+            seeds: URLs to start from
+            output: JSON Lines file the results are appended to
+            state: State file (frontier and seen-set), defaults to `<output>.state`
+            options: Fetch options, `collectLinks` is always enabled
+            max_depth: Follow links up to this many hops from the seeds
+            max_pages: Stop after fetching this many pages, None for no limit
+            same_domain: Only follow links within the registrable domains of the seeds
+            concurrency: Maximum number of pages fetched at the same time
+            window: Maximum number of URLs in flight, defaults to four times `concurrency`
+            state_every: Save the state after this many results
+            fetcher: Fetcher to use (not closed by the crawler), defaults to a new one
+        """
+        self.seeds = [url.strip() for url in seeds if url.strip()]
+        self.output = output
+        self.state_path = state or f"{output}.state"
+        self.options = replace(options or FetchOptions(), collectLinks=True)
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.same_domain = same_domain
+        self.concurrency = concurrency
+        self.window = window or concurrency * 4
+        self.state_every = state_every
+        self.fetcher = fetcher
+
+        self.frontier = Frontier()
+        self.seen: Set[int] = set()
+        self.fetched = 0
+        self._domains: Set[str] = set()
+
+    def _allowed(self, url: str) -> bool:
+        if not is_crawlable(url):
+            return False
+        return not self.same_domain or registrable_domain(url) in self._domains
+
+    def _enqueue(self, url: str, depth: int) -> None:
+        if not self._allowed(url):
+            return
+        key = url_key(url)
+        if key in self.seen:
+            return
+        self.seen.add(key)
+        self.frontier.add(url, depth)
+
+    def _load_state(self) -> bool:
+        """Load the state file, returns False if there is none"""
+        if not os.path.exists(self.state_path):
+            return False
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self._domains.update(data.get("domains", []))
+        self.seen = set(data.get("seen", []))
+        self.fetched = data.get("fetched", 0)
+        for url, depth in data.get("frontier", []):
+            self.frontier.add(url, depth)
+        return True
+
+    def save_state(self) -> None:
+        """Write the state atomically; URLs that are still being fetched go back to the frontier"""
+        try:
+            atomic_write_json(
+                self.state_path,
+                {
+                    "domains": sorted(self._domains),
+                    "fetched": self.fetched,
+                    "frontier": self.frontier.entries(),
+                    "seen": list(self.seen),
+                },
+            )
+        except OSError as e:
+            logging.warning(f"Failed to save crawl state {self.state_path}: {str(e)}")
+
+    async def run(self, restart: bool = False) -> Tuple[int, int]:
+        """
+        Run (or resume) the crawl.
+
+        Args:
+            restart: Ignore an existing state file and overwrite the output
+
+        Returns:
+            Number of successful and failed fetches in this run
+        """
+        resumed = not restart and self._load_state()
+        if resumed:
+            logging.info(
+                f"Resuming crawl after {self.fetched} pages, {len(self.frontier)} URLs in the frontier"
+            )
+        self._domains.update(registrable_domain(url) for url in self.seeds)
+        for url in self.seeds:
+            self._enqueue(url, 0)
+        if self.max_pages is not None:
+            self.frontier.limit = max(self.max_pages - self.fetched, 0)
+
+        success_count = fail_count = 0
+        out = open(self.output, "a" if resumed else "w", encoding="utf-8")
+        try:
+            # An injected fetcher stays open for the caller
+            fetcher_context = nullcontext(self.fetcher) if self.fetcher is not None else Fetcher()
+            async with fetcher_context as fetcher:
+                async for result in fetcher.fetch_iter(
+                    self.frontier, self.options, self.concurrency, self.window
+                ):
+                    url, depth = self.frontier.in_flight.pop(result.index)
+                    if result.link and result.link != url:
+                        self.seen.add(url_key(result.link))
+                    if depth < self.max_depth:
+                        for link in result.links:
+                            self._enqueue(link, depth + 1)
+
+                    result.index = self.fetched
+                    out.write(json.dumps({**asdict(result), "depth": depth}, ensure_ascii=False) + "\n")
+                    self.fetched += 1
+                    if result.success:
+                        success_count += 1
+                    else:
+                        fail_count += 1
+                    if (success_count + fail_count) % self.state_every == 0:
+                        out.flush()
+                        self.save_state()
+        finally:
+            out.close()
+            self.save_state()
+        return success_count, fail_count
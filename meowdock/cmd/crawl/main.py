@@ -0,0 +1,86 @@
+import asyncio
+from typing import List, Optional
+import typer
+from typing_extensions import Annotated
+
+from meowdock.cmd.crawl.crawler import Crawler
+from meowdock.cmd.fetch.fetcher import FetchOptions
+
+app = typer.Typer(help="Crawl web pages by following links")
+
+
+@app.command()
+def crawl(
+    seeds: Annotated[List[str], typer.Argument(help="URLs to start from")],
+    output: Annotated[str, typer.Option(help="JSON Lines file the results are appended to")] = "crawl.jsonl",
+    state: Annotated[
+        Optional[str], typer.Option(help="State file for resuming (default: <output>.state)")
+    ] = None,
+    restart: Annotated[
+        bool, typer.Option(help="Ignore an existing state file and overwrite the output")
+    ] = False,
+    max_depth: Annotated[int, typer.Option(help="Follow links up to this many hops from the seeds")] = 2,
+    max_pages: Annotated[
+        int, typer.Option(help="Stop after fetching this many pages (0 for no limit)")
+    ] = 100,
+    same_domain: Annotated[
+        bool, typer.Option(help="Only follow links within the domains of the seeds")
+    ] = True,
+    concurrency: Annotated[int, typer.Option(help="Maximum number of concurrent fetches")] = 5,
+    timeout: Annotated[int, typer.Option(help="Timeout in milliseconds")] = 30000,
+    extract_content: Annotated[bool, typer.Option(help="Whether to extract main content")] = True,
+    max_length: Annotated[
+        Optional[int], typer.Option(help="Maximum length of returned content")
+    ] = None,
+    engine: Annotated[
+        str, typer.Option(help="Fetch engine: 'browser', 'http', or 'auto' (HTTP first, browser fallback)")
+    ] = "auto",
+    per_host_concurrency: Annotated[
+        int, typer.Option(help="Maximum number of concurrent fetches per host")
+    ] = 2,
+    per_host_interval: Annotated[
+        int, typer.Option(help="Minimum time between fetches to the same host (milliseconds)")
+    ] = 500,
+    retries: Annotated[
+        int, typer.Option(help="Retries for timeouts and 5xx responses")
+    ] = 1,
+    debug: Annotated[bool, typer.Option(help="Whether to enable debug mode")] = False,
+):
+    """Crawl from seed URLs into a JSON Lines file
+
+    An interrupted crawl continues from its saved frontier when started again with the same output.
+    """
+    if engine not in ["auto", "http", "browser"]:
+        typer.echo(f"Error: engine must be one of 'auto', 'http', 'browser'", err=True)
+        raise typer.Exit(1)
+
+    options = FetchOptions(
+        timeout=timeout,
+        extractContent=extract_content,
+        maxLength=max_length,
+        engine=engine,  # type: ignore
+        perHostConcurrency=per_host_concurrency,
+        perHostInterval=per_host_interval,
+        retries=retries,
+        debug=debug,
+    )
+    crawler = Crawler(
+        seeds,
+        output,
+        state,
+        options,
+        max_depth=max_depth,
+        max_pages=max_pages or None,
+        same_domain=same_domain,
+        concurrency=concurrency,
+    )
+    try:
+        success_count, fail_count = asyncio.run(crawler.run(restart))
+    except KeyboardInterrupt:
+        typer.echo(f"Interrupted, run again to resume from {crawler.state_path}", err=True)
+        raise typer.Exit(130)
+    typer.echo(
+        f"Crawl completed: {success_count} successful, {fail_count} failed, "
+        f"{len(crawler.frontier)} URLs left in the frontier",
+        err=True,
+    )
@@ -0,0 +1,122 @@
+"""
+On-disk fetch cache
+
+Stores extracted page content in a size-bounded SQLite database, together with the HTTP
+validators needed to revalidate stale entries with a conditional request.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from meowdock.library.utils.sqlite_cache import SQLiteCache
+from meowdock.library.utils.url import normalize_url
+
+
+FETCH_CACHE_PATH = os.getenv('FETCH_CACHE_PATH', 'cache/fetch_cache.sqlite3')
+
+
+@dataclass
+class CacheEntry:
+    """A cached fetch"""
+
+    key: str
+    url: str
+    link: Optional[str]
+    status: Optional[int]
+    content: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    engine: Optional[str]
+    fetched_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.fetched_at <= ttl
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class FetchCache(SQLiteCache):
+    """
+    LRU cache of fetch results on disk.
+
+    Entries are keyed by the normalized URL plus the fetch options that change the content.
+    When the total content size exceeds `max_bytes`, the least recently used entries are evicted.
+    """
+
+    table = "fetch_cache"
+    columns = """url TEXT NOT NULL,
+                    link TEXT,
+                    status INTEGER,
+                    content TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    engine TEXT,
+                    fetched_at REAL NOT NULL"""
+    label = "Fetch cache"
+
+    def __init__(self, path: str = FETCH_CACHE_PATH, max_bytes: int = 512 * 1024 * 1024):
+        super().__init__(path, max_bytes)
+
+    @staticmethod
+    def make_key(url: str, variant: Dict[str, Any]) -> str:
+        """Build a cache key from a URL and the option values that affect the content"""
+        raw = normalize_url(url) + "\n" + json.dumps(variant, sort_keys=True)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            row = self.conn.execute(
+                'SELECT key, url, link, status, content, etag, last_modified, engine, fetched_at '
+                'FROM fetch_cache WHERE key = ?',
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._mark_used(key)
+            return CacheEntry(*row)
+        except sqlite3.Error as e:
+            logging.warning(f"Fetch cache read failed: {str(e)}")
+            return None
+
+    def put(self, entry: CacheEntry) -> None:
+        self._insert(
+            (
+                entry.key,
+                entry.url,
+                entry.link,
+                entry.status,
+                entry.content,
+                entry.etag,
+                entry.last_modified,
+                entry.engine,
+                entry.fetched_at,
+                time.time(),
+                len(entry.content.encode("utf-8")),
+            )
+        )
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as freshly validated"""
+        now = time.time()
+        try:
+            self.conn.execute(
+                'UPDATE fetch_cache SET fetched_at = ?, accessed_at = ? WHERE key = ?',
+                (now, now, key),
+            )
+            self.conn.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"Fetch cache write failed: {str(e)}")
@@ -2,26 +2,48 @@ import asyncio
 import logging
 import os
 import re
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Union, Literal
+import time
+from dataclasses import dataclass, field, replace
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, Sized, Tuple, Union, Literal
 
-from playwright.async_api import async_playwright, Page, Browser, BrowserContext, Response
+from playwright.async_api import Page, Browser, BrowserContext, Response
 from contextlib import asynccontextmanager
 
 # Import shared libraries
 from meowdock.library.browser import (
     init_logger,
     extract_main_content,
-    abort_resource,
+    run_extraction,
+    extraction_context,
     get_moderate_resources,
-    find_chromium,
-    get_cookies,
+    get_blocklist,
+    BlockList,
+    BrowserPool,
+    PooledPage,
+    wait_for_content,
+    prune_page,
+    extract_in_browser,
 )
+from meowdock.cmd.fetch.http_client import (
+    HttpClient,
+    HttpResponse,
+    extract_links,
+    html_to_text,
+    needs_rendering,
+)
+from meowdock.cmd.fetch.cache import CacheEntry, FetchCache
+from meowdock.cmd.fetch.strategy import EngineStrategy
+from meowdock.cmd.fetch.scheduler import HostScheduler
+from meowdock.cmd.fetch.retry import LatencyTracker, RetryPolicy, classify_error
+from meowdock.cmd.fetch.timings import FetchTimings, elapsed_ms
 import json
 
 
 USER_DATA_DIR = os.getenv('CHROME_USER_DATA_PATH', 'chrome_data/')
 
+# Absolute targets of the http(s) links of a rendered page
+_COLLECT_LINKS_JS = "() => Array.from(document.links, a => a.href).filter(h => /^https?:/.test(h))"
+
 
 @dataclass
 class FetchOptions:
@@ -31,11 +53,33 @@ class FetchOptions:
     waitUntil: Literal['load', 'domcontentloaded', 'networkidle', 'commit'] = 'load'
     extractContent: bool = True  # Whether to extract main content
     maxLength: Optional[int] = None  # Maximum length of returned content
+    maxHtmlBytes: Optional[int] = 5 * 1024 * 1024  # Larger pages are pruned in the browser or truncated when read
+    extractMode: Literal['python', 'browser'] = 'python'  # Extract main content in Python, or inside the page
+    collectLinks: bool = False  # Return the links of the page in `FetchResult.links` (bypasses the fetch cache)
     returnHtml: bool = False  # Whether to return HTML (otherwise return extracted text)
     waitForNavigation: bool = False  # Whether to wait for additional navigation
     navigationTimeout: int = 10000  # Navigation timeout
     disableMedia: bool = True  # Whether to disable media resources
+    blockTrackers: bool = True  # Whether to block ad and tracker domains from the blocklist
     debug: bool = False  # Debug mode
+    pagePoolSize: int = 5  # Maximum number of idle tabs kept for reuse
+    pageMaxUses: int = 20  # Number of fetches after which a tab is retired
+    pageIdleTimeout: int = 60000  # Idle time after which a pooled tab is closed (milliseconds)
+    engine: Literal['auto', 'http', 'browser'] = 'browser'  # Plain HTTP, browser, or HTTP with browser fallback
+    minContentLength: int = 200  # [auto] Pages with less content than this are rendered in the browser
+    learnEngine: bool = True  # [auto] Remember per domain which engine works and go straight to it
+    useCache: bool = False  # Whether to serve and store results in the on-disk fetch cache
+    cacheTtl: int = 3600  # Time after which cached content is revalidated (seconds)
+    perHostConcurrency: int = 2  # Maximum number of concurrent fetches per host in a batch
+    perHostInterval: int = 0  # Minimum time between fetch starts on the same host (milliseconds)
+    readiness: Literal['load', 'content'] = 'content'  # Wait for the load event, or for the text to settle
+    readyQuietWindow: int = 500  # [content] Time without text changes that counts as ready (milliseconds)
+    readyBudget: int = 8000  # [content] Maximum time to wait for the text to settle (milliseconds)
+    retries: int = 1  # Retries for failures classified as timeout or 5xx
+    retryDelay: int = 500  # Delay before the first retry, doubled for every further one (milliseconds)
+    hedge: bool = False  # Start a second attempt when a fetch is slower than recent fetches
+    hedgeQuantile: float = 0.9  # [hedge] Latency quantile of recent fetches after which to hedge
+    hedgeMinDelay: int = 1000  # [hedge] Never hedge earlier than this (milliseconds)
 
 
 @dataclass
@@ -48,170 +92,731 @@ class FetchResult:
     index: Optional[int] = None
     url: Optional[str] = None
     link: Optional[str] = None  # Real link after redirection
+    engine: Optional[str] = None  # Engine that produced the content ('http' or 'browser')
+    status: Optional[int] = None  # HTTP status of the main response
+    cached: bool = False  # Whether the content was served from the fetch cache
+    error_type: Optional[str] = None  # 'dns', 'timeout', 'http_4xx', 'http_5xx', 'blocked' or 'other'
+    attempts: int = 0  # Number of attempts, not counting hedged ones
+    timings: FetchTimings = field(default_factory=FetchTimings)  # Time spent per phase
+    links: List[str] = field(default_factory=list)  # Links of the page, if `collectLinks` is set
 
 
 class Fetcher:
-    """Web content fetcher"""
-
-    def __init__(self, context: BrowserContext = None):
+    """Web content fetcher
+
+    A Fetcher owns a long-lived browser pool that is started on first use and shared by
+    every URL it fetches. Call `close()` (or use `async with Fetcher() as fetcher`) to shut
+    it down. An externally managed `BrowserPool` or `BrowserContext` can be injected instead,
+    and so can the HTTP client, the engine strategy table and the fetch cache.
+    """
+
+    def __init__(
+        self,
+        context: BrowserContext = None,
+        pool: Optional[BrowserPool] = None,
+        strategy: Optional[EngineStrategy] = None,
+        cache: Optional[FetchCache] = None,
+        http_client: Optional[HttpClient] = None,
+    ):
         init_logger()  # Initialize logger using shared library
         self.default_block_resources = get_moderate_resources()
+        self.blocklist = get_blocklist()
         self.injected_context = context
+        self.injected_pool = pool
+        self._pool: Optional[BrowserPool] = pool
+        self.injected_http = http_client
+        self._http: Optional[HttpClient] = http_client
+        self.strategy = strategy or EngineStrategy()
+        self.injected_cache = cache
+        self._cache: Optional[FetchCache] = cache
+        self.latency = LatencyTracker()  # Latencies of successful fetches, for hedging
+
+    def _get_pool(self, options: Optional[FetchOptions] = None, headless=True) -> BrowserPool:
+        if options is not None:
+            headless = not options.debug
+        if self._pool is None:
+            self._pool = BrowserPool(headless=headless)
+        if options is not None and self._pool is not self.injected_pool:
+            self._pool.page_pool_size = options.pagePoolSize
+            self._pool.max_page_uses = options.pageMaxUses
+            self._pool.page_idle_timeout = options.pageIdleTimeout / 1000
+        return self._pool
+
+    def _get_cache(self) -> FetchCache:
+        if self._cache is None:
+            self._cache = FetchCache()
+        return self._cache
+
+    def _get_http_client(self) -> HttpClient:
+        if self._http is None:
+            self._http = HttpClient()
+        return self._http
 
     @asynccontextmanager
     async def get_browser_context(self, headless=True):
-        try:
-            if self.injected_context:
-                yield self.injected_context
-            else:
-                playwright = await async_playwright().start()
-                browser = await playwright.chromium.launch(
-                    headless=headless,
-                    executable_path=find_chromium(),
-                    args=['--disable-blink-features=AutomationControlled'],
-                )
-                context = await browser.new_context()
-                await context.add_cookies(get_cookies())
+        if self.injected_context:
+            yield self.injected_context
+        else:
+            async with self._get_pool(headless=headless).context() as context:
                 yield context
-        finally:
-            if self.injected_context:
-                ...
-            else:
-                if context:
-                    await context.close()
-                if browser:
-                    await browser.close()
-                if playwright:
-                    await playwright.stop()
+
+    @asynccontextmanager
+    async def get_page(self, options: FetchOptions, url: Optional[str] = None):
+        """Borrow a tab for visiting `url` from the pool, or open one on the injected context"""
+        if self.injected_context:
+            pooled = PooledPage(await self.injected_context.new_page())
+            try:
+                yield pooled
+            finally:
+                await pooled.close()
+        else:
+            async with self._get_pool(options).page(url) as pooled:
+                yield pooled
+
+    async def warm_up(self, options: FetchOptions, count: int) -> None:
+        """Pre-create pooled tabs for an upcoming batch"""
+        if count > 0 and not self.injected_context:
+            await self._get_pool(options).warm_up(count)
+
+    async def close(self):
+        """Shut down the HTTP client, the cache and the browser pool, unless injected by the caller"""
+        self.strategy.save()
+        if self._cache is not None and self._cache is not self.injected_cache:
+            self._cache.close()
+            self._cache = None
+        if self._http is not None and self._http is not self.injected_http:
+            await self._http.close()
+            self._http = None
+        if self._pool is not None and self._pool is not self.injected_pool:
+            await self._pool.close()
+            self._pool = None
+
+    async def __aenter__(self) -> "Fetcher":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
 
     async def _fetch_url(
         self, url: str, options: FetchOptions, index: Optional[int] = None
     ) -> FetchResult:
-        """Fetch content from a single URL"""
-        result = FetchResult(index=index, url=url)
+        """Fetch content from a single URL, consulting the cache if `options.useCache` is set"""
+        # Links are not stored in the cache
+        if not options.useCache or options.collectLinks:
+            result, _ = await self._fetch_url_uncached(url, options, index)
+            return result
+
+        cache = self._get_cache()
+        key = cache.make_key(url, self._cache_variant(options))
+        entry = cache.get(key)
+        if entry is not None:
+            if entry.is_fresh(options.cacheTtl):
+                return self._result_from_cache(entry, url, index)
+            result = await self._revalidate(entry, url, options, index)
+            if result is not None:
+                return result
+
+        result, headers = await self._fetch_url_uncached(url, options, index)
+        if result.success:
+            cache.put(
+                CacheEntry(
+                    key=key,
+                    url=url,
+                    link=result.link,
+                    status=result.status,
+                    content=result.content,
+                    etag=headers.get('etag'),
+                    last_modified=headers.get('last-modified'),
+                    engine=result.engine,
+                    fetched_at=time.time(),
+                )
+            )
+        return result
+
+    @staticmethod
+    def _cache_variant(options: FetchOptions) -> Dict:
+        """Option values that change the fetched content and therefore belong in the cache key"""
+        return {
+            'extractContent': options.extractContent,
+            'returnHtml': options.returnHtml,
+            'maxLength': options.maxLength,
+            'maxHtmlBytes': options.maxHtmlBytes,
+            'extractMode': options.extractMode,
+        }
+
+    @staticmethod
+    def _result_from_cache(entry: CacheEntry, url: str, index: Optional[int]) -> FetchResult:
+        return FetchResult(
+            success=True,
+            content=entry.content,
+            index=index,
+            url=url,
+            link=entry.link,
+            engine=entry.engine,
+            status=entry.status,
+            cached=True,
+        )
+
+    async def _revalidate(
+        self, entry: CacheEntry, url: str, options: FetchOptions, index: Optional[int]
+    ) -> Optional[FetchResult]:
+        """Revalidate a stale cache entry with a conditional request over plain HTTP
+
+        Returns:
+            The cached result if the server answered 304, a fresh result if the page was
+            fetched over plain HTTP originally and still is, otherwise None
+        """
+        validators = entry.validators
+        if not validators:
+            return None
         try:
-            async with self.get_browser_context(headless=not options.debug) as context:
-                # Set up route interception to block unnecessary resources
-                if options.disableMedia:
-                    await context.route(
-                        "**/*", lambda route: abort_resource(route, self.default_block_resources)
-                    )
+            response = await self._get_http_client().get(
+                url,
+                timeout=options.timeout / 1000,
+                headers=validators,
+                max_bytes=options.maxHtmlBytes,
+            )
+        except Exception as e:
+            logging.info(f"Cache revalidation failed ({url}): {str(e)}")
+            return None
+
+        if response.status == 304:
+            self._get_cache().touch(entry.key)
+            return self._result_from_cache(entry, url, index)
+
+        if entry.engine == 'http' and options.engine != 'browser' and response.status < 400:
+            result = FetchResult(index=index, url=url)
+            try:
+                if not await self._process_http_response(response, options, result):
+                    return None
+            except Exception as e:
+                logging.info(f"Cache revalidation failed ({url}): {str(e)}")
+                return None
+            entry.link, entry.status, entry.content = result.link, result.status, result.content
+            entry.etag = response.headers.get('etag')
+            entry.last_modified = response.headers.get('last-modified')
+            entry.fetched_at = time.time()
+            self._get_cache().put(entry)
+            return result
+        return None
+
+    async def _fetch_url_uncached(
+        self, url: str, options: FetchOptions, index: Optional[int] = None
+    ) -> Tuple[FetchResult, Dict[str, str]]:
+        """
+        Fetch content from a single URL, over plain HTTP or in the browser depending on `options.engine`.
 
-                page = await context.new_page()
-
-                # Listen for requests, record redirects
-                final_url = url
-
-                async def handle_response(response):
-                    nonlocal final_url
-                    if response.request.url == url or response.url == url:
-                        if response.status >= 300 and response.status < 400:
-                            # Get redirect target
-                            location = response.headers.get("location")
-                            if location:
-                                if location.startswith("/"):
-                                    # Handle relative URLs
-                                    from urllib.parse import urlparse
-
-                                    parsed = urlparse(url)
-                                    final_url = f"{parsed.scheme}://{parsed.netloc}{location}"
-                                else:
-                                    final_url = location
-
-                page.on("response", handle_response)
-
-                # Visit URL
-                response = await page.goto(
-                    url,
-                    timeout=options.timeout,
-                    wait_until=options.waitUntil,
+        Returns:
+            The fetch result and the headers of the main response
+        """
+        result = FetchResult(index=index, url=url)
+        headers: Dict[str, str] = {}
+        learn = options.engine == 'auto' and options.learnEngine
+        engine = options.engine
+        if learn and self.strategy.lookup(url) == 'browser':
+            # Plain HTTP is known not to work for this domain, skip the wasted attempt
+            engine = 'browser'
+
+        if engine in ('auto', 'http'):
+            try:
+                response = await self._get_http_client().get(
+                    url, timeout=options.timeout / 1000, max_bytes=options.maxHtmlBytes
                 )
+                result.timings.ttfb = response.ttfb
+                result.timings.load = response.load
+                result.timings.html_bytes = response.size
+                if await self._process_http_response(response, options, result):
+                    if learn:
+                        self.strategy.record(url, 'http')
+                    return result, response.headers
+                logging.info(f"Page needs rendering, falling back to browser ({url})")
+            except Exception as e:
+                if engine == 'http':
+                    logging.error(f"Fetch failed ({url}): {str(e)}")
+                    result.error = str(e) or type(e).__name__
+                    return result, headers
+                logging.info(f"HTTP fetch failed, falling back to browser ({url}): {str(e)}")
 
-                # Check response status
-                if not response:
-                    raise Exception("No response received")
-
-                if response.status >= 400 and response.status not in [403, 429, 503]:
-                    raise Exception(f"HTTP error: {response.status}")
+        try:
+            headers = await self._fetch_url_browser(url, options, result)
+            if learn:
+                self.strategy.record(url, 'browser')
+        except Exception as e:
+            logging.error(f"Fetch failed ({url}): {str(e)}")
+            result.error = str(e) or type(e).__name__
+
+        return result, headers
+
+    @staticmethod
+    def _prune_text_length(options: FetchOptions) -> Optional[int]:
+        """Amount of body text worth keeping to produce `maxLength` characters, None if unlimited"""
+        if not options.maxLength:
+            return None
+        if options.extractContent:
+            # Readability needs the text around the main content to score it
+            return options.maxLength * 4 + 20000
+        return options.maxLength * 2 + 1000
+
+    @staticmethod
+    def _limit_length(content: str, options: FetchOptions) -> str:
+        if options.maxLength and len(content) > options.maxLength:
+            content = content[: options.maxLength]
+        return content
+
+    async def _process_http_response(
+        self, response: HttpResponse, options: FetchOptions, result: FetchResult
+    ) -> bool:
+        """
+        Turn a plain HTTP response into a fetch result.
+
+        Returns:
+            False if the engine is 'auto' and the page looks like it needs rendering
+        """
+        result.status = response.status
+        if response.status >= 400:
+            raise Exception(f"HTTP error: {response.status}")
+        if not response.is_html:
+            raise Exception(f"Unsupported content type: {response.headers.get('content-type')}")
+
+        html = response.html
+        if response.truncated:
+            logging.info(f"Page exceeds {options.maxHtmlBytes} bytes, truncated ({response.url})")
+        extract_started = time.perf_counter()
+        if options.extractContent:
+            text = await extract_main_content(html, max_length=options.maxLength)
+        else:
+            text = await run_extraction(html_to_text, html)
+        result.timings.extract = elapsed_ms(extract_started)
+        if options.engine == 'auto' and needs_rendering(html, text, options.minContentLength):
+            return False
+
+        if options.extractContent or not options.returnHtml:
+            content = text
+        else:
+            content = html
+
+        result.link = response.url
+        result.success = True
+        result.content = self._limit_length(content, options)
+        result.timings.content_length = len(result.content)
+        result.engine = 'http'
+        if options.collectLinks:
+            result.links = await run_extraction(extract_links, html, response.url)
+        return True
+
+    async def _fetch_url_browser(
+        self, url: str, options: FetchOptions, result: FetchResult
+    ) -> Dict[str, str]:
+        """
+        Render a URL in a pooled browser tab.
+
+        Returns:
+            The headers of the main response
+        """
+        timings = result.timings
+        started = time.perf_counter()
+        async with self.get_page(options, url) as pooled:
+            timings.acquire = elapsed_ms(started)
+            page = pooled.page
+            # Block trackers and unnecessary resources inside the browser
+            blocklist = self.blocklist if options.blockTrackers else BlockList()
+            block_resources = self.default_block_resources if options.disableMedia else None
+            if options.blockTrackers or options.disableMedia or pooled.cdp_session:
+                pooled.cdp_session = await blocklist.apply_to_page(
+                    page, block_resources, pooled.cdp_session
+                )
 
+            # Listen for requests, record redirects
+            final_url = url
+
+            async def handle_response(response):
+                nonlocal final_url
+                if response.request.url == url or response.url == url:
+                    if response.status >= 300 and response.status < 400:
+                        # Get redirect target
+                        location = response.headers.get("location")
+                        if location:
+                            if location.startswith("/"):
+                                # Handle relative URLs
+                                from urllib.parse import urlparse
+
+                                parsed = urlparse(url)
+                                final_url = f"{parsed.scheme}://{parsed.netloc}{location}"
+                            else:
+                                final_url = location
+
+            pooled.on("response", handle_response)
+
+            # Visit URL. In 'content' mode we only wait for the document itself and then for
+            # its text to settle, instead of for every subresource
+            wait_until = options.waitUntil
+            if options.readiness == 'content' and wait_until == 'load':
+                wait_until = 'domcontentloaded'
+            started = time.perf_counter()
+            response = await page.goto(
+                url,
+                timeout=options.timeout,
+                wait_until=wait_until,
+            )
+            timings.load = elapsed_ms(started)
+
+            # Check response status
+            if not response:
+                raise Exception("No response received")
+            result.status = response.status
+            response_start = response.request.timing.get('responseStart', -1)
+            if response_start >= 0:
+                timings.ttfb = round(response_start, 1)
+
+            if response.status >= 400 and response.status not in [403, 429, 503]:
+                raise Exception(f"HTTP error: {response.status}")
+
+            started = time.perf_counter()
+            if options.readiness == 'content':
+                await wait_for_content(page, options.readyQuietWindow, options.readyBudget)
+            else:
                 try:
                     await page.wait_for_function(
                         "document.readyState === 'complete'", timeout=10000
                     )
                 except TimeoutError:
                     raise Exception(f"HTTP error: {response.status}.")
+            timings.ready = elapsed_ms(started)
+
+            # Get final URL (actual URL after redirection)
+            current_url = page.url
+            result.link = current_url if current_url != url else final_url
+
+            # Wait for additional navigation
+            if options.waitForNavigation:
+                try:
+                    await page.wait_for_load_state(
+                        "networkidle", timeout=options.navigationTimeout
+                    )
+                    # Update to final URL after navigation
+                    result.link = page.url
+                except Exception as e:
+                    logging.warning(f"Wait for additional navigation timed out: {str(e)}")
+
+            if options.collectLinks:
+                result.links = await page.evaluate(_COLLECT_LINKS_JS)
+
+            content = None
+            if options.extractContent and options.extractMode == 'browser' and response.status < 400:
+                # Extract inside the page, only the text crosses over to Python
+                started = time.perf_counter()
+                content = await extract_in_browser(page, options.maxLength)
+                timings.extract = elapsed_ms(started)
+                if not content:
+                    logging.info(f"In-browser extraction found no content, parsing the HTML ({url})")
+            if not content:
+                content = await self._serialize_and_extract(page, response.status, options, timings)
+
+            result.success = True
+            result.content = self._limit_length(content, options)
+            timings.content_length = len(result.content)
+            result.engine = 'browser'
+            return response.headers
+
+    async def _serialize_and_extract(
+        self, page: Page, status: int, options: FetchOptions, timings: FetchTimings
+    ) -> str:
+        """Serialize the rendered page and extract its content in Python"""
+        # Shrink oversized pages in the browser, before they are serialized and parsed; only
+        # pages with enough elements to exceed `maxHtmlBytes` have their size measured
+        started = time.perf_counter()
+        max_text_length = self._prune_text_length(options)
+        if max_text_length or options.maxHtmlBytes:
+            await prune_page(page, max_text_length, options.maxHtmlBytes)
+
+        # Get page content
+        html = await page.content()
+        timings.serialize = elapsed_ms(started)
+        timings.html_bytes = len(html.encode('utf-8'))
+
+        if status >= 400:
+            lhtml = html.lower()
+            if len(html) < 3000 or (
+                len(html) < 5000 and ('Access Denied' in lhtml or 'error' in lhtml)
+            ):
+                raise Exception(f"HTTP error: {status}! {len(html)}")
+        # Process content
+        started = time.perf_counter()
+        if options.extractContent:
+            content = await extract_main_content(
+                html, max_length=options.maxLength
+            )  # Extract content using shared library
+        else:
+            content = (
+                html
+                if options.returnHtml
+                else await page.evaluate('document.body.innerText')
+            )
+
+        timings.extract = elapsed_ms(started)
+        return content
+
+    async def _fetch_hedged(
+        self, url: str, options: FetchOptions, index: Optional[int], scheduler: HostScheduler
+    ) -> FetchResult:
+        """
+        Fetch a URL; with `options.hedge`, start a second attempt if the first one is slower than
+        the `hedgeQuantile` latency of recent fetches, and take whichever succeeds first.
+
+        The hedged attempt goes through plain HTTP with browser fallback on a fresh tab when the
+        first attempt uses the browser, and through the same engine otherwise. It takes its own
+        slot from `scheduler`, so it waits while the host is at its per-host limit.
+        """
+        started = time.monotonic()
+        if not options.hedge:
+            result = await self._fetch_url(url, options, index)
+            if result.success and not result.cached:
+                self.latency.add(time.monotonic() - started)
+            return result
+
+        deadline = self.latency.quantile(options.hedgeQuantile)
+        if deadline is None:
+            # Too few samples yet, only hedge fetches that take half the timeout
+            deadline = options.timeout / 2000
+        deadline = max(deadline, options.hedgeMinDelay / 1000)
+
+        primary = asyncio.create_task(self._fetch_url(url, options, index))
+        tasks = {primary}
+        result: Optional[FetchResult] = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=deadline)
+            if not done:
+                logging.info(f"Fetch slower than {deadline:.1f}s, hedging ({url})")
+                hedge_options = replace(
+                    options,
+                    engine='auto' if options.engine == 'browser' else options.engine,
+                    learnEngine=False,
+                )
 
-                # Get final URL (actual URL after redirection)
-                current_url = page.url
-                result.link = current_url if current_url != url else final_url
+                async def hedge() -> FetchResult:
+                    async with scheduler.slot(url):
+                        return await self._fetch_url(url, hedge_options, index)
 
-                # Wait for additional navigation
-                if options.waitForNavigation:
+                tasks.add(asyncio.create_task(hedge()))
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
                     try:
-                        await page.wait_for_load_state(
-                            "networkidle", timeout=options.navigationTimeout
-                        )
-                        # Update to final URL after navigation
-                        result.link = page.url
+                        attempt = task.result()
                     except Exception as e:
-                        logging.warning(f"Wait for additional navigation timed out: {str(e)}")
-
-                # Get page content
-                html = await page.content()
-
-                if response.status >= 400:
-                    lhtml = html.lower()
-                    if len(html) < 3000 or (
-                        len(html) < 5000 and ('Access Denied' in lhtml or 'error' in lhtml)
-                    ):
-                        raise Exception(f"HTTP error: {response.status}! {len(html)}")
-                # Process content
-                if options.extractContent:
-                    content = await extract_main_content(
-                        html
-                    )  # Extract content using shared library
-                else:
-                    content = (
-                        html
-                        if options.returnHtml
-                        else await page.evaluate('document.body.innerText')
-                    )
+                        attempt = FetchResult(
+                            success=False, error=str(e) or type(e).__name__, url=url, index=index
+                        )
+                    if attempt.success:
+                        if not attempt.cached:
+                            self.latency.add(time.monotonic() - started)
+                        return attempt
+                    # Report the failure of the first attempt if both fail
+                    if result is None or task is primary:
+                        result = attempt
+            return result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-                # Limit content length
-                if options.maxLength and len(content) > options.maxLength:
-                    content = content[: options.maxLength]
+    async def _fetch_guarded(
+        self, url: str, options: FetchOptions, index: Optional[int], scheduler: HostScheduler
+    ) -> FetchResult:
+        """Fetch a URL in a scheduler slot, retrying failures according to the options"""
+        policy = RetryPolicy(retries=options.retries, base_delay=options.retryDelay / 1000)
+        started = time.perf_counter()
+        queue_wait = 0.0
+        attempt = 0
+        while True:
+            attempt += 1
+            # Catch errors for individual URLs so batch processing can continue
+            try:
+                waiting = time.perf_counter()
+                async with scheduler.slot(url):
+                    queue_wait += elapsed_ms(waiting)
+                    result = await self._fetch_hedged(url, options, index, scheduler)
+                    if not result.cached:
+                        scheduler.report(url, result.status)
+            except Exception as e:
+                logging.error(f"Internal error occurred while fetching {url}: {str(e)}")
+                result = FetchResult(success=False, error=str(e), url=url, index=index)
+            result.attempts = attempt
+            result.timings.queue_wait = round(queue_wait, 1)
+            result.timings.total = elapsed_ms(started)
+            if result.success:
+                return result
+
+            result.error_type = classify_error(result.error, result.status)
+            if not policy.should_retry(result.error_type, attempt):
+                return result
+            delay = policy.delay(attempt)
+            logging.info(
+                f"Retrying in {delay:.1f}s after {result.error_type} error (attempt {attempt}, {url})"
+            )
+            await asyncio.sleep(delay)
+
+    async def fetch_iter(
+        self,
+        urls: Iterable[str],
+        options: Optional[FetchOptions] = None,
+        concurrency: Optional[int] = None,
+        window: Optional[int] = None,
+    ) -> AsyncIterator[FetchResult]:
+        """
+        Fetch multiple URLs and yield each result as soon as it is ready.
+
+        Results arrive in completion order; `FetchResult.index` is the position of the URL in `urls`.
+        Fetches still running when the iteration is abandoned are cancelled.
+
+        Usage:
+            async for result in fetcher.fetch_iter(urls, options):
+                ...
 
-                result.success = True
-                result.content = content
+        Besides the overall `concurrency`, at most `options.perHostConcurrency` URLs of the same host
+        are fetched at once, spaced `options.perHostInterval` apart, and hosts answering 429/503
+        are paused with exponential backoff.
+
+        Args:
+            urls: URLs to fetch; any iterable, consumed lazily when `window` is set. The iterator
+                is asked again after every finished fetch even if it raised StopIteration, so a
+                source that is temporarily empty (like a crawl frontier) can add more URLs later
+            options: Fetch options
+            concurrency: Maximum number of URLs fetched at the same time, None for no limit
+            window: Maximum number of URLs scheduled (fetching or waiting for a slot) at the same
+                time, None to schedule all of them at once
+        """
+        if options is None:
+            options = FetchOptions()
 
-        except Exception as e:
-            logging.error(f"Fetch failed ({url}): {str(e)}")
-            result.error = str(e)
+        scheduler = HostScheduler(
+            global_limit=concurrency,
+            per_host_limit=options.perHostConcurrency,
+            min_interval=options.perHostInterval / 1000,
+        )
+        # Only browser batches pre-create tabs; 'http' never needs the browser and 'auto'
+        # starts it lazily on the first fallback
+        if options.engine == 'browser':
+            if isinstance(urls, Sized):
+                count = min(concurrency or len(urls), len(urls))
+            else:
+                count = concurrency or options.pagePoolSize
+            if count:
+                await self.warm_up(options, count)
+
+        # Large batches may extract in the process pool; an iterator (a job or a crawl
+        # frontier) is open-ended, whatever its current length
+        if isinstance(urls, Sized) and not isinstance(urls, Iterator):
+            context = extraction_context(len(urls))
+        else:
+            context = extraction_context(None)
+
+        source = iter(urls)
+        scheduled = 0
+        pending: Set[asyncio.Task] = set()
+
+        def schedule() -> None:
+            nonlocal scheduled
+            while window is None or len(pending) < window:
+                try:
+                    url = next(source)
+                except StopIteration:
+                    return
+                pending.add(
+                    asyncio.create_task(
+                        self._fetch_guarded(url, options, scheduled, scheduler), context=context
+                    )
+                )
+                scheduled += 1
 
-        return result
+        try:
+            while True:
+                # The caller may have added URLs to the source while handling the last results
+                schedule()
+                if not pending:
+                    break
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending.difference_update(done)
+                # Refill the window before handing out results, so fetching continues meanwhile
+                schedule()
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
     async def fetch(
-        self, urls: Union[str, List[str]], options: Optional[FetchOptions] = None
+        self,
+        urls: Union[str, List[str]],
+        options: Optional[FetchOptions] = None,
+        concurrency: Optional[int] = None,
+        deadline: Optional[float] = None,
+        min_successes: Optional[int] = None,
     ) -> Union[FetchResult, List[FetchResult]]:
-        """Fetch content from one or more URLs"""
+        """
+        Fetch content from one or more URLs.
+
+        When `deadline` seconds have passed, or `min_successes` URLs were fetched successfully,
+        the fetches still running are cancelled (their tabs are closed) and returned as failed
+        results with `error_type` 'timeout'.
+
+        Args:
+            urls: URL or URLs to fetch
+            options: Fetch options
+            concurrency: Maximum number of URLs fetched at the same time, None for no limit
+            deadline: Time budget for the whole batch (seconds), None for no limit
+            min_successes: Stop as soon as this many URLs succeeded, None to fetch all
+        """
         # Set default options
         if options is None:
             options = FetchOptions()
 
         # Handle single URL
         if isinstance(urls, str):
-            return await self._fetch_url(urls, options)
+            try:
+                async with asyncio.timeout(deadline):
+                    return await self._fetch_guarded(urls, options, None, HostScheduler())
+            except TimeoutError:
+                return self._unfinished_result(urls, None, f"Deadline of {deadline}s exceeded")
+
+        # Handle multiple URLs, results are returned in input order
+        results: List[Optional[FetchResult]] = [None] * len(urls)
+        successes = 0
+        reason = f"Deadline of {deadline}s exceeded"
+        results_iter = self.fetch_iter(urls, options, concurrency)
+        try:
+            async with asyncio.timeout(deadline):
+                async for result in results_iter:
+                    results[result.index] = result
+                    successes += result.success
+                    if min_successes and successes >= min_successes:
+                        reason = f"Cancelled after {successes} successful fetches"
+                        break
+        except TimeoutError:
+            logging.info(f"Fetch deadline of {deadline}s exceeded, returning partial results")
+        finally:
+            # Cancels the fetches still running
+            await results_iter.aclose()
 
-        # Handle multiple URLs
-        tasks = []
-        for i, url in enumerate(urls):
-            tasks.append(self._fetch_url(url, options, i))
+        return [
+            result if result is not None else self._unfinished_result(url, i, reason)
+            for i, (url, result) in enumerate(zip(urls, results))
+        ]
 
-        results = await asyncio.gather(*tasks)
-        return results
+    @staticmethod
+    def _unfinished_result(url: str, index: Optional[int], reason: str) -> FetchResult:
+        return FetchResult(success=False, error=reason, index=index, url=url, error_type='timeout')
 
     def fetch_sync(
         self, urls: Union[str, List[str]], options: Optional[FetchOptions] = None
     ) -> Union[FetchResult, List[FetchResult]]:
         """Synchronously fetch URL content (uses async internally)"""
-        return asyncio.run(self.fetch(urls, options))
+
+        async def _fetch_and_close():
+            try:
+                return await self.fetch(urls, options)
+            finally:
+                await self.close()
+
+        return asyncio.run(_fetch_and_close())
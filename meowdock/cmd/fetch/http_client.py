@@ -0,0 +1,240 @@
+"""
+Plain HTTP fetch path
+
+Provides a pooled keep-alive HTTP client for pages that do not need a browser, and the
+heuristics that decide when a page has to be rendered in Chromium after all.
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+from http.cookies import CookieError, Morsel
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from aiohttp import ClientResponse, ClientSession, ClientTimeout, CookieJar, TCPConnector
+import lxml.html
+
+from meowdock.library.browser import CookieTracker, get_default_headers
+from meowdock.cmd.fetch.timings import elapsed_ms
+
+
+# Markers of pages that only show a "please enable JavaScript" notice without a browser
+_JS_WALL_PATTERN = re.compile(
+    r"enable javascript|javascript is (?:disabled|required)|"
+    r"启用\s*javascript|开启\s*javascript|打开\s*javascript",
+    re.IGNORECASE,
+)
+_NOSCRIPT_PATTERN = re.compile(r"<noscript[^>]*>(.*?)</noscript>", re.IGNORECASE | re.DOTALL)
+_META_CHARSET_PATTERN = re.compile(rb"""<meta[^>]+charset=["']?([a-zA-Z0-9_\-]+)""", re.IGNORECASE)
+
+# Pages smaller than this are usually redirects, challenges or empty app shells
+MIN_HTML_BYTES = 2048
+
+
+@dataclass
+class HttpResponse:
+    """Response of a plain HTTP fetch"""
+
+    url: str  # Final URL after redirects
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    html: str = ""
+    truncated: bool = False  # Whether the body was cut off at the byte limit
+    size: int = 0  # Size of the body read (bytes)
+    ttfb: float = 0.0  # Time until the response headers arrived (milliseconds)
+    load: float = 0.0  # Time to read the body (milliseconds)
+
+    @property
+    def is_html(self) -> bool:
+        content_type = self.headers.get("content-type", "text/html").lower()
+        return "html" in content_type or "xml" in content_type
+
+
+def _cookie_morsels(cookies: List[Dict[str, Any]]) -> Iterator[Tuple[str, Morsel]]:
+    """Convert Playwright cookie dicts into morsels for the aiohttp cookie jar"""
+    for cookie in cookies:
+        morsel = Morsel()
+        try:
+            morsel.set(cookie["name"], cookie["value"], cookie["value"])
+        except (CookieError, KeyError):
+            continue
+        morsel["domain"] = cookie.get("domain", "")
+        morsel["path"] = cookie.get("path", "/")
+        if cookie.get("secure"):
+            morsel["secure"] = True
+        yield cookie["name"], morsel
+
+
+def _decode(body: bytes, content_type: str, truncated: bool = False) -> str:
+    """Decode a response body using the header charset, the meta charset or a CJK-friendly fallback"""
+    charsets = []
+    match = re.search(r"charset=([a-zA-Z0-9_\-]+)", content_type)
+    if match:
+        charsets.append(match.group(1))
+    match = _META_CHARSET_PATTERN.search(body[:4096])
+    if match:
+        charsets.append(match.group(1).decode("ascii"))
+    charsets += ["utf-8", "gb18030"]
+    for charset in charsets:
+        try:
+            return body.decode(charset)
+        except LookupError:
+            continue
+        except UnicodeDecodeError as e:
+            # A body cut off at the byte limit may end in the middle of a character
+            if truncated and e.start >= len(body) - 4:
+                try:
+                    return body[: e.start].decode(charset)
+                except UnicodeDecodeError:
+                    pass
+            continue
+    return body.decode("utf-8", errors="replace")
+
+
+def html_to_text(html: str) -> str:
+    """Get the visible text of an HTML document, roughly like `document.body.innerText`"""
+    try:
+        doc = lxml.html.fromstring(html)
+    except Exception:
+        return ""
+    for element in doc.xpath("//script|//style|//noscript|//template"):
+        element.drop_tree()
+    return re.sub(r"\n\s*\n+", "\n\n", doc.text_content()).strip()
+
+
+def extract_links(html: str, base_url: str) -> List[str]:
+    """Get the absolute http(s) targets of the `<a href>` links of an HTML document"""
+    try:
+        doc = lxml.html.fromstring(html)
+    except Exception:
+        return []
+    links = []
+    for href in doc.xpath("//a/@href"):
+        try:
+            link = urljoin(base_url, href.strip())
+        except ValueError:
+            continue
+        if link.startswith(("http://", "https://")):
+            links.append(link)
+    return links
+
+
+def needs_rendering(html: str, text: str, min_content_length: int = 200) -> bool:
+    """
+    Decide whether a page fetched over plain HTTP has to be rendered in a browser.
+
+    Args:
+        html: Raw HTML of the page
+        text: Text obtained from the HTML (extracted main content or visible text)
+        min_content_length: Minimum text length of a usable page
+
+    Returns:
+        True if the page looks like a JavaScript shell, a JavaScript wall or has too little content
+    """
+    if len(html.encode("utf-8", errors="ignore")) < MIN_HTML_BYTES:
+        return True
+    stripped = text.strip()
+    if len(stripped) < min_content_length:
+        return True
+    for noscript in _NOSCRIPT_PATTERN.findall(html):
+        if _JS_WALL_PATTERN.search(noscript) and len(stripped) < min_content_length * 5:
+            return True
+    return bool(_JS_WALL_PATTERN.search(stripped[:500]))
+
+
+class HttpClient:
+    """
+    Keep-alive HTTP client shared by all plain HTTP fetches of a `Fetcher`.
+
+    The session is created lazily inside the running event loop and carries the headers from
+    `get_default_headers()`. The saved cookies of a host are added to its cookie jar on the
+    first request to that host.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 8, keepalive_timeout: float = 30.0):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[ClientSession] = None
+        self._cookies = CookieTracker()
+
+    def _get_session(self) -> ClientSession:
+        if self._session is None or self._session.closed:
+            cookie_jar = CookieJar(unsafe=True)
+            self._cookies.reset()
+            connector = TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300,
+            )
+            self._session = ClientSession(
+                connector=connector, cookie_jar=cookie_jar, headers=get_default_headers()
+            )
+        return self._session
+
+    def _add_cookies_for(self, session: ClientSession, url: str) -> None:
+        clear, cookies = self._cookies.take(url)
+        if clear:
+            # The cookie file changed, start over with the new cookies
+            session.cookie_jar.clear()
+        if cookies:
+            session.cookie_jar.update_cookies(_cookie_morsels(cookies))
+
+    async def get(
+        self,
+        url: str,
+        timeout: float = 30.0,
+        headers: Optional[Dict[str, str]] = None,
+        max_bytes: Optional[int] = None,
+    ) -> HttpResponse:
+        """
+        Fetch a URL, following redirects.
+
+        Args:
+            url: URL to fetch
+            timeout: Total timeout in seconds
+            headers: Extra request headers
+            max_bytes: Stop reading the body after this many bytes, None for no limit
+
+        Returns:
+            HttpResponse with the decoded body
+        """
+        session = self._get_session()
+        self._add_cookies_for(session, url)
+        started = time.perf_counter()
+        async with session.get(
+            url, headers=headers, timeout=ClientTimeout(total=timeout), allow_redirects=True
+        ) as response:
+            response_headers = {k.lower(): v for k, v in response.headers.items()}
+            result = HttpResponse(str(response.url), response.status, response_headers)
+            result.ttfb = elapsed_ms(started)
+            if result.is_html:
+                if max_bytes:
+                    body = await self._read_limited(response, max_bytes)
+                    result.truncated = len(body) >= max_bytes
+                else:
+                    body = await response.read()
+                result.html = _decode(
+                    body, response_headers.get("content-type", ""), result.truncated
+                )
+                result.size = len(body)
+            result.load = round(elapsed_ms(started) - result.ttfb, 1)
+            return result
+
+    @staticmethod
+    async def _read_limited(response: ClientResponse, max_bytes: int) -> bytes:
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(65536):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= max_bytes:
+                break
+        return b"".join(chunks)[:max_bytes]
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
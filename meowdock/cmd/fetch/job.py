@@ -0,0 +1,175 @@
+"""
+Resumable bulk fetch jobs
+
+Reads URLs line by line from a file or stdin, appends each result to a JSON Lines file as soon
+as it is ready, and keeps a checkpoint so that an interrupted run continues where it stopped.
+Neither the URL list nor the results are held in memory, so runs over hundreds of thousands of
+URLs use a flat amount of memory.
+"""
+
+import json
+import logging
+import os
+import sys
+from contextlib import nullcontext
+from dataclasses import asdict
+from typing import Dict, Iterator, Optional, Set, TextIO, Tuple
+
+from meowdock.cmd.fetch.fetcher import Fetcher, FetchOptions
+from meowdock.library.utils.fileio import atomic_write_json
+
+
+class Checkpoint:
+    """
+    Progress of a job over the lines of its input.
+
+    Every line below `watermark` is done; `done` holds the finished lines above it, which
+    stays small because at most a window of lines is in flight at any time.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.watermark = 0
+        self.done: Set[int] = set()
+        self.input: Optional[str] = None
+
+    def load(self) -> bool:
+        """Load the checkpoint file, returns False if there is none"""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.watermark = data.get("watermark", 0)
+        self.done = set(data.get("done", []))
+        self.input = data.get("input")
+        return True
+
+    def is_done(self, line: int) -> bool:
+        return line < self.watermark or line in self.done
+
+    def mark(self, line: int) -> None:
+        """Mark a line as done, advancing the watermark over every contiguous finished line"""
+        self.done.add(line)
+        while self.watermark in self.done:
+            self.done.remove(self.watermark)
+            self.watermark += 1
+
+    def save(self) -> None:
+        """Write the checkpoint atomically"""
+        try:
+            atomic_write_json(
+                self.path,
+                {"input": self.input, "watermark": self.watermark, "done": sorted(self.done)},
+            )
+        except OSError as e:
+            logging.warning(f"Failed to save checkpoint {self.path}: {str(e)}")
+
+
+class FetchJob:
+    """
+    Bulk fetch of the URLs in a file (or stdin for '-') into a JSON Lines file.
+
+    The input has one URL per line; blank lines and lines starting with '#' are skipped.
+
+    Results are written in completion order, with `index` set to the line number of the URL
+    in the input. A line is only recorded as done in the checkpoint after its result has
+    been written, so a crash can repeat (but never lose) the last few results.
+
+    Usage:
+        job = FetchJob("urls.txt", "results.jsonl", options=FetchOptions(engine="auto"))
+        success, fail = await job.run()
+    """
+
+    def __init__(
+        self,
+        input: str,
+        output: str,
+        checkpoint: Optional[str] = None,
+        options: Optional[FetchOptions] = None,
+        concurrency: int = 5,
+        window: Optional[int] = None,
+        checkpoint_every: int = 100,
+        fetcher: Optional[Fetcher] = None,
+    ):
+        """
+        Args:
+            input: File with one URL per line, '-' for stdin
+            output: JSON Lines file the results are appended to
+            checkpoint: Checkpoint file, defaults to `<output>.checkpoint`
+            options: Fetch options
+            concurrency: Maximum number of URLs fetched at the same time
+            window: Maximum number of URLs in flight, defaults to four times `concurrency`
+            checkpoint_every: Save the checkpoint after this many results
+            fetcher: Fetcher to use (not closed by the job), defaults to a new one
+        """
+        self.input = input
+        self.output = output
+        self.checkpoint = Checkpoint(checkpoint or f"{output}.checkpoint")
+        self.options = options or FetchOptions()
+        self.concurrency = concurrency
+        self.window = window or concurrency * 4
+        self.checkpoint_every = checkpoint_every
+        self.fetcher = fetcher
+
+    async def run(self, restart: bool = False) -> Tuple[int, int]:
+        """
+        Run (or resume) the job.
+
+        Args:
+            restart: Ignore an existing checkpoint and overwrite the output
+
+        Returns:
+            Number of successful and failed fetches in this run
+        """
+        resumed = not restart and self.checkpoint.load()
+        if resumed:
+            if self.checkpoint.input != self.input:
+                logging.warning(
+                    f"Checkpoint was made for input {self.checkpoint.input}, resuming with {self.input}"
+                )
+            logging.info(f"Resuming after {self.checkpoint.watermark} lines")
+        self.checkpoint.input = self.input
+
+        # Line number of each URL handed to the fetcher, by position; only in-flight entries are kept
+        lines: Dict[int, int] = {}
+
+        def pending_urls(f: TextIO) -> Iterator[str]:
+            position = 0
+            for line_no, line in enumerate(f):
+                if self.checkpoint.is_done(line_no):
+                    continue
+                url = line.strip()
+                if not url or url.startswith("#"):
+                    # Blank lines and comments count as done, so the watermark can pass them
+                    self.checkpoint.mark(line_no)
+                    continue
+                lines[position] = line_no
+                position += 1
+                yield url
+
+        success_count = fail_count = 0
+        source = sys.stdin if self.input == "-" else open(self.input, "r", encoding="utf-8")
+        out = open(self.output, "a" if resumed else "w", encoding="utf-8")
+        try:
+            # An injected fetcher stays open for the caller
+            fetcher_context = nullcontext(self.fetcher) if self.fetcher is not None else Fetcher()
+            async with fetcher_context as fetcher:
+                async for result in fetcher.fetch_iter(
+                    pending_urls(source), self.options, self.concurrency, self.window
+                ):
+                    result.index = lines.pop(result.index)
+                    out.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+                    self.checkpoint.mark(result.index)
+                    if result.success:
+                        success_count += 1
+                    else:
+                        fail_count += 1
+                    if (success_count + fail_count) % self.checkpoint_every == 0:
+                        out.flush()
+                        self.checkpoint.save()
+        finally:
+            out.close()
+            self.checkpoint.save()
+            if source is not sys.stdin:
+                source.close()
+        return success_count, fail_count
@@ -1,10 +1,16 @@
 import json
 import asyncio
-from typing import List, Optional
+import sys
+from dataclasses import asdict
+from typing import List, Optional, Tuple
 import typer
 from typing_extensions import Annotated
 
 from meowdock.cmd.fetch.fetcher import Fetcher, FetchOptions, FetchResult
+from meowdock.cmd.fetch.job import FetchJob
+from meowdock.cmd.fetch.timings import FetchTimings, format_timing_summary, summarize_timings
+from meowdock.cmd.fetch.strategy import EngineStrategy
+from meowdock.library.utils.url import registrable_domain
 
 app = typer.Typer(help="Fetch web page content")
 
@@ -18,6 +24,9 @@ def fetch(
     max_length: Annotated[
         Optional[int], typer.Option(help="Maximum length of returned content")
     ] = None,
+    max_html_bytes: Annotated[
+        int, typer.Option(help="Prune or truncate pages larger than this many bytes (0 for no limit)")
+    ] = 5 * 1024 * 1024,
     return_html: Annotated[
         bool, typer.Option(help="Whether to return HTML (otherwise text)")
     ] = False,
@@ -28,6 +37,28 @@ def fetch(
     disable_media: Annotated[bool, typer.Option(help="Whether to disable media resources")] = True,
     debug: Annotated[bool, typer.Option(help="Whether to enable debug mode")] = False,
     output: Annotated[Optional[str], typer.Option(help="Output file path")] = None,
+    engine: Annotated[
+        str, typer.Option(help="Fetch engine: 'browser', 'http', or 'auto' (HTTP first, browser fallback)")
+    ] = "browser",
+    min_content_length: Annotated[
+        int, typer.Option(help="[auto] Render pages with less content than this in the browser")
+    ] = 200,
+    use_cache: Annotated[bool, typer.Option(help="Whether to use the on-disk fetch cache")] = False,
+    cache_ttl: Annotated[
+        int, typer.Option(help="Seconds after which cached content is revalidated")
+    ] = 3600,
+    readiness: Annotated[
+        str, typer.Option(help="Wait for the 'load' event, or until the page 'content' settles")
+    ] = "content",
+    ready_budget: Annotated[
+        int, typer.Option(help="[content] Maximum time to wait for the content to settle (milliseconds)")
+    ] = 8000,
+    retries: Annotated[
+        int, typer.Option(help="Retries for timeouts and 5xx responses")
+    ] = 1,
+    extract_mode: Annotated[
+        str, typer.Option(help="Extract main content in 'python', or inside the page ('browser')")
+    ] = "python",
 ):
     """Fetch content for a single URL"""
     if wait_until not in ["load", "domcontentloaded", "networkidle", "commit"]:
@@ -36,25 +67,47 @@ def fetch(
         )
         raise typer.Exit(1)
 
+    if engine not in ["auto", "http", "browser"]:
+        typer.echo(f"Error: engine must be one of 'auto', 'http', 'browser'", err=True)
+        raise typer.Exit(1)
+
+    if readiness not in ["load", "content"]:
+        typer.echo(f"Error: readiness must be one of 'load', 'content'", err=True)
+        raise typer.Exit(1)
+
+    if extract_mode not in ["python", "browser"]:
+        typer.echo(f"Error: extract_mode must be one of 'python', 'browser'", err=True)
+        raise typer.Exit(1)
+
     options = FetchOptions(
         timeout=timeout,
         waitUntil=wait_until,  # type: ignore
         extractContent=extract_content,
         maxLength=max_length,
+        maxHtmlBytes=max_html_bytes or None,
         returnHtml=return_html,
         waitForNavigation=wait_for_navigation,
         navigationTimeout=navigation_timeout,
         disableMedia=disable_media,
         debug=debug,
+        engine=engine,  # type: ignore
+        minContentLength=min_content_length,
+        useCache=use_cache,
+        cacheTtl=cache_ttl,
+        readiness=readiness,  # type: ignore
+        readyBudget=ready_budget,
+        retries=retries,
+        extractMode=extract_mode,  # type: ignore
     )
 
     fetcher = Fetcher()
     result = fetcher.fetch_sync(url, options)
+    print_timing_summary([result.timings])
 
     if result.success:
         if output:
             with open(output, "w", encoding="utf-8") as f:
-                json.dump(result.__dict__, f, ensure_ascii=False, indent=2)
+                json.dump(asdict(result), f, ensure_ascii=False, indent=2)
             typer.echo(f"Content saved to: {output}")
         else:
             # When no output file is specified, print results to stdout
@@ -69,27 +122,64 @@ def fetch(
         raise typer.Exit(1)
 
 
+def print_timing_summary(timings: List[FetchTimings]) -> None:
+    """Print p50/p95 of every fetch phase to stderr"""
+    summary = summarize_timings(timings)
+    if summary:
+        typer.echo("--- Fetch timings ---", err=True)
+        typer.echo(format_timing_summary(summary), err=True)
+
+
 # Add a new function that accepts URL array instead of a file
 async def fetch_urls_async(
-    urls: List[str], options: FetchOptions, concurrency: int = 5
+    urls: List[str],
+    options: FetchOptions,
+    concurrency: int = 5,
+    deadline: Optional[float] = None,
+    min_successes: Optional[int] = None,
 ) -> List[FetchResult]:
-    """Use semaphore to limit concurrency"""
-    fetcher = Fetcher()
-    semaphore = asyncio.Semaphore(concurrency)
+    """
+    Fetch URLs with at most `concurrency` in flight, and per-host limits from `options`.
+
+    URLs not finished after `deadline` seconds, or once `min_successes` URLs succeeded, are
+    returned as failed with `error_type` 'timeout'.
+    """
+    async with Fetcher() as fetcher:
+        return await fetcher.fetch(urls, options, concurrency, deadline, min_successes)
+
+
+async def stream_urls_async(
+    urls: List[str], options: FetchOptions, concurrency: int = 5, output: Optional[str] = None
+) -> Tuple[int, int, List[FetchTimings]]:
+    """
+    Fetch URLs and write each result as a JSON line as soon as it arrives.
 
-    async def fetch_with_semaphore(url: str, index: int) -> FetchResult:
-        async with semaphore:
-            # Catch errors for individual URLs so batch processing can continue
-            try:
-                return await fetcher._fetch_url(url, options, index)
-            except Exception as e:
-                typer.echo(f"Internal error occurred while fetching {url}: {e}", err=True)
-                # Return a FetchResult with the error
-                return FetchResult(success=False, error=str(e), url=url, index=index)
+    Args:
+        urls: URLs to fetch
+        options: Fetch options
+        concurrency: Maximum number of URLs fetched at the same time
+        output: JSON Lines file to append to, stdout if None
 
-    tasks = [fetch_with_semaphore(url, i) for i, url in enumerate(urls)]
-    results = await asyncio.gather(*tasks)
-    return results  # Returns a List[FetchResult]
+    Returns:
+        Number of successful and failed fetches, and the timings of every fetch
+    """
+    success_count = fail_count = 0
+    timings: List[FetchTimings] = []
+    f = open(output, "a", encoding="utf-8") if output else sys.stdout
+    try:
+        async with Fetcher() as fetcher:
+            async for result in fetcher.fetch_iter(urls, options, concurrency):
+                f.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+                timings.append(result.timings)
+                f.flush()
+                if result.success:
+                    success_count += 1
+                else:
+                    fail_count += 1
+    finally:
+        if output:
+            f.close()
+    return success_count, fail_count, timings
 
 
 @app.command()
@@ -99,6 +189,7 @@ def fetch_urls(
     wait_until: str = "load",
     extract_content: bool = True,
     max_length: Optional[int] = None,
+    max_html_bytes: int = 5 * 1024 * 1024,
     return_html: bool = False,
     wait_for_navigation: bool = False,
     navigation_timeout: int = 10000,
@@ -106,8 +197,32 @@ def fetch_urls(
     debug: bool = False,
     output: Optional[str] = None,
     concurrency: int = 5,
+    page_pool_size: int = 5,
+    page_max_uses: int = 20,
+    page_idle_timeout: int = 60000,
+    engine: str = "browser",
+    min_content_length: int = 200,
+    use_cache: bool = False,
+    cache_ttl: int = 3600,
+    stream: bool = False,
+    per_host_concurrency: int = 2,
+    per_host_interval: int = 0,
+    readiness: str = "content",
+    ready_budget: int = 8000,
+    retries: int = 1,
+    hedge: bool = False,
+    extract_mode: str = "python",
+    deadline: Optional[float] = None,
+    min_successes: Optional[int] = None,
 ):
-    """Batch fetch content for multiple URLs (directly from URL list)"""
+    """Batch fetch content for multiple URLs (directly from URL list)
+
+    With --stream, each result is printed (or appended to --output) as a JSON line as soon as it
+    is ready, instead of all results at the end.
+
+    Without --stream, --deadline (seconds) and --min-successes cancel the unfinished fetches once
+    the deadline passes or enough URLs succeeded, and report them as failed.
+    """
     if wait_until not in ["load", "domcontentloaded", "networkidle", "commit"]:
         typer.echo(
             f"Error: wait_until must be one of 'load', 'domcontentloaded', 'networkidle', 'commit'",
@@ -115,6 +230,18 @@ def fetch_urls(
         )
         raise typer.Exit(1)
 
+    if engine not in ["auto", "http", "browser"]:
+        typer.echo(f"Error: engine must be one of 'auto', 'http', 'browser'", err=True)
+        raise typer.Exit(1)
+
+    if readiness not in ["load", "content"]:
+        typer.echo(f"Error: readiness must be one of 'load', 'content'", err=True)
+        raise typer.Exit(1)
+
+    if extract_mode not in ["python", "browser"]:
+        typer.echo(f"Error: extract_mode must be one of 'python', 'browser'", err=True)
+        raise typer.Exit(1)
+
     if not urls:
         typer.echo("URL list is empty", err=True)
         raise typer.Exit(1)
@@ -124,17 +251,42 @@ def fetch_urls(
         waitUntil=wait_until,  # type: ignore
         extractContent=extract_content,
         maxLength=max_length,
+        maxHtmlBytes=max_html_bytes or None,
         returnHtml=return_html,
         waitForNavigation=wait_for_navigation,
         navigationTimeout=navigation_timeout,
         disableMedia=disable_media,
         debug=debug,
+        pagePoolSize=page_pool_size,
+        pageMaxUses=page_max_uses,
+        pageIdleTimeout=page_idle_timeout,
+        engine=engine,  # type: ignore
+        minContentLength=min_content_length,
+        useCache=use_cache,
+        cacheTtl=cache_ttl,
+        perHostConcurrency=per_host_concurrency,
+        perHostInterval=per_host_interval,
+        readiness=readiness,  # type: ignore
+        readyBudget=ready_budget,
+        retries=retries,
+        hedge=hedge,
+        extractMode=extract_mode,  # type: ignore
     )
 
     # Execute batch fetch
-    typer.echo(f"Starting to fetch {len(urls)} URLs (concurrency: {concurrency})...")
+    typer.echo(f"Starting to fetch {len(urls)} URLs (concurrency: {concurrency})...", err=stream)
+    if stream:
+        success_count, fail_count, timings = asyncio.run(
+            stream_urls_async(urls, options, concurrency, output)
+        )
+        if output:
+            typer.echo(f"Results appended to: {output}", err=True)
+        print_timing_summary(timings)
+        typer.echo(f"Fetch completed: {success_count} successful, {fail_count} failed", err=True)
+        return
+
     results_list = asyncio.run(
-        fetch_urls_async(urls, options, concurrency)
+        fetch_urls_async(urls, options, concurrency, deadline, min_successes)
     )  # This is a list of FetchResult
 
     # Calculate result statistics
@@ -144,7 +296,7 @@ def fetch_urls(
     # Output results
     if output:
         # Convert result list to dictionary list for JSON serialization
-        results_dict = [r.__dict__ for r in results_list]
+        results_dict = [asdict(r) for r in results_list]
         with open(output, "w", encoding="utf-8") as f:
             json.dump(results_dict, f, ensure_ascii=False, indent=2)
         typer.echo(f"Results saved to: {output}")
@@ -167,5 +319,92 @@ def fetch_urls(
                 typer.echo(f"Fetch failed: {result.url} - {result.error}", err=True)
 
     # Print final statistics to stderr
+    print_timing_summary([r.timings for r in results_list])
     typer.echo(f"Fetch completed: {success_count} successful, {fail_count} failed", err=True)
     return results_list
+
+
+@app.command()
+def fetch_job(
+    input: Annotated[str, typer.Argument(help="File with one URL per line, '-' for stdin")],
+    output: Annotated[str, typer.Argument(help="JSON Lines file the results are appended to")],
+    checkpoint: Annotated[
+        Optional[str], typer.Option(help="Checkpoint file (default: <output>.checkpoint)")
+    ] = None,
+    restart: Annotated[
+        bool, typer.Option(help="Ignore an existing checkpoint and overwrite the output")
+    ] = False,
+    concurrency: Annotated[int, typer.Option(help="Maximum number of concurrent fetches")] = 5,
+    window: Annotated[
+        Optional[int], typer.Option(help="Maximum number of URLs in flight (default: 4 x concurrency)")
+    ] = None,
+    timeout: Annotated[int, typer.Option(help="Timeout in milliseconds")] = 30000,
+    extract_content: Annotated[bool, typer.Option(help="Whether to extract main content")] = True,
+    max_length: Annotated[
+        Optional[int], typer.Option(help="Maximum length of returned content")
+    ] = None,
+    engine: Annotated[
+        str, typer.Option(help="Fetch engine: 'browser', 'http', or 'auto' (HTTP first, browser fallback)")
+    ] = "browser",
+    use_cache: Annotated[bool, typer.Option(help="Whether to use the on-disk fetch cache")] = False,
+    per_host_concurrency: Annotated[
+        int, typer.Option(help="Maximum number of concurrent fetches per host")
+    ] = 2,
+    per_host_interval: Annotated[
+        int, typer.Option(help="Minimum time between fetches to the same host (milliseconds)")
+    ] = 0,
+    retries: Annotated[
+        int, typer.Option(help="Retries for timeouts and 5xx responses")
+    ] = 1,
+    hedge: Annotated[
+        bool, typer.Option(help="Start a second attempt for fetches slower than recent ones")
+    ] = False,
+    debug: Annotated[bool, typer.Option(help="Whether to enable debug mode")] = False,
+):
+    """Resumable bulk fetch of a URL file into a JSON Lines file
+
+    An interrupted job continues where it stopped when started again with the same arguments.
+    """
+    if engine not in ["auto", "http", "browser"]:
+        typer.echo(f"Error: engine must be one of 'auto', 'http', 'browser'", err=True)
+        raise typer.Exit(1)
+
+    options = FetchOptions(
+        timeout=timeout,
+        extractContent=extract_content,
+        maxLength=max_length,
+        engine=engine,  # type: ignore
+        useCache=use_cache,
+        perHostConcurrency=per_host_concurrency,
+        perHostInterval=per_host_interval,
+        retries=retries,
+        hedge=hedge,
+        debug=debug,
+    )
+    job = FetchJob(input, output, checkpoint, options, concurrency, window)
+    try:
+        success_count, fail_count = asyncio.run(job.run(restart))
+    except KeyboardInterrupt:
+        typer.echo(f"Interrupted, run again to resume from {job.checkpoint.path}", err=True)
+        raise typer.Exit(130)
+    typer.echo(f"Fetch completed: {success_count} successful, {fail_count} failed", err=True)
+
+
+@app.command()
+def fetch_strategy(
+    domain: Annotated[Optional[str], typer.Option(help="Only show or reset this domain")] = None,
+    reset: Annotated[bool, typer.Option(help="Forget the learned engines")] = False,
+):
+    """Show or reset the fetch engine learned per domain by `--engine auto`"""
+    strategy = EngineStrategy()
+    if reset:
+        strategy.reset(domain)
+        strategy.save()
+        typer.echo(f"Fetch strategy reset: {domain or 'all domains'}", err=True)
+        return
+
+    entries = strategy.entries
+    if domain:
+        domain = registrable_domain(domain)
+        entries = {k: v for k, v in entries.items() if k == domain}
+    print(json.dumps(entries, ensure_ascii=False, indent=2))
@@ -0,0 +1,96 @@
+"""
+Retries and hedging for fetches
+
+Classifies failed fetches by cause, decides which of them are worth retrying and how long to
+wait before doing so, and tracks fetch latencies to find the deadline after which a slow fetch
+gets a hedged second attempt.
+"""
+
+import random
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, FrozenSet, Optional
+
+
+ERROR_DNS = 'dns'
+ERROR_TIMEOUT = 'timeout'
+ERROR_HTTP_4XX = 'http_4xx'
+ERROR_HTTP_5XX = 'http_5xx'
+ERROR_BLOCKED = 'blocked'
+ERROR_OTHER = 'other'
+
+# Messages of aiohttp, the resolver and Chromium for names that cannot be resolved
+_DNS_PATTERN = re.compile(
+    r"ERR_NAME_NOT_RESOLVED|Name or service not known|nodename nor servname|getaddrinfo|"
+    r"name resolution|No address associated|Cannot connect to host .*\[Errno -?\d+\]",
+    re.IGNORECASE,
+)
+_TIMEOUT_PATTERN = re.compile(r"timeout|timed out|ERR_TIMED_OUT", re.IGNORECASE)
+_BLOCKED_PATTERN = re.compile(r"captcha|access denied|验证码|安全验证", re.IGNORECASE)
+# Statuses with which sites usually refuse crawlers rather than report a missing page
+_BLOCKED_STATUSES = {401, 403, 429}
+
+
+def classify_error(error: Optional[str], status: Optional[int] = None) -> str:
+    """
+    Classify a failed fetch.
+
+    Args:
+        error: Error message of the fetch
+        status: HTTP status of the main response, if any
+
+    Returns:
+        One of 'dns', 'timeout', 'http_4xx', 'http_5xx', 'blocked' and 'other'
+    """
+    error = error or ""
+    if _DNS_PATTERN.search(error):
+        return ERROR_DNS
+    if status in _BLOCKED_STATUSES or _BLOCKED_PATTERN.search(error):
+        return ERROR_BLOCKED
+    if status is not None and status >= 500:
+        return ERROR_HTTP_5XX
+    if status is not None and status >= 400:
+        return ERROR_HTTP_4XX
+    if _TIMEOUT_PATTERN.search(error):
+        return ERROR_TIMEOUT
+    return ERROR_OTHER
+
+
+@dataclass
+class RetryPolicy:
+    """Which failures are retried, how often, and with what backoff"""
+
+    retries: int = 1  # Number of retries after the first attempt
+    base_delay: float = 0.5  # Delay before the first retry (seconds), doubled for every further one
+    max_delay: float = 10.0  # Upper bound of the delay (seconds)
+    jitter: float = 0.5  # Delays are drawn from [delay * (1 - jitter), delay]
+    # Only transient failures; 'other' includes deterministic ones like unsupported content
+    retry_on: FrozenSet[str] = frozenset({ERROR_TIMEOUT, ERROR_HTTP_5XX})
+
+    def should_retry(self, error_type: str, attempt: int) -> bool:
+        """Whether to retry after `attempt` attempts failed, the last one with `error_type`"""
+        return attempt <= self.retries and error_type in self.retry_on
+
+    def delay(self, attempt: int) -> float:
+        """Time to wait before the retry following attempt number `attempt` (seconds)"""
+        delay = min(self.base_delay * 2 ** (attempt - 1), self.max_delay)
+        return delay * (1 - self.jitter * random.random())
+
+
+class LatencyTracker:
+    """Sliding window of recent fetch latencies"""
+
+    def __init__(self, size: int = 200, min_samples: int = 5):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """The `q` quantile of the window (seconds), None until `min_samples` latencies were seen"""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
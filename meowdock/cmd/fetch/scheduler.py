@@ -0,0 +1,100 @@
+"""
+Politeness scheduler for batch fetches
+
+Limits how many URLs are fetched at once overall and per host, spaces out requests to the
+same host, and backs off hosts that answer 429/503.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from meowdock.library.utils.url import get_host
+
+
+# Status codes that mean the host wants us to slow down
+THROTTLE_STATUSES = {429, 503}
+
+
+class _HostState:
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.next_start = 0.0  # Earliest time (monotonic) the next request may start
+        self.strikes = 0  # Consecutive throttling responses
+        self.users = 0  # Tasks holding or waiting for a slot
+
+
+class HostScheduler:
+    """
+    Scheduler handing out fetch slots per host.
+
+    A slot for a host is taken first, then the per-host spacing is honoured, and only then a
+    global slot is taken, so URLs waiting for a busy host do not block other hosts.
+
+    Usage:
+        scheduler = HostScheduler(global_limit=10, per_host_limit=2)
+        async with scheduler.slot(url):
+            ...
+    """
+
+    def __init__(
+        self,
+        global_limit: Optional[int] = None,
+        per_host_limit: int = 2,
+        min_interval: float = 0.0,
+        backoff: float = 2.0,
+        max_backoff: float = 60.0,
+    ):
+        """
+        Args:
+            global_limit: Maximum number of fetches overall, None for no limit
+            per_host_limit: Maximum number of concurrent fetches per host
+            min_interval: Minimum time between the starts of two fetches to the same host (seconds)
+            backoff: Initial pause for a host after a 429/503 response, doubled on repeats (seconds)
+            max_backoff: Upper bound of the pause (seconds)
+        """
+        self.per_host_limit = max(per_host_limit, 1)
+        self.min_interval = min_interval
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._global = asyncio.Semaphore(global_limit) if global_limit else None
+        self._hosts: Dict[str, _HostState] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Wait until a fetch of `url` may start, and hold the slot while it runs"""
+        host = get_host(url)
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.per_host_limit)
+        state.users += 1
+        try:
+            async with state.semaphore:
+                now = time.monotonic()
+                start = max(now, state.next_start)
+                state.next_start = start + self.min_interval
+                if start > now:
+                    await asyncio.sleep(start - now)
+                if self._global is None:
+                    yield
+                else:
+                    async with self._global:
+                        yield
+        finally:
+            state.users -= 1
+            if state.users == 0 and state.strikes == 0 and state.next_start <= time.monotonic():
+                # Forget idle hosts so long runs over many hosts keep a small table
+                self._hosts.pop(host, None)
+
+    def report(self, url: str, status: Optional[int]) -> None:
+        """Report the HTTP status of a finished fetch, pausing the host if it is throttling us"""
+        state = self._hosts.get(get_host(url))
+        if state is None:
+            return
+        if status in THROTTLE_STATUSES:
+            state.strikes += 1
+            delay = min(self.backoff * 2 ** (state.strikes - 1), self.max_backoff)
+            state.next_start = max(state.next_start, time.monotonic() + delay)
+        elif status is not None:
+            state.strikes = 0
@@ -0,0 +1,102 @@
+"""
+Learned fetch engine per domain
+
+Remembers which engine ('http' or 'browser') worked for a registrable domain, so that
+`engine='auto'` fetches can go straight to it instead of trying plain HTTP first.
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from meowdock.library.utils.fileio import atomic_write_json
+from meowdock.library.utils.url import registrable_domain
+
+
+STRATEGY_PATH = os.getenv('FETCH_STRATEGY_JSON_PATH', 'fetch_strategy.json')
+
+
+class EngineStrategy:
+    """
+    Small persistent table keyed by registrable domain.
+
+    Each entry records the engine that produced the last successful fetch and how many times in a
+    row it did so. An engine is only trusted after `min_hits` consecutive successes, and entries
+    expire `ttl` seconds after the engine was first learned, however often it is confirmed since,
+    so that a domain learned as 'browser' gets plain HTTP tried again from time to time.
+    """
+
+    def __init__(self, path: str = STRATEGY_PATH, ttl: float = 7 * 24 * 3600, min_hits: int = 2):
+        self.path = path
+        self.ttl = ttl
+        self.min_hits = min_hits
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._dirty = False
+
+    @property
+    def entries(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Failed to load fetch strategy table {self.path}: {str(e)}")
+            return {}
+        now = time.time()
+        return {k: v for k, v in entries.items() if now - self._learned_at(v) <= self.ttl}
+
+    @staticmethod
+    def _learned_at(entry: Dict) -> float:
+        # Tables written before `learned_at` existed only have `updated`
+        return entry.get("learned_at", entry.get("updated", 0))
+
+    def lookup(self, url: str) -> Optional[str]:
+        """Get the learned engine for the domain of a URL, or None if nothing reliable is known"""
+        entry = self.entries.get(registrable_domain(url))
+        if not entry:
+            return None
+        if time.time() - self._learned_at(entry) > self.ttl:
+            del self.entries[registrable_domain(url)]
+            self._dirty = True
+            return None
+        return entry["engine"] if entry["hits"] >= self.min_hits else None
+
+    def record(self, url: str, engine: str) -> None:
+        """Record that `engine` successfully fetched a URL"""
+        domain = registrable_domain(url)
+        if not domain:
+            return
+        entry = self.entries.get(domain)
+        now = time.time()
+        if entry and entry["engine"] == engine and now - self._learned_at(entry) <= self.ttl:
+            entry["hits"] += 1
+        else:
+            entry = self.entries[domain] = {"engine": engine, "hits": 1, "learned_at": now}
+        entry["updated"] = now
+        self._dirty = True
+
+    def reset(self, domain: Optional[str] = None) -> None:
+        """Forget one domain, or the whole table"""
+        if domain is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(registrable_domain(domain), None)
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the table atomically if it changed"""
+        if not self._dirty:
+            return
+        try:
+            atomic_write_json(self.path, self.entries, ensure_ascii=False, indent=2)
+            self._dirty = False
+        except OSError as e:
+            logging.warning(f"Failed to save fetch strategy table {self.path}: {str(e)}")
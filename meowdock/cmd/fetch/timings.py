@@ -0,0 +1,72 @@
+"""
+Per-phase fetch timings
+
+Every `FetchResult` carries a `FetchTimings` with the time spent in each phase of the fetch,
+and `summarize_timings` aggregates them over a batch into p50/p95 per phase.
+"""
+
+import time
+from dataclasses import dataclass, fields
+from typing import Dict, Iterable, List, Optional
+
+
+@dataclass
+class FetchTimings:
+    """Time spent in each phase of a fetch (milliseconds), None for phases that did not run"""
+
+    queue_wait: Optional[float] = None  # Waiting for a concurrency / per-host slot
+    acquire: Optional[float] = None  # Getting a browser tab from the pool
+    ttfb: Optional[float] = None  # Request start to the first byte of the main response
+    load: Optional[float] = None  # Navigation until `waitUntil` (browser) or body read (HTTP)
+    ready: Optional[float] = None  # Waiting for the page to be ready after navigation
+    serialize: Optional[float] = None  # Pruning and serializing the DOM with `page.content()`
+    extract: Optional[float] = None  # Extracting the content from the HTML
+    total: Optional[float] = None  # The whole fetch, including retries
+    html_bytes: Optional[int] = None  # Size of the HTML (UTF-8 bytes)
+    content_length: Optional[int] = None  # Length of the returned content (characters)
+
+
+def elapsed_ms(start: float) -> float:
+    """Milliseconds since `start`, a `time.perf_counter()` value"""
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def summarize_timings(timings: Iterable[FetchTimings]) -> Dict[str, Dict[str, float]]:
+    """
+    Aggregate the timings of a batch.
+
+    Returns:
+        For every phase that ran at least once: the number of samples, p50 and p95
+    """
+    samples: Dict[str, List[float]] = {f.name: [] for f in fields(FetchTimings)}
+    for timing in timings:
+        for name, values in samples.items():
+            value = getattr(timing, name)
+            if value is not None:
+                values.append(value)
+
+    summary = {}
+    for name, values in samples.items():
+        if values:
+            values.sort()
+            summary[name] = {
+                "count": len(values),
+                "p50": _percentile(values, 0.5),
+                "p95": _percentile(values, 0.95),
+            }
+    return summary
+
+
+def format_timing_summary(summary: Dict[str, Dict[str, float]]) -> str:
+    """Render a timing summary as a small table"""
+    lines = [f"{'phase':<16}{'count':>8}{'p50':>12}{'p95':>12}"]
+    for name, stats in summary.items():
+        unit = "" if name in ("html_bytes", "content_length") else " ms"
+        lines.append(
+            f"{name:<16}{stats['count']:>8}{stats['p50']:>9.0f}{unit:<3}{stats['p95']:>9.0f}{unit:<3}"
+        )
+    return "\n".join(lines)
@@ -1,9 +1,8 @@
 from playwright.async_api import async_playwright
-import json
 import os
 import sys
 import asyncio
-from meowdock.library.browser import find_chromium, get_cookies
+from meowdock.library.browser import find_chromium, get_cookies, get_cookie_store
 import typer
 from typing_extensions import Annotated
 from typing import List, Optional
@@ -13,11 +12,9 @@ app = typer.Typer(help="Login and save cookies")
 
 
 CHROME_PATH = find_chromium()
-COOKIES_PATH = os.getenv('COOKIES_JSON_PATH', "cookies.json")
 USER_DATA_DIR = os.getenv('CHROME_USER_DATA_PATH', 'chrome_data/')
 
 tracked_pages = set()
-cookies = get_cookies()
 
 
 async def track_new_page(page):
@@ -26,18 +23,15 @@ async def track_new_page(page):
 
 
 async def on_page_close(page):
-    global cookies, COOKIES_PATH
     tracked_pages.discard(page)
-    cookies = (await page.context.cookies())
-    with open(COOKIES_PATH, 'w+', encoding='utf-8') as f:
-        f.write(json.dumps(cookies, ensure_ascii=False))
+    # Saved atomically, running processes pick the new cookies up from the store
+    get_cookie_store().save(await page.context.cookies())
 
 
 async def alogin(urls=[]):
-    global cookies
     async with async_playwright() as p:
         context = await p.chromium.launch_persistent_context(user_data_dir=USER_DATA_DIR, executable_path=CHROME_PATH, headless=False, args=['--disable-blink-features=AutomationControlled'])
-        await context.add_cookies(cookies)
+        await context.add_cookies(get_cookies())
         if len(urls) > 0:
             for url in urls:
                 page = await context.new_page()
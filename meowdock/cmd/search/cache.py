@@ -0,0 +1,172 @@
+"""
+On-disk search result cache
+
+Stores the result lists of searches in a SQLite database, keyed by engine, normalized query
+and the request parameters that change the results, so repeated searches skip the scraper.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+from meowdock.cmd.search.scrapers import ScrapeRequest, SearchResult
+from meowdock.cmd.search.scrapers.scraper_factory import get_scraper_host
+from meowdock.library.utils.sqlite_cache import SQLiteCache
+
+
+SEARCH_CACHE_PATH = os.getenv('SEARCH_CACHE_PATH', 'cache/search_cache.sqlite3')
+
+# Time after which cached results of an engine are searched again (seconds)
+DEFAULT_TTLS: Dict[str, float] = {
+    "baidu": 6 * 3600,
+    "bing": 6 * 3600,
+}
+DEFAULT_TTL = 3600
+# Scraper arguments that only change how a search runs, not its results
+_KEY_EXCLUDED_KWARGS = {"concurrency", "sleep", "proxy"}
+
+
+def normalize_term(term: str) -> str:
+    """Normalize a query so that trivially different spellings share a cache entry"""
+    return " ".join(unicodedata.normalize("NFKC", term).casefold().split())
+
+
+class SearchCache(SQLiteCache):
+    """
+    Cache of search results on disk.
+
+    Entries expire after the TTL of their engine. Entries older than `max_age` are deleted on
+    write, and when the total size exceeds `max_bytes`, the least recently used entries are
+    evicted. Every thread gets its own SQLite connection, so one cache can be shared by
+    searches running in worker threads.
+    """
+
+    table = "search_cache"
+    columns = """engine TEXT NOT NULL,
+                    term TEXT NOT NULL,
+                    results TEXT NOT NULL,
+                    searched_at REAL NOT NULL"""
+    label = "Search cache"
+
+    def __init__(
+        self,
+        path: str = SEARCH_CACHE_PATH,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        max_age: float = 7 * 24 * 3600,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        super().__init__(path, max_bytes)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.max_age = max_age
+
+    def ttl(self, engine: str) -> float:
+        return self.ttls.get(engine, self.default_ttl)
+
+    @staticmethod
+    def make_key(
+        engine: str, request: ScrapeRequest, engine_kwargs: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Build a cache key from the engine and the parameters that affect the results.
+
+        Args:
+            engine: Search engine name
+            request: Search request
+            engine_kwargs: Parameters of the search engine constructor, e.g. `max_pages`
+        """
+        variant = {
+            "kwargs": {
+                k: v for k, v in (engine_kwargs or {}).items() if k not in _KEY_EXCLUDED_KWARGS
+            },
+            "engine": engine.lower().strip(),
+            "term": normalize_term(request.term),
+            "count": request.count,
+            "domain": request.domain,
+            "language": request.language,
+            "geo": request.geo,
+            "filters": request.filters,
+        }
+        raw = json.dumps(variant, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, engine: str) -> Optional[List[SearchResult]]:
+        """Get the cached results, None if there are none or they are older than the engine TTL"""
+        try:
+            row = self.conn.execute(
+                'SELECT results, searched_at FROM search_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or time.time() - row[1] > self.ttl(engine):
+                return None
+            self._mark_used(key)
+            return [SearchResult(**item) for item in json.loads(row[0])]
+        except (sqlite3.Error, ValueError, TypeError) as e:
+            logging.warning(f"Search cache read failed: {str(e)}")
+            return None
+
+    def put(self, key: str, engine: str, term: str, results: List[SearchResult]) -> None:
+        now = time.time()
+        data = json.dumps(
+            [
+                {"rank": r.rank, "link": r.link, "title": r.title, "snippet": r.snippet}
+                for r in results
+            ],
+            ensure_ascii=False,
+        )
+        self._insert((key, engine, term, data, now, now, len(data.encode("utf-8"))))
+
+    def _evict(self, now: float) -> None:
+        self.conn.execute('DELETE FROM search_cache WHERE searched_at < ?', (now - self.max_age,))
+        super()._evict(now)
+
+
+_search_cache: Optional[SearchCache] = None
+
+
+def get_search_cache() -> SearchCache:
+    """Get the process-wide search cache"""
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = SearchCache()
+    return _search_cache
+
+
+async def cached_scrape(
+    engine: str,
+    request: ScrapeRequest,
+    use_cache: bool = True,
+    cache: Optional[SearchCache] = None,
+    **kwargs,
+) -> List[SearchResult]:
+    """
+    Search with the shared scraper of `engine` (see `ScraperHost`), serving and storing
+    results in the cache.
+
+    Empty result lists are not stored, since they usually mean the engine blocked the search.
+
+    Args:
+        engine: Search engine name, e.g. 'bing'
+        request: Search request
+        use_cache: Whether to use the cache; if False the search always runs and is not stored
+        cache: Cache to use, defaults to the process-wide one
+        **kwargs: Parameters passed to the search engine constructor
+    """
+    if use_cache:
+        cache = cache or get_search_cache()
+        key = cache.make_key(engine, request, kwargs)
+        results = cache.get(key, engine)
+        if results is not None:
+            logging.info(f"Serving {engine} results for '{request.term}' from the search cache")
+            return results
+
+    results = await get_scraper_host().scrape(engine, request, **kwargs)
+
+    if use_cache and results:
+        cache.put(key, engine, normalize_term(request.term), results)
+    return results
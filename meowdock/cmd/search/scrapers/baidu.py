@@ -6,8 +6,7 @@ from typing import List, Dict, Optional
 import re
 from urllib.parse import unquote
 
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
+from playwright.async_api import BrowserContext
 
 # Import shared libraries
 from meowdock.library.browser import (
@@ -16,9 +15,11 @@ from meowdock.library.browser import (
     init_logger,
     get_user_agents,
     extract_main_content,
-    abort_resource,
     get_strict_resources,
-    get_cookies
+    get_blocklist,
+    BrowserPool,
+    get_cookie_store,
+    get_default_headers,
 )
 
 from meowdock.cmd.search.scrapers import (
@@ -29,11 +30,12 @@ from meowdock.cmd.search.scrapers import (
 )
 from meowdock.cmd.search.scrapers import BlockedException, ConfigException
 from meowdock.cmd.search.scrapers.scraper_factory import register
+from meowdock.cmd.search.scrapers.parsers import parse_baidu_page
+from meowdock.cmd.search.scrapers.redirect import get_redirect_resolver
 import json
 
 
 USER_DATA_DIR = os.getenv('CHROME_USER_DATA_PATH', 'chrome_data/')
-cookies = get_cookies()
 
 
 
@@ -43,12 +45,28 @@ def _check_config(max_pages: int):
     return max_pages
 
 
+def _check_engine(engine: str):
+    if engine not in ("auto", "http", "browser"):
+        raise ConfigException("Baidu engine must be one of 'auto', 'http', 'browser'")
+    return engine
+
+
 @register('baidu')
 class BaiduScraper(SearchScraper):
     BASE_URL = "https://www.baidu.com/s?wd={}&pn={}"
 
-    def __init__(self, max_pages: int = 10):
+    def __init__(self, max_pages: int = 10, concurrency: int = 3, engine: str = "auto"):
+        """
+        Args:
+            max_pages: Maximum number of result pages per search
+            concurrency: Maximum number of result pages loaded at the same time
+            engine: 'http', 'browser', or 'auto' (HTTP, browser only when HTTP gets a
+                verification page)
+        """
         self.max_pages = _check_config(max_pages)
+        self.concurrency = concurrency
+        self.engine = _check_engine(engine)
+        self._pool: Optional[BrowserPool] = None
         self.browser_path = find_chromium()  # Use shared library to find browser
         init_logger()  # Use shared library to initialize logger
         self.user_agents = get_user_agents()  # Use shared library to get user agents
@@ -56,58 +74,7 @@ class BaiduScraper(SearchScraper):
 
     def _parse_page(self, results: List[SearchResult], resp: ScrapeResponse) -> None:
         """Parse Baidu search results page"""
-        rank = len(results) + 1
-        soup = BeautifulSoup(resp.html, "html.parser")
-
-        # Baidu search results are usually in h3 tags under div with id="content_left"
-        for result_div in soup.select('#content_left > div'):
-            h3_tag = result_div.find('h3')
-            if not h3_tag:
-                continue
-
-            link_tag = h3_tag.find('a', href=True)
-            if not link_tag:
-                continue
-
-            link = link_tag['href']
-            title = link_tag.get_text().strip()
-
-            # Find summary text - enhanced version
-            snippet = ""
-
-            # Try multiple possible summary containers
-            snippet_candidates = [
-                result_div.find('div', {'class': 'c-abstract'}),
-                result_div.find('div', {'class': 'content-right'}),
-                result_div.find('div', {'class': 'c-span9'}),
-                result_div.find('span', {'class': 'content-right_8Zs40'}),
-                # Find content preview box
-                result_div.find('div', {'class': 'c-row'}),
-                # Generic alternative: search for any paragraph tag
-                result_div.find('p'),
-            ]
-
-            # Use the first non-None candidate
-            for candidate in snippet_candidates:
-                if candidate:
-                    snippet = candidate.get_text().strip()
-                    if snippet:  # Exit if non-empty content is obtained
-                        break
-
-            # If all above methods fail, try to get all text under div except h3
-            if not snippet:
-                # Get all text except h3
-                h3s = result_div.find_all('h3')
-                for h3 in h3s:
-                    h3.decompose()  # Temporarily remove h3 tags from DOM
-
-                full_text = result_div.get_text().strip()
-                if full_text:
-                    # Only take the first 150 characters as summary
-                    snippet = full_text[:150].strip()
-
-            results.append(SearchResult(rank, link, title, snippet))
-            rank += 1
+        results.extend(parse_baidu_page(resp.html, len(results) + 1))
 
     def _paginate(self, term: str, domain: str, language: str, count: int):
         """Generate Baidu search pagination URLs"""
@@ -129,48 +96,100 @@ class BaiduScraper(SearchScraper):
         # Check if CAPTCHA appears
         if "verify" in res.html.lower() and "human verification" in res.html:
             raise BlockedException("Baidu requires human verification")
+        if "<title>百度安全验证</title>" in res.html:
+            raise BlockedException("Baidu requires security verification")
 
         return
 
+    def _get_pool(self) -> BrowserPool:
+        """Get the browser of this scraper, launched on first use and shared by its searches"""
+        if self._pool is None:
+            self._pool = BrowserPool()
+        return self._pool
+
+    async def close(self) -> None:
+        """Close the browser and the HTTP session"""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+        await super().close()
+
+    async def _scrape_tab(
+        self, context: BrowserContext, semaphore: asyncio.Semaphore, url: str, sleep: float
+    ) -> ScrapeResponse:
+        """Load one result page in its own tab"""
+        async with semaphore:
+            await self._wait_turn(sleep)
+            page = await context.new_page()
+            try:
+                response = await page.goto(url, wait_until="domcontentloaded")
+                html = await page.content()
+                return ScrapeResponse(html, response.status)
+            finally:
+                await page.close()
+
+    async def _scrape_http(self, urls: List[str], req: ScrapeRequest) -> List[ScrapeResponse]:
+        """Fetch result pages over plain HTTP with the saved Baidu cookies"""
+        headers = {
+            **get_default_headers(),
+            "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+            "Referer": "https://www.baidu.com/",
+        }
+        cookies = get_cookie_store().cookies_for(urls)
+        if cookies:
+            headers["Cookie"] = "; ".join(f"{c['name']}={c['value']}" for c in cookies)
+
+        responses = await self._scrape_many(urls, headers, req.proxy, req.sleep)
+        for scrape_response in responses:
+            self._check_exceptions(scrape_response)
+            # Without the result container Baidu served a script-only page meant for browsers
+            if "content_left" not in scrape_response.html:
+                raise BlockedException("Baidu returned a page without results")
+        return responses
+
+    async def _scrape_browser(self, urls: List[str], req: ScrapeRequest) -> List[ScrapeResponse]:
+        """Load result pages in parallel tabs of one browser context"""
+        async with self._get_pool().context(
+            urls, user_agent=random.choice(self.user_agents)
+        ) as context:
+            # Block trackers and unnecessary resources, explicitly pass blocking set
+            await get_blocklist().apply_to_context(context, self.block_resources_set)
+
+            semaphore = asyncio.Semaphore(self.concurrency)
+            responses = await asyncio.gather(
+                *[self._scrape_tab(context, semaphore, url, req.sleep) for url in urls]
+            )
+
+        for scrape_response in responses:
+            self._check_exceptions(scrape_response)
+        return responses
+
     async def scrape(self, req: ScrapeRequest) -> List[SearchResult]:
         """Execute Baidu search and return results"""
         urls = self._paginate(req.term, req.domain, req.language, req.count)
         results = []
 
-        async with async_playwright() as p:
-            try:
-                browser = await p.chromium.launch(
-                    headless=True,
-                    executable_path=self.browser_path,
-                    args=['--disable-blink-features=AutomationControlled'],
-                )
-                context = await browser.new_context(user_agent=random.choice(self.user_agents))
-                await context.add_cookies(cookies)
-
-                # Set route interception, explicitly pass blocking set
-                await context.route(
-                    "**/*", lambda route: abort_resource(route, self.block_resources_set)
-                )
-
-                for idx, url in enumerate(urls):
-                    page = await context.new_page()
-                    response = await page.goto(url, wait_until="domcontentloaded")
-
-                    html = await page.content()
-                    scrape_response = ScrapeResponse(html, response.status)
-
-                    self._check_exceptions(scrape_response)
-                    self._parse_page(results, scrape_response)
-
-                    await page.close()
-
-                    if idx < len(urls) - 1:
-                        await asyncio.sleep(req.sleep)
-
-                await browser.close()
-
-            except Exception as e:
-                logging.error(f"Baidu search failed: {str(e)}")
-                raise
-
-        return results[: req.count]
+        try:
+            responses = None
+            if self.engine in ("auto", "http"):
+                try:
+                    responses = await self._scrape_http(urls, req)
+                except BlockedException as e:
+                    if self.engine == "http":
+                        raise
+                    logging.info(f"Baidu HTTP search blocked ({str(e)}), falling back to the browser")
+            if responses is None:
+                responses = await self._scrape_browser(urls, req)
+
+            # Parse in page order, so ranks do not depend on which page finished first
+            for scrape_response in responses:
+                self._parse_page(results, scrape_response)
+
+        except Exception as e:
+            logging.error(f"Baidu search failed: {str(e)}")
+            raise
+
+        results = results[: req.count]
+        # Replace baidu.com/link redirects with the real destinations, saving a hop per fetch
+        await get_redirect_resolver().resolve_results(results)
+        return results
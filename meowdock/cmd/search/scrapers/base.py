@@ -1,7 +1,9 @@
+import asyncio
+import time
 from abc import ABCMeta, abstractmethod
 from random import choice
 from typing import Dict, List, Optional
-from aiohttp import ClientSession, ClientError
+from aiohttp import ClientSession, ClientError, ClientTimeout, TCPConnector
 from meowdock.cmd.search.const import _USER_AGENTS
 
 
@@ -65,7 +67,27 @@ class ScrapeResponse:
         )
 
 
+# Earliest start of the next request to each engine, shared by all scrapers of the engine
+_next_request: Dict[str, float] = {}
+
+
 class SearchScraper(metaclass=ABCMeta):
+    """
+    Base class of the search engine scrapers.
+
+    HTTP requests go through one keep-alive session per scraper, created on first use, so
+    the result pages of a search (and of later searches with the same scraper) reuse their
+    connections. Close the scraper when done, or use it as an async context manager:
+
+        async with get_scraper('bing') as scraper:
+            results = await scraper.scrape(request)
+    """
+
+    # Maximum number of result pages fetched at the same time
+    concurrency: int = 3
+    _session: Optional[ClientSession] = None
+    _session_loop: Optional[asyncio.AbstractEventLoop] = None
+
     @staticmethod
     def user_agent() -> Dict[str, str]:
         return {
@@ -76,16 +98,73 @@ class SearchScraper(metaclass=ABCMeta):
             'Upgrade-Insecure-Requests': '1',
         }
 
+    def _get_session(self) -> ClientSession:
+        """Get the shared session, creating it for the running event loop if needed"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = ClientSession(
+                connector=TCPConnector(limit_per_host=self.concurrency, keepalive_timeout=30),
+                timeout=ClientTimeout(total=60),
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+    async def _wait_turn(self, interval: float) -> None:
+        """
+        Wait until `interval` seconds have passed since the previous request to this engine.
+
+        The spacing applies across all pages and concurrent searches of the engine, so
+        parallel pages are spread out instead of each page sleeping on its own.
+        """
+        if interval <= 0:
+            return
+        engine = type(self).__name__
+        now = time.monotonic()
+        start = max(now, _next_request.get(engine, 0.0))
+        _next_request[engine] = start + interval
+        await asyncio.sleep(start - now)
+
+    async def __aenter__(self) -> "SearchScraper":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
     async def _scrape_one(
         self, url: str, headers: Dict[str, str], proxy: Optional[str]
     ) -> ScrapeResponse:
-        async with ClientSession() as client:
-            try:
-                async with client.get(url, headers=headers, proxy=proxy, timeout=60) as response:
-                    html = await response.text()
-                    return ScrapeResponse(html, response.status)
-            except ClientError as err:
-                raise err
+        try:
+            async with self._get_session().get(url, headers=headers, proxy=proxy) as response:
+                html = await response.text()
+                return ScrapeResponse(html, response.status)
+        except ClientError as err:
+            raise err
+
+    async def _scrape_many(
+        self, urls: List[str], headers: Dict[str, str], proxy: Optional[str], sleep: float = 0
+    ) -> List[ScrapeResponse]:
+        """
+        Fetch result pages concurrently, at most `concurrency` at a time and with request
+        starts spaced `sleep` seconds apart (see `_wait_turn`).
+
+        Returns:
+            Responses in the order of `urls`
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(url: str) -> ScrapeResponse:
+            async with semaphore:
+                await self._wait_turn(sleep)
+                return await self._scrape_one(url, headers, proxy)
+
+        return await asyncio.gather(*[fetch(url) for url in urls])
 
     @abstractmethod
     def _check_exceptions(self, res: ScrapeResponse) -> None:
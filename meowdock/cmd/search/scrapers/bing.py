@@ -1,8 +1,5 @@
-import asyncio
 from typing import List
 
-import bs4
-
 from meowdock.cmd.search.scrapers import (
     SearchScraper,
     ScrapeRequest,
@@ -11,6 +8,7 @@ from meowdock.cmd.search.scrapers import (
 )
 from meowdock.cmd.search.scrapers import BlockedException, ConfigException
 from meowdock.cmd.search.scrapers.scraper_factory import register
+from meowdock.cmd.search.scrapers.parsers import parse_bing_page
 
 def _check_config(max_results: int):
     if max_results > 30:
@@ -22,39 +20,19 @@ def _check_config(max_results: int):
 class BingScraper(SearchScraper):
     BASE_URL = "https://www.bing.com/search?q={}&first={}&count={}"
 
-    def __init__(self, max_results_per_page: int = 10):
+    def __init__(self, max_results_per_page: int = 10, concurrency: int = 3):
         self.max_results = _check_config(max_results_per_page)
+        self.concurrency = concurrency
 
     def _parse_page(self, results: List[SearchResult], resp: ScrapeResponse) -> None:
-        rank = len(results) + 1
-        soup = bs4.BeautifulSoup(resp.html, "html.parser")
-        for block in soup.find_all("li", attrs={"class": "b_algo"}):
-            link = block.find("a", href=True)
-            if link:
-                link = link["href"]
-
-            if not link:
-                continue
-
-            title = block.find("h2")
-            if title:
-                title = title.get_text()
-
-            description = block.find("div", {"class": "b_caption"})
-            if description:
-                description = description.find("p")
-                if description:
-                    description = description.get_text()
-            results.append(SearchResult(rank, link, title, description))
-            rank += 1
+        results.extend(parse_bing_page(resp.html, len(results) + 1))
 
     def _paginate(self, term: str, domain: str, language: str, count: int):
         urls: List[str] = []
         first = 1
-        num = 0
-        while num < count:
+        while first <= count:
             urls.append(self.BASE_URL.format(term, first, self.max_results))
-            num += self.max_results
+            first += self.max_results
         return urls
 
     def _check_exceptions(self, res: ScrapeResponse) -> None:
@@ -67,11 +45,10 @@ class BingScraper(SearchScraper):
         language = req.language if req.language else "en"
         urls = self._paginate(req.term, domain, language, req.count)
         headers = self.user_agent()
-        results = []
-        for idx, uri in enumerate(urls):
-            response = await self._scrape_one(uri, headers, req.proxy)
+        responses = await self._scrape_many(urls, headers, req.proxy, req.sleep)
+        results: List[SearchResult] = []
+        # Pages are parsed in page order, so ranks continue across pages
+        for response in responses:
             self._check_exceptions(response)
             self._parse_page(results, response)
-            if not idx == len(urls) - 1:
-                await asyncio.sleep(req.sleep)
         return results
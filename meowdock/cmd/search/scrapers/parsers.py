@@ -0,0 +1,155 @@
+"""
+Search result page parsers
+
+Parses Baidu and Bing result pages with lxml and precompiled XPath expressions. The text
+helpers follow BeautifulSoup's `get_text()` (script, style, template and ruby annotation
+text is skipped), so the results match the earlier BeautifulSoup parsers.
+"""
+
+from typing import List, Optional
+
+import lxml.html
+from lxml import etree
+
+from meowdock.cmd.search.scrapers.base import SearchResult
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate for elements with `name` among their classes"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Text of an element and its descendants, like BeautifulSoup's get_text()
+_TEXT = etree.XPath(
+    ".//text()[not(ancestor::script or ancestor::style or ancestor::template"
+    " or ancestor::rt or ancestor::rp)]"
+)
+# Same, without the text of headings (the Baidu snippet fallback)
+_TEXT_WITHOUT_H3 = etree.XPath(
+    ".//text()[not(ancestor::h3 or ancestor::script or ancestor::style or ancestor::template"
+    " or ancestor::rt or ancestor::rp)]"
+)
+
+_BAIDU_RESULTS = etree.XPath("//*[@id='content_left']/div")
+_BAIDU_TITLE = etree.XPath("(.//h3)[1]")
+_BAIDU_LINK = etree.XPath("(.//a[@href])[1]")
+# Snippet containers, in order of preference
+_BAIDU_SNIPPETS = [
+    etree.XPath(f"(.//div[{_has_class('c-abstract')}])[1]"),
+    etree.XPath(f"(.//div[{_has_class('content-right')}])[1]"),
+    etree.XPath(f"(.//div[{_has_class('c-span9')}])[1]"),
+    etree.XPath(f"(.//span[{_has_class('content-right_8Zs40')}])[1]"),
+    # Content preview box
+    etree.XPath(f"(.//div[{_has_class('c-row')}])[1]"),
+    # Generic alternative: any paragraph
+    etree.XPath("(.//p)[1]"),
+]
+
+_BING_RESULTS = etree.XPath(f"//li[{_has_class('b_algo')}]")
+_BING_LINK = etree.XPath("(.//a[@href])[1]/@href")
+_BING_TITLE = etree.XPath("(.//h2)[1]")
+_BING_CAPTION = etree.XPath(f"(.//div[{_has_class('b_caption')}])[1]")
+_BING_DESCRIPTION = etree.XPath("(.//p)[1]")
+
+
+def _parse(html: str) -> Optional[etree._Element]:
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def _text(element: etree._Element) -> str:
+    return "".join(_TEXT(element))
+
+
+def _first(xpath: etree.XPath, element: etree._Element) -> Optional[etree._Element]:
+    found = xpath(element)
+    return found[0] if found else None
+
+
+def parse_baidu_page(html: str, rank: int = 1) -> List[SearchResult]:
+    """
+    Parse a Baidu result page.
+
+    Args:
+        html: Page HTML
+        rank: Rank of the first result on the page
+
+    Returns:
+        Results in page order
+    """
+    doc = _parse(html)
+    if doc is None:
+        return []
+
+    results = []
+    # Baidu search results are in h3 tags under the divs of #content_left
+    for result_div in _BAIDU_RESULTS(doc):
+        h3_tag = _first(_BAIDU_TITLE, result_div)
+        if h3_tag is None:
+            continue
+
+        link_tag = _first(_BAIDU_LINK, h3_tag)
+        if link_tag is None:
+            continue
+
+        link = link_tag.get("href")
+        title = _text(link_tag).strip()
+
+        # Use the first snippet container with text
+        snippet = ""
+        for xpath in _BAIDU_SNIPPETS:
+            candidate = _first(xpath, result_div)
+            if candidate is not None:
+                snippet = _text(candidate).strip()
+                if snippet:
+                    break
+
+        # Otherwise take the start of all text of the result except its headings
+        if not snippet:
+            full_text = "".join(_TEXT_WITHOUT_H3(result_div)).strip()
+            if full_text:
+                snippet = full_text[:150].strip()
+
+        results.append(SearchResult(rank, link, title, snippet))
+        rank += 1
+    return results
+
+
+def parse_bing_page(html: str, rank: int = 1) -> List[SearchResult]:
+    """
+    Parse a Bing result page.
+
+    Args:
+        html: Page HTML
+        rank: Rank of the first result on the page
+
+    Returns:
+        Results in page order
+    """
+    doc = _parse(html)
+    if doc is None:
+        return []
+
+    results = []
+    for block in _BING_RESULTS(doc):
+        links = _BING_LINK(block)
+        link = str(links[0]) if links else None
+        if not link:
+            continue
+
+        title = _first(_BING_TITLE, block)
+        if title is not None:
+            title = _text(title)
+
+        description = _first(_BING_CAPTION, block)
+        if description is not None:
+            description = _first(_BING_DESCRIPTION, description)
+            if description is not None:
+                description = _text(description)
+        results.append(SearchResult(rank, link, title, description))
+        rank += 1
+    return results
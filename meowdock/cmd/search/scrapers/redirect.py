@@ -0,0 +1,143 @@
+"""
+Search engine redirect link resolver
+
+Baidu wraps every result in a `baidu.com/link?url=...` redirect. The resolver turns those
+links into the real destination URLs with one cheap request each: the redirect target is
+taken from the Location header, without following it, or from the meta refresh / script of
+the small interstitial page Baidu sometimes answers with.
+"""
+
+import asyncio
+import logging
+import re
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urljoin
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+from meowdock.library.browser import get_default_headers
+from meowdock.cmd.search.scrapers.base import SearchResult
+
+
+_REDIRECT_LINK_PATTERN = re.compile(r"^https?://(?:www\.)?baidu\.com/link\?", re.IGNORECASE)
+# Targets in the interstitial page: <meta http-equiv="refresh" content="0;URL='...'">
+# or window.location.replace("...")
+_META_REFRESH_PATTERN = re.compile(
+    rb"""<meta[^>]+http-equiv=["']?refresh["']?[^>]+url=['"]?([^'">\s]+)""", re.IGNORECASE
+)
+_SCRIPT_LOCATION_PATTERN = re.compile(
+    rb"""location(?:\.href)?(?:\.replace\(|\s*=\s*)\s*["']([^"']+)["']""", re.IGNORECASE
+)
+# Only this much of a non-redirect answer is read to look for the target
+_MAX_BODY_BYTES = 8192
+
+
+def is_redirect_link(url: Optional[str]) -> bool:
+    """Whether a URL is a search engine redirect link that can be resolved"""
+    return bool(url) and bool(_REDIRECT_LINK_PATTERN.match(url))
+
+
+class RedirectResolver:
+    """
+    Concurrent resolver of redirect links with an in-memory cache of resolved links.
+
+    Links that cannot be resolved are returned unchanged (and not cached), so callers can
+    always use the result in place of the original link.
+
+    Usage:
+        mapping = await get_redirect_resolver().resolve(links)
+    """
+
+    def __init__(self, concurrency: int = 10, timeout: float = 5.0, cache_size: int = 10000):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+
+    def _remember(self, link: str, target: str) -> None:
+        self._cache[link] = target
+        self._cache.move_to_end(link)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _resolve_one(
+        self, session: ClientSession, semaphore: asyncio.Semaphore, link: str
+    ) -> Optional[str]:
+        async with semaphore:
+            try:
+                async with session.get(link, allow_redirects=False) as response:
+                    location = response.headers.get("Location")
+                    if response.status in (301, 302, 303, 307, 308) and location:
+                        return urljoin(link, location)
+                    body = await response.content.read(_MAX_BODY_BYTES)
+            except Exception as e:
+                logging.debug(f"Failed to resolve redirect link {link}: {str(e)}")
+                return None
+
+        for pattern in (_META_REFRESH_PATTERN, _SCRIPT_LOCATION_PATTERN):
+            match = pattern.search(body)
+            if match:
+                return urljoin(link, match.group(1).decode("utf-8", errors="ignore"))
+        return None
+
+    async def resolve(self, links: Iterable[str]) -> Dict[str, str]:
+        """
+        Resolve redirect links.
+
+        Args:
+            links: Links to resolve; links that are not redirect links are passed through
+
+        Returns:
+            Mapping of every given link to its destination (or to itself if unresolved)
+        """
+        mapping: Dict[str, str] = {}
+        pending: List[str] = []
+        for link in links:
+            if link in mapping:
+                continue
+            if not is_redirect_link(link):
+                mapping[link] = link
+            elif link in self._cache:
+                self._cache.move_to_end(link)
+                mapping[link] = self._cache[link]
+            else:
+                mapping[link] = link
+                pending.append(link)
+        if not pending:
+            return mapping
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        headers = {**get_default_headers(), "Referer": "https://www.baidu.com/"}
+        async with ClientSession(
+            connector=TCPConnector(limit=self.concurrency),
+            headers=headers,
+            timeout=ClientTimeout(total=self.timeout),
+        ) as session:
+            targets = await asyncio.gather(
+                *[self._resolve_one(session, semaphore, link) for link in pending]
+            )
+        for link, target in zip(pending, targets):
+            if target:
+                mapping[link] = target
+                self._remember(link, target)
+        logging.info(f"Resolved {sum(1 for t in targets if t)}/{len(pending)} redirect links")
+        return mapping
+
+    async def resolve_results(self, results: List[SearchResult]) -> None:
+        """Replace the redirect links of search results with their destinations, in place"""
+        mapping = await self.resolve(r.link for r in results if r.link)
+        for result in results:
+            if result.link:
+                result.link = mapping.get(result.link, result.link)
+
+
+_resolver: Optional[RedirectResolver] = None
+
+
+def get_redirect_resolver() -> RedirectResolver:
+    """Get the process-wide resolver, so resolved links are cached across searches"""
+    global _resolver
+    if _resolver is None:
+        _resolver = RedirectResolver()
+    return _resolver
@@ -1,6 +1,10 @@
-from typing import Dict, Type
+import asyncio
+import atexit
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Type
 from warnings import warn
-from meowdock.cmd.search.scrapers.base import SearchScraper
+from meowdock.cmd.search.scrapers.base import ScrapeRequest, SearchResult, SearchScraper
 
 # Register available search engines
 _SCRAPERS: Dict[str, Type[SearchScraper]] = {}
@@ -39,3 +43,94 @@ def get_scraper(engine: str, **kwargs) -> SearchScraper:
         raise ValueError(f"Unsupported search engine: {engine}. Supported engines: {supported}")
 
     return _SCRAPERS[engine](**kwargs)
+
+
+class ScraperHost:
+    """
+    Long-lived scrapers, one per engine and constructor arguments, kept until the process exits.
+
+    The scrapers live on a background event loop, so their HTTP sessions and browsers are
+    reused by every search in the process, including searches run under separate
+    `asyncio.run` calls or in worker threads. Callers await `scrape` from their own loop.
+
+    Usage:
+        results = await get_scraper_host().scrape('bing', request)
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._scrapers: Dict[Tuple, SearchScraper] = {}
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="meowdock-scrapers", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+            return self._loop
+
+    async def _scrape(
+        self, key: Tuple, engine: str, kwargs: Dict[str, Any], request: ScrapeRequest
+    ) -> List[SearchResult]:
+        # Runs on the background loop, so the scrapers are only ever touched from there
+        scraper = self._scrapers.get(key)
+        if scraper is None:
+            scraper = self._scrapers[key] = get_scraper(engine, **kwargs)
+        return await scraper.scrape(request)
+
+    async def scrape(self, engine: str, request: ScrapeRequest, **kwargs) -> List[SearchResult]:
+        """
+        Search with the shared scraper of `engine`.
+
+        Args:
+            engine: Search engine name, e.g. 'bing'
+            request: Search request
+            **kwargs: Parameters passed to the search engine constructor
+        """
+        key = (engine.lower().strip(), tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
+        future = asyncio.run_coroutine_threadsafe(
+            self._scrape(key, engine, kwargs, request), self._get_loop()
+        )
+        # Cancelling the caller cancels the search on the background loop as well
+        return await asyncio.wrap_future(future)
+
+    def close(self) -> None:
+        """Close every scraper and stop the background loop"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+
+        async def close_scrapers():
+            for scraper in self._scrapers.values():
+                try:
+                    await scraper.close()
+                except Exception as e:
+                    logging.warning(f"Failed to close scraper: {str(e)}")
+            self._scrapers.clear()
+
+        try:
+            asyncio.run_coroutine_threadsafe(close_scrapers(), loop).result(timeout=30)
+        except Exception as e:
+            logging.warning(f"Failed to close scrapers: {str(e)}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        if not loop.is_running():
+            loop.close()
+
+
+_scraper_host: Optional[ScraperHost] = None
+
+
+def get_scraper_host() -> ScraperHost:
+    """Get the process-wide scraper host"""
+    global _scraper_host
+    if _scraper_host is None:
+        _scraper_host = ScraperHost()
+    return _scraper_host
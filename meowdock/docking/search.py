@@ -2,15 +2,31 @@ import asyncio
 from typing import List, Union, Optional, Dict, Any
 
 from .docking_factory import Docking, DockingFactory
-from ..cmd.search.scrapers.scraper_factory import get_scraper
+from ..cmd.search.cache import cached_scrape
 from ..cmd.search.scrapers import ScrapeRequest, SearchResult
 from ..cmd.fetch import Fetcher, FetchOptions, FetchResult
+from ..library.utils.dedupe import find_near_duplicates
 
 
 class SearchDocking(Docking):
-    def __init__(self, engine: str):
+    def __init__(
+        self,
+        engine: Union[str, List[str]],
+        dedupe_threshold: Optional[float] = 0.8,
+        fetch_deadline: Optional[float] = 30.0,
+        use_cache: bool = True,
+        fetch_engine: str = 'auto',
+    ):
         super().__init__()
         self.engine = engine
+        # 是否使用本地搜索结果缓存和网页抓取缓存，相同查询/网页在缓存有效期内不再重复抓取
+        self.use_cache = use_cache
+        # 抓取网页内容的引擎：'auto'（先HTTP，失败再用浏览器）、'http' 或 'browser'
+        self.fetch_engine = fetch_engine
+        # 抓取网页内容的总时限（秒），超时未完成的页面改用搜索摘要，None表示不限时
+        self.fetch_deadline = fetch_deadline
+        # 内容相似度（估计的Jaccard）达到该阈值的结果视为重复，None表示不去重
+        self.dedupe_threshold = dedupe_threshold
 
     def run(self, prompt: str, count: int = 5, *args, **kwargs) -> str:
         """
@@ -35,11 +51,11 @@ class SearchDocking(Docking):
         # 处理单个或多个搜索引擎
         engines = [engine] if isinstance(engine, str) else engine
 
-        # 搜集各引擎的搜索结果
-        all_results = []
-        for eng in engines:
-            results = await self._search_engine(eng, prompt, count, **kwargs)
-            all_results.extend(results)
+        # 并发搜索各引擎并搜集结果，多个引擎的结果在下面一起抓取和去重
+        engine_results = await asyncio.gather(
+            *[self._search_engine(eng, prompt, count, **kwargs) for eng in engines]
+        )
+        all_results = [result for results in engine_results for result in results]
 
         # 提取URL列表
         urls = [result.link for result in all_results if result.link]
@@ -51,6 +67,9 @@ class SearchDocking(Docking):
         # 获取URL内容
         content_dict = await self._fetch_urls(urls)
 
+        # 合并转载/镜像等近似重复的页面，只保留排名最靠前的一份
+        all_results = self._collapse_duplicates(all_results, content_dict)
+
         # 格式化为markdown
         return self._format_as_markdown(all_results, content_dict)
 
@@ -59,7 +78,6 @@ class SearchDocking(Docking):
     ) -> List[SearchResult]:
         """使用指定搜索引擎执行搜索"""
         try:
-            scraper = get_scraper(engine, **kwargs)
             request = ScrapeRequest(
                 term=query,
                 count=count,
@@ -69,22 +87,24 @@ class SearchDocking(Docking):
                     if k in ['domain', 'sleep', 'proxy', 'language', 'geo', 'filters']
                 },
             )
-            return await scraper.scrape(request)
+            return await cached_scrape(engine, request, self.use_cache, **kwargs)
         except Exception as e:
             print(f"Search engine {engine} error: {str(e)}")
             return []
 
     async def _fetch_urls(self, urls: List[str]) -> Dict[str, str]:
         """获取URL内容"""
-        fetcher = Fetcher()
         options = FetchOptions(
             timeout=30000,
             extractContent=True,
             disableMedia=True,
             returnHtml=False,
+            engine=self.fetch_engine,  # type: ignore
+            useCache=self.use_cache,
         )
 
-        results = await fetcher.fetch(urls, options)
+        async with Fetcher() as fetcher:
+            results = await fetcher.fetch(urls, options, deadline=self.fetch_deadline)
 
         # 构建URL到内容的映射
         url_to_content = {}
@@ -94,6 +114,21 @@ class SearchDocking(Docking):
 
         return url_to_content
 
+    def _collapse_duplicates(
+        self, search_results: List[SearchResult], content_dict: Dict[str, str]
+    ) -> List[SearchResult]:
+        """去除内容近似重复的搜索结果，保留排名最靠前的一份"""
+        if self.dedupe_threshold is None or len(search_results) < 2:
+            return search_results
+
+        texts = [content_dict.get(r.link, r.snippet or "") for r in search_results]
+        # 按引擎内排名优先，同排名时保持原顺序
+        priority = [
+            r.rank if isinstance(r.rank, int) else len(search_results) for r in search_results
+        ]
+        duplicate_of = find_near_duplicates(texts, self.dedupe_threshold, priority)
+        return [r for r, dup in zip(search_results, duplicate_of) if dup is None]
+
     def _format_as_markdown(
         self, search_results: List[SearchResult], content_dict: Dict[str, str]
     ) -> str:
@@ -13,13 +13,28 @@ from .browser_utils import (
     get_default_headers,
     get_cookies,
 )
-from .content_utils import extract_main_content, extract_chinese_content
+from .content_utils import (
+    extract_main_content,
+    extract_chinese_content,
+    html_to_markdown,
+    run_extraction,
+    configure_extraction,
+    extraction_context,
+    shutdown_extraction,
+    prune_page,
+    extract_in_browser,
+)
 from .resource_utils import (
     abort_resource,
     get_minimal_resources,
     get_moderate_resources,
     get_strict_resources,
+    BlockList,
+    get_blocklist,
 )
+from .cookie_store import CookieStore, CookieTracker, get_cookie_store
+from .browser_pool import BrowserPool, PooledPage
+from .ready_utils import wait_for_content
 
 __all__ = [
     "find_chromium",
@@ -31,8 +46,23 @@ __all__ = [
     "get_cookies",
     "extract_main_content",
     "extract_chinese_content",
+    "html_to_markdown",
+    "run_extraction",
+    "configure_extraction",
+    "extraction_context",
+    "shutdown_extraction",
+    "prune_page",
+    "extract_in_browser",
     "abort_resource",
     "get_minimal_resources",
     "get_moderate_resources",
     "get_strict_resources",
+    "BlockList",
+    "get_blocklist",
+    "CookieStore",
+    "CookieTracker",
+    "get_cookie_store",
+    "BrowserPool",
+    "PooledPage",
+    "wait_for_content",
 ]
@@ -0,0 +1,275 @@
+"""
+Browser pool module
+
+Provides a long-lived Playwright/Chromium instance that is shared by many fetches,
+and a pool of reusable tabs on top of it.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Iterable, List, Optional, Tuple
+
+from playwright.async_api import (
+    async_playwright,
+    Playwright,
+    Browser,
+    BrowserContext,
+    CDPSession,
+    Page,
+    Error as PlaywrightError,
+)
+
+
+from .browser_utils import find_chromium
+from .cookie_store import CookieTracker, get_cookie_store
+
+
+class PooledPage:
+    """
+    A tab handed out by `BrowserPool.page()`.
+
+    Event handlers must be registered through `on()` so that they can be removed again
+    before the tab is handed to the next user.
+    """
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.uses = 0
+        self.last_used = time.monotonic()
+        self.crashed = False
+        self.cdp_session: Optional[CDPSession] = None  # Kept for reuse by request blocking
+        self._listeners: List[Tuple[str, Callable]] = []
+        page.on("crash", self._on_crash)
+
+    def _on_crash(self, _page) -> None:
+        self.crashed = True
+
+    def on(self, event: str, handler: Callable) -> None:
+        """Register an event handler that is removed when the tab is released"""
+        self.page.on(event, handler)
+        self._listeners.append((event, handler))
+
+    @property
+    def healthy(self) -> bool:
+        return not self.crashed and not self.page.is_closed()
+
+    async def reset(self) -> None:
+        """Remove handlers and routes and navigate back to about:blank"""
+        for event, handler in self._listeners:
+            self.page.remove_listener(event, handler)
+        self._listeners.clear()
+        await self.page.unroute_all(behavior='ignoreErrors')
+        await self.page.goto('about:blank')
+
+    async def close(self) -> None:
+        try:
+            await self.page.close()
+        except Exception as e:
+            logging.debug(f"Failed to close page: {str(e)}")
+
+
+class BrowserPool:
+    """
+    Chromium instance that is launched once and hands out browser contexts and tabs until closed.
+
+    Tabs handed out by `page()` live in one shared context, which receives the saved cookies of
+    a host the first time a tab is borrowed for it. Tabs are reset and reused,
+    and retired after `max_page_uses` uses, after a crash or timeout, or after being idle
+    for `page_idle_timeout` seconds. At most `page_pool_size` idle tabs are kept.
+
+    Usage:
+        async with BrowserPool() as pool:
+            async with pool.page() as pooled:
+                await pooled.page.goto(url)
+    """
+
+    def __init__(
+        self,
+        headless: bool = True,
+        page_pool_size: int = 5,
+        max_page_uses: int = 20,
+        page_idle_timeout: float = 60.0,
+    ):
+        self.headless = headless
+        self.page_pool_size = page_pool_size
+        self.max_page_uses = max_page_uses
+        self.page_idle_timeout = page_idle_timeout
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._page_context: Optional[BrowserContext] = None
+        self._idle_pages: List[PooledPage] = []
+        self._cookies = CookieTracker()  # Cookies the shared context has
+        self._lock = asyncio.Lock()
+        self._page_lock = asyncio.Lock()
+        self._cookie_lock = asyncio.Lock()
+
+    @property
+    def started(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    async def start(self) -> Browser:
+        """Start Playwright and launch Chromium, unless a live browser already exists"""
+        async with self._lock:
+            if not self.started:
+                # Clean up the remains of a crashed browser before relaunching
+                await self._shutdown()
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(
+                    headless=self.headless,
+                    executable_path=find_chromium(),
+                    args=['--disable-blink-features=AutomationControlled'],
+                )
+            return self._browser
+
+    @asynccontextmanager
+    async def context(
+        self, urls: Optional[Iterable[str]] = None, **kwargs
+    ) -> AsyncIterator[BrowserContext]:
+        """
+        Create a fresh context on the shared browser, closed again on exit.
+
+        Args:
+            urls: URLs the context will visit, it only receives their cookies; None for all cookies
+            **kwargs: Passed to `Browser.new_context`
+        """
+        browser = await self.start()
+        context = await browser.new_context(**kwargs)
+        try:
+            store = get_cookie_store()
+            cookies = store.all() if urls is None else store.cookies_for(urls)
+            if cookies:
+                await context.add_cookies(cookies)
+            yield context
+        finally:
+            try:
+                await context.close()
+            except Exception as e:
+                logging.debug(f"Failed to close browser context: {str(e)}")
+
+    async def _get_page_context(self) -> BrowserContext:
+        browser = await self.start()
+        async with self._page_lock:
+            if self._page_context is None or self._page_context.browser is not browser:
+                self._idle_pages.clear()
+                self._page_context = await browser.new_context()
+                self._cookies.reset()
+            return self._page_context
+
+    async def _add_cookies_for(self, context: BrowserContext, url: str) -> None:
+        """Add the saved cookies of the host of `url` to the shared context, once per host"""
+        # Held until the cookies are added, so that a concurrent fetch of the same host does not
+        # navigate before they are in the context
+        async with self._cookie_lock:
+            clear, cookies = self._cookies.take(url)
+            if clear:
+                # The cookie file changed (e.g. after `meowdock login`), start over with the new cookies
+                await context.clear_cookies()
+            if cookies:
+                await context.add_cookies(cookies)
+
+    async def _new_page(self) -> PooledPage:
+        context = await self._get_page_context()
+        return PooledPage(await context.new_page())
+
+    async def _evict_idle(self) -> None:
+        now = time.monotonic()
+        expired = [p for p in self._idle_pages if now - p.last_used > self.page_idle_timeout]
+        for pooled in expired:
+            self._idle_pages.remove(pooled)
+            await pooled.close()
+
+    async def warm_up(self, count: Optional[int] = None) -> None:
+        """Pre-create idle tabs so that the first fetches skip tab creation"""
+        if count is None:
+            count = self.page_pool_size
+        count = min(count, self.page_pool_size) - len(self._idle_pages)
+        if count <= 0:
+            return
+        pages = await asyncio.gather(
+            *[self._new_page() for _ in range(count)], return_exceptions=True
+        )
+        for pooled in pages:
+            if isinstance(pooled, PooledPage):
+                self._idle_pages.append(pooled)
+            else:
+                logging.warning(f"Failed to pre-create page: {str(pooled)}")
+
+    @asynccontextmanager
+    async def page(self, url: Optional[str] = None) -> AsyncIterator[PooledPage]:
+        """Borrow a tab from the pool for visiting `url`, returned (or retired) on exit"""
+        await self._evict_idle()
+        pooled = None
+        while self._idle_pages and pooled is None:
+            candidate = self._idle_pages.pop()
+            if candidate.healthy:
+                pooled = candidate
+            else:
+                await candidate.close()
+        if pooled is None:
+            pooled = await self._new_page()
+
+        reusable = True
+        try:
+            pooled.uses += 1
+            if url:
+                await self._add_cookies_for(pooled.page.context, url)
+            yield pooled
+        except (PlaywrightError, asyncio.TimeoutError, asyncio.CancelledError):
+            # Timeouts and crashes may leave the renderer in an unknown state
+            reusable = False
+            raise
+        finally:
+            await self._release(pooled, reusable)
+
+    async def _release(self, pooled: PooledPage, reusable: bool) -> None:
+        if (
+            reusable
+            and pooled.healthy
+            and pooled.uses < self.max_page_uses
+            and len(self._idle_pages) < self.page_pool_size
+        ):
+            try:
+                await pooled.reset()
+                pooled.last_used = time.monotonic()
+                self._idle_pages.append(pooled)
+                return
+            except Exception as e:
+                logging.debug(f"Failed to reset page, retiring it: {str(e)}")
+        await pooled.close()
+
+    async def _shutdown(self) -> None:
+        for pooled in self._idle_pages:
+            await pooled.close()
+        self._idle_pages.clear()
+        if self._page_context:
+            try:
+                await self._page_context.close()
+            except Exception as e:
+                logging.debug(f"Failed to close browser context: {str(e)}")
+            self._page_context = None
+        if self._browser:
+            try:
+                await self._browser.close()
+            except Exception as e:
+                logging.debug(f"Failed to close browser: {str(e)}")
+        if self._playwright:
+            try:
+                await self._playwright.stop()
+            except Exception as e:
+                logging.debug(f"Failed to stop playwright: {str(e)}")
+        self._browser = None
+        self._playwright = None
+
+    async def close(self) -> None:
+        """Close the browser and stop Playwright"""
+        async with self._lock:
+            await self._shutdown()
+
+    async def __aenter__(self) -> "BrowserPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
@@ -8,7 +8,8 @@ import os
 import logging
 import random
 from typing import List, Dict, Optional, Any
-import json
+
+from .cookie_store import get_cookie_store
 
 
 def init_logger():
@@ -136,16 +137,6 @@ def get_default_headers() -> Dict[str, str]:
     }
 
 
-_cookies : Optional[List[Dict[str, Any]]] = None
 def get_cookies() -> List[Dict[str, Any]]:
-    global _cookies
-    if _cookies is None:
-        COOKIES_PATH = os.getenv('COOKIES_JSON_PATH', "cookies.json")
-        if os.path.exists(COOKIES_PATH):
-            with open(COOKIES_PATH, "r+", encoding="utf-8") as f:
-                s = f.read()
-                if len(s) > 2:
-                    _cookies = json.loads(s)
-        else:
-            _cookies = []
-    return _cookies
+    """Get every saved cookie, see `get_cookie_store` for cookies of specific hosts"""
+    return get_cookie_store().all()
@@ -2,10 +2,28 @@
 Content extraction utility module
 
 Provides utility functions for extracting main content from HTML.
+
+Parsing is CPU-bound, so extraction runs off the event loop. Within large fetch batches
+(see `extraction_context`), large documents go to a shared process pool; everything else,
+including single fetches, goes to a thread. Every worker process imports meowdock (with
+playwright and browser_use) on start, which only pays off when many pages are extracted.
+The pool size, the document size threshold and the minimum batch size are read from
+EXTRACT_WORKERS, EXTRACT_OFFLOAD_THRESHOLD and EXTRACT_OFFLOAD_MIN_BATCH, or set with
+`configure_extraction`.
 """
 
+import asyncio
+import atexit
+import contextvars
+import functools
+import importlib.resources
+import logging
+import multiprocessing
+import os
 import re
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
 
 import html2text
 from readability import Document
@@ -13,33 +31,277 @@ from playwright.async_api._generated import Page
 import markdownify
 
 
-async def extract_main_content(html: str, filter_pattern: Optional[str] = None) -> str:
+_max_workers: Optional[int] = int(os.getenv('EXTRACT_WORKERS', '0')) or None
+# Documents of at least this many characters are parsed in the process pool
+_offload_threshold: int = int(os.getenv('EXTRACT_OFFLOAD_THRESHOLD', '100000'))
+# Only batches of at least this many URLs use the process pool
+_offload_min_batch: int = int(os.getenv('EXTRACT_OFFLOAD_MIN_BATCH', '20'))
+_process_pool: Optional[ProcessPoolExecutor] = None
+# Whether extraction in the current context may use the process pool
+_offload_allowed: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "extraction_offload_allowed", default=False
+)
+
+
+def configure_extraction(
+    max_workers: Optional[int] = None,
+    offload_threshold: Optional[int] = None,
+    offload_min_batch: Optional[int] = None,
+) -> None:
     """
-    Extract the main content of the page.
+    Configure where extraction runs.
+
+    Args:
+        max_workers: Number of extraction processes (one per CPU unless configured)
+        offload_threshold: Documents at least this long (in characters) are sent to the
+            process pool; 0 sends everything, a negative value disables the process pool
+        offload_min_batch: Minimum number of URLs in a batch for its extraction to use the
+            process pool, 0 lets every batch use it
+    """
+    global _max_workers, _offload_threshold, _offload_min_batch
+    if max_workers is not None and max_workers != _max_workers:
+        _max_workers = max_workers
+        shutdown_extraction()
+    if offload_threshold is not None:
+        _offload_threshold = offload_threshold
+    if offload_min_batch is not None:
+        _offload_min_batch = offload_min_batch
+
+
+def extraction_context(batch_size: Optional[int]) -> contextvars.Context:
+    """
+    Get a context for the tasks of a fetch batch, in which extraction may use the process
+    pool if the batch is large enough.
 
     Args:
+        batch_size: Number of URLs in the batch, None for an open-ended stream (a job or a
+            crawl), which counts as large
+    """
+    context = contextvars.copy_context()
+    allowed = batch_size is None or batch_size >= _offload_min_batch
+    context.run(_offload_allowed.set, allowed)
+    return context
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        # Forking a multi-threaded process can deadlock the child on a lock held by another
+        # thread, so workers are started from a fork server (or spawned where there is none)
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        _process_pool = ProcessPoolExecutor(max_workers=_max_workers, mp_context=context)
+    return _process_pool
+
+
+def shutdown_extraction() -> None:
+    """Shut down the extraction process pool (it is recreated on next use)"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+atexit.register(shutdown_extraction)
+
+
+async def run_extraction(func: Callable[..., Any], html: str, *args: Any) -> Any:
+    """
+    Run a synchronous, picklable `func(html, *args)` off the event loop.
+
+    Runs in the process pool if the document is large and the caller runs in an
+    `extraction_context` of a large batch, otherwise in a thread.
+
+    Args:
+        func: Module-level function that parses `html`
         html: HTML content
-        filter_pattern: Regex pattern for filtering, default is None (no filtering)
+        *args: Additional arguments for `func`
 
     Returns:
-        Extracted main content text
+        Result of `func`
     """
+    if _offload_allowed.get() and 0 <= _offload_threshold <= len(html):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(_get_process_pool(), func, html, *args)
+        except BrokenProcessPool:
+            logging.warning("Extraction process pool is broken, restarting it")
+            shutdown_extraction()
+    return await asyncio.to_thread(func, html, *args)
+
+
+# html2text is fed in chunks of this many characters when the output length is capped
+_HTML2TEXT_CHUNK = 16384
+
+
+def _html2text(html: str, max_length: Optional[int] = None) -> str:
     h = html2text.HTML2Text()
     h.ignore_links = True
     h.ignore_images = True
     h.body_width = 0
+    if not max_length:
+        return h.handle(html)
+
+    # Stop converting once the output is safely longer than needed, the rest would be cut anyway
+    converted = 0
+    seen = 0
+    for start in range(0, len(html), _HTML2TEXT_CHUNK):
+        h.feed(html[start : start + _HTML2TEXT_CHUNK])
+        converted += sum(len(s) for s in h.outtextlist[seen:])
+        seen = len(h.outtextlist)
+        if converted > max_length * 2:
+            break
+    h.feed("")
+    return h.optwrap(h.finish())
+
 
+def _extract_main_content(
+    html: str, filter_pattern: Optional[str] = None, max_length: Optional[int] = None
+) -> str:
     doc = Document(html, min_text_length=15)
-    content = h.handle(doc.summary())
+    content = _html2text(doc.summary(), max_length)
 
     # Apply filtering (if a pattern is provided)
     if filter_pattern:
         pattern = re.compile(filter_pattern)
         content = pattern.sub("", content)
 
+    if max_length:
+        content = content[:max_length]
     return content
 
 
+async def extract_main_content(
+    html: str, filter_pattern: Optional[str] = None, max_length: Optional[int] = None
+) -> str:
+    """
+    Extract the main content of the page.
+
+    Args:
+        html: HTML content
+        filter_pattern: Regex pattern for filtering, default is None (no filtering)
+        max_length: Maximum length of the returned text; conversion stops early once it is reached
+
+    Returns:
+        Extracted main content text
+    """
+    return await run_extraction(_extract_main_content, html, filter_pattern, max_length)
+
+
+# Serialized bytes per element below which a page cannot exceed the HTML limit. Measuring the
+# real size serializes the whole DOM, so it is only done for pages with enough elements.
+_PRUNE_BYTES_PER_ELEMENT = 256
+
+# Shrinks the rendered DOM before it is serialized. Everything after the point where the body text
+# exceeds `maxText` characters is removed. If the page has enough elements to possibly exceed
+# `maxHtml` bytes, its UTF-8 size is measured, and if it is too large, non-content elements are
+# dropped and the body is cut proportionally.
+_PRUNE_PAGE_JS = """
+({maxText, maxHtml, bytesPerElement}) => {
+    const root = document.documentElement;
+    const body = document.body;
+    if (!root || !body) return 0;
+    const cutAfter = node => {
+        for (let n = node; n && n !== root; n = n.parentNode) {
+            while (n.nextSibling) n.nextSibling.remove();
+        }
+    };
+    const skipped = new Set(['SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE']);
+    const cutAtText = limit => {
+        const walker = document.createTreeWalker(body, NodeFilter.SHOW_TEXT, {
+            acceptNode: n => skipped.has(n.parentNode.nodeName)
+                ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_ACCEPT,
+        });
+        let total = 0;
+        while (walker.nextNode()) {
+            total += walker.currentNode.textContent.trim().length;
+            if (total > limit) {
+                cutAfter(walker.currentNode);
+                return;
+            }
+        }
+    };
+    const byteSize = () => new Blob([root.outerHTML]).size;
+    if (maxText) cutAtText(maxText);
+    if (!maxHtml || document.getElementsByTagName('*').length * bytesPerElement <= maxHtml) {
+        return 0;
+    }
+    let size = byteSize();
+    if (size > maxHtml) {
+        root.querySelectorAll('script, style, noscript, template, svg, iframe, link, meta')
+            .forEach(e => e.remove());
+        const walker = document.createTreeWalker(root, NodeFilter.SHOW_COMMENT);
+        const comments = [];
+        while (walker.nextNode()) comments.push(walker.currentNode);
+        comments.forEach(c => c.remove());
+        size = byteSize();
+        if (size > maxHtml) {
+            cutAtText(Math.floor(body.textContent.length * maxHtml / size));
+            size = byteSize();
+        }
+    }
+    return size;
+}
+"""
+
+
+async def prune_page(
+    page: Page, max_text_length: Optional[int] = None, max_html_bytes: Optional[int] = None
+) -> int:
+    """
+    Shrink the DOM of a rendered page in the browser, so oversized pages are not serialized
+    and parsed in full.
+
+    Args:
+        page: Playwright page
+        max_text_length: Remove everything after the first `max_text_length` characters of body text
+        max_html_bytes: Approximate upper bound for the UTF-8 size of the serialized document
+
+    Returns:
+        UTF-8 size of the serialized document after pruning, 0 if it was not measured
+    """
+    return await page.evaluate(
+        _PRUNE_PAGE_JS,
+        {
+            'maxText': max_text_length or 0,
+            'maxHtml': max_html_bytes or 0,
+            'bytesPerElement': _PRUNE_BYTES_PER_ELEMENT,
+        },
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _load_extract_main_js() -> str:
+    with importlib.resources.files('meowdock.resources').joinpath('extract_main.js').open(
+        'r', encoding='utf-8'
+    ) as f:
+        # Drop full-line comments so that the source evaluates as a bare function expression
+        return "\n".join(line for line in f if not line.lstrip().startswith("//"))
+
+
+async def extract_in_browser(page: Page, max_length: Optional[int] = None) -> str:
+    """
+    Extract the main content inside the page, without serializing the DOM.
+
+    Runs a readability-style algorithm with `page.evaluate` and returns only the text, in
+    the same markdown-like format as `extract_main_content`.
+
+    Args:
+        page: Playwright page
+        max_length: Maximum length of the returned text; rendering stops once it is reached
+
+    Returns:
+        Extracted main content text, empty if nothing article-like was found
+    """
+    result = await page.evaluate(_load_extract_main_js(), {'maxLength': max_length or 0})
+    return result['text']
+
+
+def html_to_markdown(html: str, strip: Optional[list] = None) -> str:
+    """Convert HTML to markdown (synchronous, for use with `run_extraction`)"""
+    return markdownify.markdownify(html, strip=strip or [])
+
+
 async def extract_chinese_content(html: str) -> str:
     """
     Extract and retain Chinese content from the page.
@@ -0,0 +1,159 @@
+"""
+Cookie store module
+
+Provides the cookies saved by `meowdock login`, indexed by domain so that a browser context
+or HTTP session only receives the cookies of the hosts it visits. The file is written
+atomically and re-read when it changes on disk, so running processes pick up a new login
+without a restart.
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from meowdock.library.utils.fileio import atomic_write_json
+from meowdock.library.utils.url import get_host
+
+
+COOKIES_PATH = os.getenv('COOKIES_JSON_PATH', "cookies.json")
+
+
+def _domain_key(domain: str) -> str:
+    return domain.lstrip(".").lower()
+
+
+class CookieStore:
+    """
+    Playwright-format cookies from a JSON file, indexed by cookie domain.
+
+    The file is checked for changes (modification time and size) at most every
+    `check_interval` seconds. `version` is increased on every reload, so consumers that
+    copied cookies somewhere can tell when to copy them again.
+    """
+
+    def __init__(self, path: str = COOKIES_PATH, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.version = 0
+        self._cookies: List[Dict[str, Any]] = []
+        self._by_domain: Dict[str, List[Dict[str, Any]]] = {}
+        self._signature: Optional[Tuple[int, int]] = None
+        self._checked = 0.0
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _index(self, cookies: List[Dict[str, Any]]) -> None:
+        self._cookies = cookies
+        self._by_domain = {}
+        for cookie in cookies:
+            self._by_domain.setdefault(_domain_key(cookie.get("domain", "")), []).append(cookie)
+        self.version += 1
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload the file if it changed since it was last read, returns whether it did"""
+        now = time.monotonic()
+        if not force and now - self._checked < self.check_interval:
+            return False
+        self._checked = now
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        cookies: List[Dict[str, Any]] = []
+        if signature is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    content = f.read()
+                if len(content) > 2:
+                    cookies = json.loads(content)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Failed to load cookies {self.path}: {str(e)}")
+        self._index(cookies)
+        return True
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Get every cookie"""
+        self.refresh()
+        return self._cookies
+
+    def cookies_for(self, urls: Iterable[str]) -> List[Dict[str, Any]]:
+        """Get the cookies that are sent to the hosts of `urls` (including parent-domain cookies)"""
+        self.refresh()
+        found: Dict[int, Dict[str, Any]] = {}
+        for url in urls:
+            labels = get_host(url).split(".")
+            for i in range(len(labels)):
+                for cookie in self._by_domain.get(".".join(labels[i:]), ()):
+                    found[id(cookie)] = cookie
+        return list(found.values())
+
+    def save(self, cookies: List[Dict[str, Any]]) -> None:
+        """Replace the stored cookies, writing the file atomically"""
+        atomic_write_json(self.path, cookies, ensure_ascii=False)
+        self._index(cookies)
+        self._signature = self._stat()
+        self._checked = time.monotonic()
+
+
+class CookieTracker:
+    """
+    Per-host cookie selection for one consumer (an HTTP cookie jar or a browser context).
+
+    Hands out the cookies of every host once, and tells the consumer to drop its cookies and
+    start over when the cookie file changed. Call `reset` when the consumer is replaced.
+
+    Usage:
+        clear, cookies = tracker.take(url)
+        if clear:
+            ...  # drop the consumer's cookies
+        if cookies:
+            ...  # add them to the consumer
+    """
+
+    def __init__(self, store: Optional[CookieStore] = None):
+        self._store = store
+        self._hosts: Set[str] = set()  # Hosts whose cookies the consumer has
+        self._version = 0  # Store version those cookies came from
+
+    def reset(self) -> None:
+        """Forget which hosts the consumer has cookies of"""
+        self._hosts.clear()
+
+    def take(self, url: str) -> Tuple[bool, List[Dict[str, Any]]]:
+        """
+        Get the cookies to add before a request to `url`.
+
+        Returns:
+            Whether the consumer has to drop its cookies first (the file changed), and the
+            cookies to add (empty if the host already got its cookies)
+        """
+        store = self._store or get_cookie_store()
+        store.refresh()
+        clear = False
+        if store.version != self._version:
+            clear = bool(self._hosts)
+            self._hosts.clear()
+            self._version = store.version
+        host = get_host(url)
+        if host in self._hosts:
+            return clear, []
+        self._hosts.add(host)
+        return clear, store.cookies_for([url])
+
+
+_cookie_store: Optional[CookieStore] = None
+
+
+def get_cookie_store() -> CookieStore:
+    """Get the process-wide cookie store"""
+    global _cookie_store
+    if _cookie_store is None:
+        _cookie_store = CookieStore()
+    return _cookie_store
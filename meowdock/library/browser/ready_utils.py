@@ -0,0 +1,87 @@
+"""
+Page readiness utility module
+
+Provides a readiness check that waits for the page text to stop changing instead of waiting
+for every third-party script to finish loading.
+"""
+
+import logging
+import time
+
+from playwright.async_api import Page, Error as PlaywrightError
+
+
+# Resolves once no text-bearing DOM mutation happened for `quiet` ms (after the document has been
+# parsed), or when `budget` ms have passed. Mutations that only add scripts, styles, frames or
+# media do not count, so ads and analytics do not keep the page "busy".
+_WAIT_FOR_CONTENT_JS = """
+({quiet, budget}) => new Promise(resolve => {
+    const start = performance.now();
+    const ignored = new Set(['SCRIPT', 'STYLE', 'LINK', 'META', 'NOSCRIPT', 'IFRAME', 'IMG', 'SVG', 'VIDEO', 'AUDIO']);
+    const carriesText = node => node.nodeType === Node.TEXT_NODE
+        ? node.textContent.trim().length > 0
+        : node.nodeType === Node.ELEMENT_NODE && !ignored.has(node.nodeName.toUpperCase())
+            && node.textContent.trim().length > 0;
+    let lastChange = start;
+    const observer = new MutationObserver(mutations => {
+        for (const m of mutations) {
+            if (m.type === 'characterData'
+                || Array.from(m.addedNodes).some(carriesText)
+                || Array.from(m.removedNodes).some(carriesText)) {
+                lastChange = performance.now();
+                return;
+            }
+        }
+    });
+    observer.observe(document, {childList: true, subtree: true, characterData: true});
+    const timer = setInterval(() => {
+        const now = performance.now();
+        const textLength = document.body ? document.body.textContent.length : 0;
+        const quietFor = now - lastChange;
+        let reason = null;
+        if (document.readyState !== 'loading' && textLength > 0 && quietFor >= quiet) {
+            reason = 'quiet';
+        } else if (now - start >= budget) {
+            reason = 'budget';
+        }
+        if (reason) {
+            clearInterval(timer);
+            observer.disconnect();
+            resolve({reason, elapsed: now - start, textLength});
+        }
+    }, Math.min(100, quiet));
+})
+"""
+
+
+async def wait_for_content(page: Page, quiet_window: int = 500, budget: int = 8000) -> str:
+    """
+    Wait until the text content of the page has stabilized.
+
+    Args:
+        page: Playwright page, navigated at least to 'commit'
+        quiet_window: Time without text changes after which the page counts as ready (milliseconds)
+        budget: Hard upper bound for the wait (milliseconds)
+
+    Returns:
+        Why the wait ended: 'quiet', 'budget', or 'navigated' when the page kept navigating
+    """
+    deadline = time.monotonic() + budget / 1000
+    while True:
+        remaining = int((deadline - time.monotonic()) * 1000)
+        if remaining <= 0:
+            return 'budget'
+        try:
+            state = await page.evaluate(
+                _WAIT_FOR_CONTENT_JS, {'quiet': quiet_window, 'budget': remaining}
+            )
+            logging.debug(f"Page ready ({page.url}): {state}")
+            return state['reason']
+        except PlaywrightError as e:
+            # A client-side redirect destroys the execution context, wait on the new document
+            if 'context was destroyed' not in str(e) and 'navigation' not in str(e).lower():
+                raise
+            try:
+                await page.wait_for_load_state('domcontentloaded', timeout=max(remaining, 1))
+            except PlaywrightError:
+                return 'navigated'
@@ -4,7 +4,13 @@ Resource control utility module
 Provides browser resource loading control related functions.
 """
 
-from typing import List, Set, Optional
+import importlib.resources
+import logging
+import os
+import re
+from typing import Iterable, List, Set, Optional
+
+from playwright.async_api import BrowserContext, CDPSession, Page, Error as PlaywrightError
 
 
 # Default resource types to block
@@ -69,3 +75,173 @@ def get_strict_resources() -> Set[str]:
         Set of resource types to block
     """
     return DEFAULT_BLOCK_RESOURCES
+
+
+# File extensions that identify a resource type from the URL alone
+RESOURCE_EXTENSIONS = {
+    "image": ["png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "bmp", "avif"],
+    "media": ["mp4", "webm", "mp3", "m4a", "ogg", "wav", "flv", "m3u8", "ts"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "stylesheet": ["css"],
+    "script": ["js", "mjs"],
+}
+_DOCUMENT_EXTENSIONS = ["html", "htm", "shtml", "php", "asp", "aspx", "jsp"]
+_KNOWN_EXTENSIONS = sorted(
+    {ext for exts in RESOURCE_EXTENSIONS.values() for ext in exts} | set(_DOCUMENT_EXTENSIONS)
+)
+
+# URLs whose path does not end in a known extension: only these need a look at the resource type
+AMBIGUOUS_URL_PATTERN = re.compile(
+    r"^(?![^?#]*\.(?:" + "|".join(_KNOWN_EXTENSIONS) + r")(?:[?#]|$))", re.IGNORECASE
+)
+
+BLOCKLIST_PATH = os.getenv('BLOCKLIST_PATH')
+
+
+async def _abort(route):
+    await route.abort()
+
+
+class BlockList:
+    """
+    Compiled ad/tracker domain and URL-pattern blocklist.
+
+    Blocking happens inside the browser wherever possible: on pages through the Chromium
+    `Network.setBlockedURLs` command, on contexts through a single regex route matched by the
+    browser. Resource-type blocking is compiled to file-extension patterns as well, so only
+    requests whose type cannot be told from the URL reach the Python `abort_resource` callback.
+
+    Usage:
+        blocklist = get_blocklist()
+        session = await blocklist.apply_to_page(page, get_moderate_resources())
+    """
+
+    def __init__(self, domains: Iterable[str] = (), patterns: Iterable[str] = ()):
+        self.domains = sorted({d.lower().strip(".") for d in domains if d})
+        self.patterns = list(patterns)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "BlockList":
+        """Parse blocklist lines (plain domains, `||domain^` entries and `*` URL patterns)"""
+        domains, patterns = [], []
+        for line in lines:
+            line = line.strip()
+            if not line or line[0] in "#!":
+                continue
+            if line.startswith("||"):
+                line = line[2:].rstrip("^")
+            if "*" in line or "/" in line:
+                patterns.append(line)
+            else:
+                domains.append(line)
+        return cls(domains, patterns)
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = None) -> "BlockList":
+        """Load a blocklist file, by default BLOCKLIST_PATH or the bundled resources/blocklist.txt"""
+        path = path or BLOCKLIST_PATH
+        try:
+            if path:
+                with open(path, "r", encoding="utf-8") as f:
+                    return cls.from_lines(f)
+            with importlib.resources.files('meowdock.resources').joinpath(
+                'blocklist.txt'
+            ).open('r', encoding='utf-8') as f:
+                return cls.from_lines(f)
+        except OSError as e:
+            logging.warning(f"Failed to load blocklist {path or 'blocklist.txt'}: {str(e)}")
+            return cls()
+
+    @staticmethod
+    def _extensions(block_resources: Optional[Set[str]]) -> List[str]:
+        return sorted(
+            {ext for rtype in block_resources or () for ext in RESOURCE_EXTENSIONS.get(rtype, ())}
+        )
+
+    def url_patterns(self, block_resources: Optional[Set[str]] = None) -> List[str]:
+        """Wildcard patterns for Chromium's `Network.setBlockedURLs`"""
+        urls = []
+        for domain in self.domains:
+            urls += [f"*//{domain}/*", f"*.{domain}/*"]
+        urls += self.patterns
+        for ext in self._extensions(block_resources):
+            urls += [f"*.{ext}", f"*.{ext}?*"]
+        return urls
+
+    def url_regex(self, block_resources: Optional[Set[str]] = None) -> Optional[re.Pattern]:
+        """A single regex matching every blocked URL, for use with `route()`"""
+        parts = []
+        if self.domains:
+            parts.append(
+                r"^[a-z]+://(?:[^/?#]*\.)?(?:"
+                + "|".join(re.escape(d) for d in self.domains)
+                + r")(?::\d+)?(?:[/?#]|$)"
+            )
+        for pattern in self.patterns:
+            parts.append("^" + ".*".join(re.escape(p) for p in pattern.split("*")) + "$")
+        extensions = self._extensions(block_resources)
+        if extensions:
+            parts.append(r"^[^?#]*\.(?:" + "|".join(extensions) + r")(?:[?#]|$)")
+        if not parts:
+            return None
+        return re.compile("|".join(f"(?:{p})" for p in parts), re.IGNORECASE)
+
+    async def apply_to_page(
+        self,
+        page: Page,
+        block_resources: Optional[Set[str]] = None,
+        session: Optional[CDPSession] = None,
+    ) -> Optional[CDPSession]:
+        """
+        Block listed URLs (and optionally resource types) on a page.
+
+        Args:
+            page: Playwright page
+            block_resources: Resource types to block as well, None for only the blocklist
+            session: CDP session of the page from a previous call, reused if given
+
+        Returns:
+            The CDP session used (pass it back in on the next call), or None if CDP is unavailable
+        """
+        try:
+            if session is None:
+                session = await page.context.new_cdp_session(page)
+                await session.send('Network.enable')
+            await session.send(
+                'Network.setBlockedURLs', {'urls': self.url_patterns(block_resources)}
+            )
+        except PlaywrightError as e:
+            logging.debug(f"CDP blocking unavailable, falling back to routes: {str(e)}")
+            session = None
+            regex = self.url_regex(block_resources)
+            if regex is not None:
+                await page.route(regex, _abort)
+
+        if block_resources:
+            await page.route(
+                AMBIGUOUS_URL_PATTERN, lambda route: abort_resource(route, block_resources)
+            )
+        return session
+
+    async def apply_to_context(
+        self, context: BrowserContext, block_resources: Optional[Set[str]] = None
+    ) -> None:
+        """Block listed URLs (and optionally resource types) on every page of a context"""
+        regex = self.url_regex(block_resources)
+        if regex is not None:
+            await context.route(regex, _abort)
+        if block_resources:
+            await context.route(
+                AMBIGUOUS_URL_PATTERN, lambda route: abort_resource(route, block_resources)
+            )
+
+
+_blocklist: Optional[BlockList] = None
+
+
+def get_blocklist() -> BlockList:
+    """Get the shared blocklist, loaded from BLOCKLIST_PATH or the bundled list on first use"""
+    global _blocklist
+    if _blocklist is None:
+        _blocklist = BlockList.from_file()
+    return _blocklist
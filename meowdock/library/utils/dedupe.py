@@ -0,0 +1,109 @@
+"""
+Near-duplicate text detection
+
+MinHash over character shingles, vectorized with NumPy. Character shingles work for Chinese
+text without word segmentation.
+"""
+
+import re
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Punctuation and whitespace do not help to tell articles apart
+_NOISE_PATTERN = re.compile(r"[\s\W_]+", re.UNICODE)
+
+
+def _shingle_hashes(text: str, k: int, max_chars: int) -> np.ndarray:
+    """Hash every k-character shingle of the normalized text into a 32-bit value"""
+    normalized = _NOISE_PATTERN.sub("", text.lower())[:max_chars]
+    if len(normalized) < k:
+        return np.empty(0, dtype=np.uint64)
+    codes = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    windows = np.lib.stride_tricks.sliding_window_view(codes, k)
+    # Polynomial rolling hash, wrapping around in uint64
+    powers = np.uint64(1000003) ** np.arange(k - 1, -1, -1, dtype=np.uint64)
+    hashes = (windows * powers).sum(axis=1, dtype=np.uint64)
+    return np.unique(hashes & _MAX_HASH)
+
+
+def minhash_signatures(
+    texts: Sequence[str],
+    num_perm: int = 64,
+    k: int = 5,
+    max_chars: int = 20000,
+    seed: int = 1,
+) -> np.ndarray:
+    """
+    Compute MinHash signatures.
+
+    Args:
+        texts: Texts to sign
+        num_perm: Number of hash permutations (signature length)
+        k: Shingle length in characters
+        max_chars: Only the first `max_chars` normalized characters of each text are used
+        seed: Seed of the permutations
+
+    Returns:
+        Array of shape (len(texts), num_perm); rows of texts shorter than `k` are all max values
+    """
+    rng = np.random.default_rng(seed)
+    # Permutations h -> (a * h + b) mod p; with 32-bit hashes and a, b below 2^32 the
+    # product and sum stay below 2^64, so they do not wrap in uint64 before the modulo
+    a = rng.integers(1, _MAX_HASH, size=num_perm, dtype=np.uint64, endpoint=True)
+    b = rng.integers(0, _MAX_HASH, size=num_perm, dtype=np.uint64, endpoint=True)
+    signatures = np.full((len(texts), num_perm), _MAX_HASH, dtype=np.uint64)
+    for i, text in enumerate(texts):
+        hashes = _shingle_hashes(text or "", k, max_chars)
+        if hashes.size == 0:
+            continue
+        # Process shingles in blocks to bound the (shingles x permutations) matrix
+        for start in range(0, hashes.size, 4096):
+            block = hashes[start : start + 4096, None]
+            permuted = ((block * a + b) % _MERSENNE_PRIME) & _MAX_HASH
+            np.minimum(signatures[i], permuted.min(axis=0), out=signatures[i])
+    return signatures
+
+
+def find_near_duplicates(
+    texts: Sequence[str],
+    threshold: float = 0.8,
+    priority: Optional[Sequence[float]] = None,
+    **kwargs,
+) -> List[Optional[int]]:
+    """
+    Find texts that are near-duplicates of a better-ranked text.
+
+    Args:
+        texts: Texts to compare
+        threshold: Minimum estimated Jaccard similarity of two duplicates
+        priority: Rank of each text, lower is better; defaults to the input order
+        **kwargs: Passed to `minhash_signatures`
+
+    Returns:
+        For each text, the index of the text it duplicates, or None if it is kept
+    """
+    n = len(texts)
+    duplicate_of: List[Optional[int]] = [None] * n
+    if n < 2:
+        return duplicate_of
+    signatures = minhash_signatures(texts, **kwargs)
+    valid = ~(signatures == _MAX_HASH).all(axis=1)
+    # Estimated Jaccard similarity of every pair: share of equal signature slots
+    similarity = (signatures[:, None, :] == signatures[None, :, :]).mean(axis=2)
+    similarity[~valid, :] = 0
+    similarity[:, ~valid] = 0
+
+    order = np.argsort(np.asarray(priority if priority is not None else range(n)), kind="stable")
+    kept: List[int] = []
+    for i in order:
+        i = int(i)
+        match = next((j for j in kept if similarity[i, j] >= threshold), None)
+        if match is None:
+            kept.append(i)
+        else:
+            duplicate_of[i] = match
+    return duplicate_of
@@ -0,0 +1,36 @@
+"""
+File helpers
+
+Provides atomic writes, so that readers and interrupted runs never see a half-written file.
+"""
+
+import json
+import os
+import tempfile
+from typing import Any
+
+
+def atomic_write_json(path: str, data: Any, **kwargs) -> None:
+    """
+    Write `data` as JSON to `path` atomically.
+
+    The data is written to a temporary file in the same directory, which then replaces `path`.
+    The directory is created if needed. OSError is raised to the caller, the temporary file is
+    removed in that case.
+
+    Args:
+        path: Destination file
+        data: JSON-serializable data
+        **kwargs: Arguments passed to `json.dump`, e.g. `ensure_ascii=False`
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, **kwargs)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,103 @@
+"""
+SQLite cache base
+
+Connection handling, schema setup and least-recently-used eviction shared by the on-disk
+caches (fetch results, search results).
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+
+class SQLiteCache:
+    """
+    Size-bounded cache table in a SQLite database.
+
+    Subclasses set `table` and `columns`, the column definitions between the `key` primary key
+    and the `accessed_at` and `size` columns every cache table ends with. When the total `size`
+    exceeds `max_bytes`, the least recently used entries are evicted. Every thread gets its own
+    connection, so one cache can be shared by work running in worker threads.
+    """
+
+    table: str = ""
+    columns: str = ""
+    label: str = "Cache"  # Name used in log messages
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                f'''CREATE TABLE IF NOT EXISTS {self.table} (
+                    key TEXT PRIMARY KEY,
+                    {self.columns},
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )'''
+            )
+            conn.execute(
+                f'CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table} (accessed_at)'
+            )
+            self._local.conn = conn
+        return conn
+
+    def _insert(self, values: Tuple) -> None:
+        """Insert or replace a row (all columns, in table order) and evict what no longer fits"""
+        placeholders = ", ".join("?" * len(values))
+        try:
+            self.conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} VALUES ({placeholders})', values
+            )
+            self._evict(time.time())
+            self.conn.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"{self.label} write failed: {str(e)}")
+
+    def _mark_used(self, key: str) -> None:
+        """Move an entry to the end of the eviction order"""
+        self.conn.execute(
+            f'UPDATE {self.table} SET accessed_at = ? WHERE key = ?', (time.time(), key)
+        )
+        self.conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Delete entries until the cache fits its limits, called before committing a write"""
+        total = self.conn.execute(f'SELECT COALESCE(SUM(size), 0) FROM {self.table}').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Delete least recently used entries until the cache is back under its size limit
+        excess = total - self.max_bytes
+        freed = 0
+        keys = []
+        for key, size in self.conn.execute(
+            f'SELECT key, size FROM {self.table} ORDER BY accessed_at'
+        ):
+            keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self.conn.executemany(f'DELETE FROM {self.table} WHERE key = ?', keys)
+
+    def clear(self) -> None:
+        self.conn.execute(f'DELETE FROM {self.table}')
+        self.conn.commit()
+
+    def close(self) -> None:
+        """Close the connection of the calling thread"""
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,77 @@
+"""
+URL helpers
+
+Provides URL normalization, and host and registrable-domain lookup without an external
+public-suffix list.
+"""
+
+import ipaddress
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# Second-level public suffixes that are common in our search results
+_MULTI_PART_SUFFIXES = {
+    "com.cn", "net.cn", "org.cn", "gov.cn", "edu.cn", "ac.cn",
+    "com.hk", "org.hk", "com.tw", "org.tw", "com.mo",
+    "co.uk", "org.uk", "ac.uk", "gov.uk",
+    "co.jp", "ne.jp", "or.jp", "ac.jp",
+    "co.kr", "or.kr",
+    "com.au", "net.au", "org.au", "edu.au",
+    "com.sg", "com.my", "co.in", "co.nz", "com.br",
+}
+
+
+def get_host(url: str) -> str:
+    """Get the lowercase host name of a URL (or return the input if it is already a host)"""
+    if "//" not in url:
+        url = "//" + url
+    return (urlsplit(url).hostname or "").lower()
+
+
+def registrable_domain(url: str) -> str:
+    """
+    Get the registrable domain of a URL or host, e.g. 'news.sina.com.cn' -> 'sina.com.cn'.
+
+    IP addresses and single-label hosts are returned unchanged.
+    """
+    host = get_host(url).rstrip(".")
+    try:
+        ipaddress.ip_address(host)
+        return host
+    except ValueError:
+        pass
+    labels = host.split(".")
+    if len(labels) <= 2:
+        return host
+    if ".".join(labels[-2:]) in _MULTI_PART_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL for use as a cache or dedupe key.
+
+    Lowercases scheme and host, drops default ports, fragments and utm_* tracking
+    parameters, and sorts the query string.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        # IPv6 literal, `hostname` strips the brackets
+        host = f"[{host}]"
+    try:
+        port = parts.port
+    except ValueError:
+        # Invalid port, keep it as written
+        port = parts.netloc.rpartition(":")[2]
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_")
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
@@ -3,6 +3,7 @@ from browser_use.dom.views import DOMElementNode
 from browser_use.browser.views import BrowserError
 from browser_use.utils import time_execution_async
 from functools import wraps
+from meowdock.library.browser.resource_utils import get_blocklist
 from typing import Iterable
 import asyncio
 
@@ -77,6 +78,7 @@ def new_init(self, *args, **kw):
 @wraps(old_create_context)
 async def new_create_context(self, *args, **kw):
     context = await old_create_context(self, *args, **kw)
+    await get_blocklist().apply_to_context(context)
 
     # Register event stream listener for all pages in this context
     async def _listen_stream(response) -> None:
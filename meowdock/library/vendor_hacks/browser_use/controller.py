@@ -5,6 +5,7 @@ from functools import wraps
 from browser_use.controller.service import logger
 from pydantic import BaseModel
 from typing import Optional
+from meowdock.library.browser.content_utils import run_extraction, html_to_markdown
 
 
 old_init = Controller.__init__
@@ -29,19 +30,18 @@ def new_init(self, *args, **kw):
         goal: str, should_strip_link_urls: bool, browser: BrowserContext,
     ):
         page = await browser.get_current_page()
-        import markdownify
 
         strip = []
         if should_strip_link_urls:
             strip = ['a', 'img']
 
-        content = markdownify.markdownify(await page.content(), strip=strip)
+        content = await run_extraction(html_to_markdown, await page.content(), strip)
 
         # manually append iframe text into the content so it's readable by the LLM (includes cross-origin iframes)
         for iframe in page.frames:
             if iframe.url != page.url and not iframe.url.startswith('data:'):
                 content += f'\n\nIFRAME {iframe.url}:\n'
-                content += markdownify.markdownify(await iframe.content())
+                content += await run_extraction(html_to_markdown, await iframe.content())
         out = {
             'data': content,
             'code': 0,
@@ -3,7 +3,8 @@ from typing import List
 
 # Import functions from fetch module
 from meowdock.cmd.fetch.main import fetch as fetch_single
-from meowdock.cmd.fetch.main import fetch_urls
+from meowdock.cmd.fetch.main import fetch_urls, fetch_job, fetch_strategy
+from meowdock.cmd.crawl.main import crawl
 
 # Import functionality from search module
 from meowdock.cmd.search.main import query
@@ -31,6 +32,12 @@ def smart_fetch(
         fetch_urls(urls=urls)
 
 
+app.command(name="fetch-urls")(fetch_urls)
+app.command(name="fetch-job")(fetch_job)
+app.command(name="fetch-strategy")(fetch_strategy)
+app.command(name="crawl")(crawl)
+
+
 # Add search command (directly as main command rather than subcommand group)
 app.command(name="search")(query)
 app.command(name="execute")(execute)
@@ -47,12 +54,33 @@ def deepsearch(
     ),
     count: int = typer.Option(10, help="Number of results to return"),
     executor: str = typer.Option("yuanbao", help="Result processor executor, default is 'yuanbao'"),
+    fetch_deadline: float = typer.Option(
+        30.0, help="Seconds to spend fetching result pages, slower pages fall back to the snippet"
+    ),
+    use_cache: bool = typer.Option(
+        True, help="Whether to use the on-disk search and fetch caches"
+    ),
+    fetch_engine: str = typer.Option(
+        "auto", help="Engine for fetching result pages: 'auto', 'http' or 'browser'"
+    ),
 ):
     """Multi-engine deep search, automatically fetches web content and processes results using AI"""
+    if fetch_engine not in ["auto", "http", "browser"]:
+        typer.echo(f"Error: fetch engine must be one of 'auto', 'http', 'browser'", err=True)
+        raise typer.Exit(1)
+
     # Convert comma-separated engine string to list
     engine_list = [e.strip() for e in engines.split(",") if e.strip()]
 
-    result = deepsearch_func(query=query, engines=engine_list, count=count, executor=executor)
+    result = deepsearch_func(
+        query=query,
+        engines=engine_list,
+        count=count,
+        executor=executor,
+        fetch_deadline=fetch_deadline,
+        use_cache=use_cache,
+        fetch_engine=fetch_engine,
+    )
     print(result)
 
 
@@ -0,0 +1,206 @@
+// Readability-style main content extraction, evaluated inside the page by `extract_in_browser`.
+//
+// Paragraph-like elements score their parent and grandparent by text length and punctuation,
+// scores are penalized by link density and by class/id hints, and the best candidate plus its
+// strong siblings are rendered as markdown-like text, close to what html2text makes of the
+// readability-lxml summary (links and images dropped). Rendering stops after `maxLength`
+// characters.
+({maxLength}) => {
+    const UNLIKELY = /-ad-|ad-break|agegate|banner|breadcrumb|combx|comment|community|copyright|cover-wrap|disqus|extra|footer|gdpr|header|legends|login|menu|nav|pager|pagination|popup|recommend|related|remark|replies|rss|share|shoutbox|sidebar|skyscraper|social|sponsor|supplemental|yom-remote/i;
+    const MAYBE = /and|article|body|column|content|main|shadow/i;
+    const POSITIVE = /article|blog|body|content|detail|entry|hentry|h-entry|main|page|post|story|text/i;
+    const NEGATIVE = /-ad-|hidden|^hid$| hid$| hid |^hid |banner|combx|comment|com-|contact|foot|footer|footnote|gdpr|masthead|media|meta|outbrain|promo|related|scroll|share|shoutbox|sidebar|skyscraper|sponsor|shopping|tags|tool|widget/i;
+    const SKIP = new Set([
+        'SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE', 'IFRAME', 'SVG', 'CANVAS', 'FORM', 'BUTTON',
+        'INPUT', 'SELECT', 'TEXTAREA', 'NAV', 'ASIDE', 'FOOTER', 'OBJECT', 'EMBED', 'IMG',
+        'PICTURE', 'VIDEO', 'AUDIO', 'HEAD',
+    ]);
+    const BLOCKS = new Set([
+        'ADDRESS', 'ARTICLE', 'BLOCKQUOTE', 'CENTER', 'DD', 'DIV', 'DL', 'DT', 'FIGCAPTION',
+        'FIGURE', 'H1', 'H2', 'H3', 'H4', 'H5', 'H6', 'HEADER', 'HR', 'LI', 'MAIN', 'OL', 'P',
+        'PRE', 'SECTION', 'TABLE', 'TBODY', 'TD', 'TFOOT', 'TH', 'THEAD', 'TR', 'UL',
+    ]);
+    const body = document.body;
+    if (!body) return {text: '', candidates: 0};
+
+    const tagOf = el => el.nodeName.toUpperCase();
+    const classOf = el => (typeof el.className === 'string' ? el.className : '');
+    const hints = el => classOf(el) + ' ' + (el.id || '');
+    const isUnlikely = el => {
+        const tag = tagOf(el);
+        if (tag === 'BODY' || tag === 'ARTICLE' || tag === 'MAIN' || tag === 'A') return false;
+        const h = hints(el);
+        return UNLIKELY.test(h) && !MAYBE.test(h);
+    };
+    const isHidden = el => el.hidden || el.getAttribute('aria-hidden') === 'true'
+        || /display\s*:\s*none|visibility\s*:\s*hidden/i.test(el.getAttribute('style') || '');
+    const excluded = el => {
+        for (let n = el; n && n !== body; n = n.parentElement) {
+            if (SKIP.has(tagOf(n)) || isUnlikely(n) || isHidden(n)) return true;
+        }
+        return false;
+    };
+    const textLength = el => el.textContent.replace(/\s+/g, '').length;
+    const linkDensity = el => {
+        const total = textLength(el);
+        if (!total) return 0;
+        let links = 0;
+        for (const a of el.querySelectorAll('a')) links += textLength(a);
+        return links / total;
+    };
+    const classWeight = el => {
+        let weight = 0;
+        for (const hint of [classOf(el), el.id || '']) {
+            if (!hint) continue;
+            if (NEGATIVE.test(hint)) weight -= 25;
+            if (POSITIVE.test(hint)) weight += 25;
+        }
+        return weight;
+    };
+    const initialScore = el => {
+        const base = {
+            DIV: 5, PRE: 3, TD: 3, BLOCKQUOTE: 3,
+            ADDRESS: -3, OL: -3, UL: -3, DL: -3, DD: -3, DT: -3, LI: -3, FORM: -3,
+            H1: -5, H2: -5, H3: -5, H4: -5, H5: -5, H6: -5, TH: -5,
+        }[tagOf(el)] || 0;
+        return base + classWeight(el);
+    };
+    // Divs and sections count as paragraphs when they hold text directly (common on Chinese sites)
+    const holdsText = el => Array.from(el.childNodes).some(
+        n => n.nodeType === Node.TEXT_NODE && n.textContent.trim().length >= 25
+    );
+
+    // Score the ancestors of every paragraph
+    const scores = new Map();
+    for (const p of body.querySelectorAll('p, pre, td, blockquote, div, section, article')) {
+        const tag = tagOf(p);
+        if ((tag === 'DIV' || tag === 'SECTION' || tag === 'ARTICLE') && !holdsText(p)) continue;
+        const text = p.textContent.trim();
+        if (text.length < 25 || excluded(p)) continue;
+        const score = 1 + (text.match(/[,，、。；;]/g) || []).length
+            + Math.min(Math.floor(text.length / 100), 3);
+        const parent = p.parentElement;
+        const grandparent = parent && parent.parentElement;
+        for (const [ancestor, divider] of [[parent, 1], [grandparent, 2]]) {
+            if (!ancestor || ancestor === document.documentElement) continue;
+            if (!scores.has(ancestor)) scores.set(ancestor, initialScore(ancestor));
+            scores.set(ancestor, scores.get(ancestor) + score / divider);
+        }
+    }
+
+    let top = null;
+    let topScore = 0;
+    for (const [el, score] of scores) {
+        const final = score * (1 - linkDensity(el));
+        scores.set(el, final);
+        if (final > topScore) {
+            top = el;
+            topScore = final;
+        }
+    }
+    if (!top) top = body.querySelector('article, main') || body;
+
+    // Siblings that look like part of the same article are kept as well
+    const parts = [];
+    const threshold = Math.max(10, topScore * 0.2);
+    const siblings = top !== body && top.parentElement ? Array.from(top.parentElement.children) : [top];
+    for (const sibling of siblings) {
+        let keep = sibling === top || (scores.get(sibling) || 0) >= threshold;
+        if (!keep && tagOf(sibling) === 'P') {
+            const text = sibling.textContent.trim();
+            const density = linkDensity(sibling);
+            keep = (text.length > 80 && density < 0.25)
+                || (text.length > 0 && density === 0 && /[.。]( |$)/.test(text));
+        }
+        if (keep) parts.push(sibling);
+    }
+
+    // Render the kept elements
+    const out = [];
+    let length = 0;
+    let done = false;
+    let buffer = '';
+    let indent = '';
+    let marker = null;  // Prefix of the next line only, e.g. a list bullet
+    const push = line => {
+        out.push(line);
+        length += line.length + 2;
+        if (maxLength && length >= maxLength) done = true;
+    };
+    const flush = () => {
+        const text = buffer.replace(/\s+/g, ' ').trim();
+        buffer = '';
+        if (!text) return;
+        push((marker !== null ? marker : indent) + text);
+        marker = null;
+    };
+    const walk = (node, listDepth) => {
+        for (const child of node.childNodes) {
+            if (done) return;
+            if (child.nodeType === Node.TEXT_NODE) {
+                buffer += child.textContent;
+                continue;
+            }
+            if (child.nodeType !== Node.ELEMENT_NODE) continue;
+            const tag = tagOf(child);
+            if (SKIP.has(tag) || isHidden(child)) continue;
+            if (tag === 'BR') {
+                flush();
+                continue;
+            }
+            if (!BLOCKS.has(tag)) {
+                walk(child, listDepth);
+                continue;
+            }
+            flush();
+            if (child !== top && isUnlikely(child)) continue;
+            if ((tag === 'UL' || tag === 'OL' || tag === 'DIV' || tag === 'TABLE')
+                && textLength(child) < 1000 && linkDensity(child) > 0.5) continue;
+
+            const savedIndent = indent;
+            const savedMarker = marker;
+            const heading = /^H[1-6]$/.test(tag);
+            if (heading) {
+                marker = indent + '#'.repeat(Number(tag[1])) + ' ';
+                walk(child, listDepth);
+            } else if (tag === 'LI') {
+                const ordered = child.parentElement && tagOf(child.parentElement) === 'OL';
+                const bullet = ordered
+                    ? `${Array.from(child.parentElement.children).indexOf(child) + 1}. ` : '* ';
+                marker = '  '.repeat(listDepth) + bullet;
+                indent = ' '.repeat(marker.length);
+                walk(child, listDepth);
+            } else if (tag === 'UL' || tag === 'OL') {
+                walk(child, listDepth + 1);
+            } else if (tag === 'BLOCKQUOTE') {
+                indent = indent + '> ';
+                walk(child, listDepth);
+            } else if (tag === 'PRE') {
+                const code = child.textContent.replace(/\n+$/, '');
+                if (code.trim()) push(code.split('\n').map(line => indent + '    ' + line).join('\n'));
+            } else if (tag === 'TR') {
+                const cells = Array.from(child.children)
+                    .map(cell => cell.textContent.replace(/\s+/g, ' ').trim())
+                    .filter(Boolean);
+                if (cells.length) push(indent + cells.join(' | '));
+            } else if (tag === 'HR') {
+                push(indent + '* * *');
+            } else {
+                walk(child, listDepth);
+            }
+            flush();
+            indent = savedIndent;
+            // A bullet or heading marker belongs to this element only
+            if (heading || tag === 'LI') marker = savedMarker;
+        }
+    };
+    for (const part of parts) {
+        if (done) break;
+        walk({childNodes: [part]}, 0);
+        flush();
+    }
+
+    let text = out.join('\n\n');
+    if (maxLength) text = text.slice(0, maxLength);
+    return {text, candidates: scores.size};
+}
@@ -0,0 +1,39 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+from meowdock.cmd.fetch.fetcher import Fetcher
+from meowdock.cmd.fetch.http_client import HttpResponse
+from meowdock.cmd.fetch.strategy import EngineStrategy
+
+
+class FakeHttpClient:
+    """Stand-in for `HttpClient` that answers every request with `respond(url, headers)`"""
+
+    def __init__(self, respond: Callable[[str, Dict[str, str]], HttpResponse]):
+        self.respond = respond
+        self.requests: List[Tuple[str, Dict[str, str]]] = []
+
+    async def get(
+        self,
+        url: str,
+        timeout: float = 30.0,
+        headers: Optional[Dict[str, str]] = None,
+        max_bytes: Optional[int] = None,
+    ) -> HttpResponse:
+        self.requests.append((url, headers or {}))
+        return self.respond(url, headers or {})
+
+    async def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def make_fetcher(tmp_path):
+    """Build a Fetcher whose plain HTTP requests are answered by a function"""
+
+    def make(respond: Callable[[str, Dict[str, str]], HttpResponse], **kwargs) -> Fetcher:
+        kwargs.setdefault("strategy", EngineStrategy(str(tmp_path / "strategy.json")))
+        return Fetcher(http_client=FakeHttpClient(respond), **kwargs)
+
+    return make
@@ -0,0 +1,45 @@
+import json
+
+from meowdock.library.browser.cookie_store import CookieStore, CookieTracker
+
+
+def _cookie(name: str, domain: str) -> dict:
+    return {"name": name, "value": "1", "domain": domain, "path": "/"}
+
+
+def _store(tmp_path, cookies) -> CookieStore:
+    path = tmp_path / "cookies.json"
+    path.write_text(json.dumps(cookies), encoding="utf-8")
+    return CookieStore(str(path), check_interval=0)
+
+
+def test_cookies_for_includes_parent_domains(tmp_path):
+    store = _store(
+        tmp_path,
+        [_cookie("a", ".example.com"), _cookie("b", "www.example.com"), _cookie("c", "other.com")],
+    )
+
+    names = {c["name"] for c in store.cookies_for(["https://www.example.com/page"])}
+
+    assert names == {"a", "b"}
+
+
+def test_tracker_hands_out_each_host_once(tmp_path):
+    store = _store(tmp_path, [_cookie("a", ".example.com")])
+    tracker = CookieTracker(store)
+
+    assert tracker.take("https://example.com/") == (False, [_cookie("a", ".example.com")])
+    assert tracker.take("https://example.com/other") == (False, [])
+
+    tracker.reset()
+    assert tracker.take("https://example.com/") == (False, [_cookie("a", ".example.com")])
+
+
+def test_tracker_starts_over_when_the_file_changes(tmp_path):
+    store = _store(tmp_path, [_cookie("a", ".example.com")])
+    tracker = CookieTracker(store)
+    tracker.take("https://example.com/")
+
+    store.save([_cookie("b", ".example.com")])
+
+    assert tracker.take("https://example.com/") == (True, [_cookie("b", ".example.com")])
@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+from meowdock.cmd.crawl import Crawler
+from meowdock.cmd.crawl.crawler import Frontier, is_crawlable, url_key
+from meowdock.cmd.fetch.fetcher import FetchOptions
+from meowdock.cmd.fetch.http_client import HttpResponse
+
+OPTIONS = FetchOptions(engine="http", extractContent=False)
+
+
+def _site(links_per_page: int = 3):
+    """Every page links to `links_per_page` pages one level below it"""
+
+    def respond(url, headers):
+        links = "".join(
+            f'<a href="{url.rstrip("/")}/{i}">page {i}</a>' for i in range(links_per_page)
+        )
+        html = f"<html><body><p>Page {url}</p>{links}</body></html>"
+        return HttpResponse(url, 200, {"content-type": "text/html"}, html)
+
+    return respond
+
+
+def _read(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_crawl_follows_links_to_max_depth(tmp_path, make_fetcher):
+    output = tmp_path / "crawl.jsonl"
+    crawler = Crawler(
+        ["https://example.com/"],
+        str(output),
+        options=OPTIONS,
+        max_depth=2,
+        max_pages=50,
+        fetcher=make_fetcher(_site()),
+    )
+
+    success, fail = asyncio.run(crawler.run())
+
+    # 1 seed, 3 pages at depth 1, 9 at depth 2
+    assert (success, fail) == (13, 0)
+    lines = _read(output)
+    assert sorted(line["depth"] for line in lines) == [0] + [1] * 3 + [2] * 9
+    assert len({line["url"] for line in lines}) == 13
+    assert len(crawler.frontier) == 0
+
+
+def test_crawl_stops_at_max_pages(tmp_path, make_fetcher):
+    output = tmp_path / "crawl.jsonl"
+    crawler = Crawler(
+        ["https://example.com/"],
+        str(output),
+        options=OPTIONS,
+        max_depth=5,
+        max_pages=10,
+        fetcher=make_fetcher(_site()),
+    )
+
+    success, _ = asyncio.run(crawler.run())
+
+    assert success == 10
+    assert len(_read(output)) == 10
+
+
+def test_crawl_resumes_from_its_state_file(tmp_path, make_fetcher):
+    output = tmp_path / "crawl.jsonl"
+
+    def crawl(max_pages):
+        crawler = Crawler(
+            ["https://example.com/"],
+            str(output),
+            options=OPTIONS,
+            max_depth=2,
+            max_pages=max_pages,
+            fetcher=make_fetcher(_site()),
+        )
+        return asyncio.run(crawler.run())
+
+    assert crawl(4) == (4, 0)
+    assert crawl(50) == (9, 0)
+
+    urls = [line["url"] for line in _read(output)]
+    assert len(urls) == len(set(urls)) == 13
+
+
+def test_crawl_skips_malformed_and_foreign_links(tmp_path, make_fetcher):
+    def respond(url, headers):
+        html = (
+            '<a href="http://example.com:99999/x">a</a><a href="http://example.com:abc/">b</a>'
+            '<a href="https://other.org/">c</a><a href="/file.pdf">d</a><a href="/ok">e</a>'
+        )
+        return HttpResponse(url, 200, {"content-type": "text/html"}, html)
+
+    crawler = Crawler(
+        ["https://example.com/"],
+        str(tmp_path / "crawl.jsonl"),
+        options=OPTIONS,
+        max_depth=1,
+        fetcher=make_fetcher(respond),
+    )
+
+    assert asyncio.run(crawler.run()) == (2, 0)
+
+
+def test_frontier_is_round_robin_over_hosts():
+    frontier = Frontier()
+    for url in ["http://a.com/1", "http://a.com/2", "http://a.com/3", "http://b.com/1"]:
+        frontier.add(url, 0)
+
+    assert list(frontier) == ["http://a.com/1", "http://b.com/1", "http://a.com/2", "http://a.com/3"]
+    # Iteration continues after more URLs were added
+    frontier.add("http://c.com/1", 1)
+    assert next(frontier) == "http://c.com/1"
+
+
+def test_url_key_ignores_trivial_differences():
+    assert url_key("HTTP://Example.com:80/a?b=1&a=2#x") == url_key("http://example.com/a?a=2&b=1")
+    assert url_key("http://example.com/a") != url_key("http://example.com/b")
+
+
+def test_is_crawlable():
+    assert is_crawlable("https://example.com/page.html")
+    assert not is_crawlable("mailto:someone@example.com")
+    assert not is_crawlable("https://example.com/report.PDF")
+    assert not is_crawlable("http://example.com:99999/")
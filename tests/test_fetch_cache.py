@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import pytest
+
+from meowdock.cmd.fetch.cache import CacheEntry, FetchCache
+from meowdock.cmd.fetch.fetcher import FetchOptions
+from meowdock.cmd.fetch.http_client import HttpResponse
+
+OPTIONS = FetchOptions(engine="http", extractContent=False, useCache=True, cacheTtl=3600)
+URL = "https://example.com/article"
+
+
+def _entry(key: str, content: str = "0123456789") -> CacheEntry:
+    return CacheEntry(key, URL, URL, 200, content, None, None, "http", time.time())
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = FetchCache(str(tmp_path / "fetch_cache.sqlite3"))
+    yield cache
+    cache.close()
+
+
+def _expire(cache: FetchCache) -> None:
+    cache.conn.execute("UPDATE fetch_cache SET fetched_at = fetched_at - 7200")
+    cache.conn.commit()
+
+
+class Server:
+    """Serves one page with an ETag, answering 304 to matching conditional requests"""
+
+    def __init__(self, text: str = "version one", etag: str = '"v1"'):
+        self.text = text
+        self.etag = etag
+
+    def __call__(self, url, headers):
+        if self.etag and headers.get("If-None-Match") == self.etag:
+            return HttpResponse(url, 304, {"etag": self.etag})
+        response_headers = {"content-type": "text/html"}
+        if self.etag:
+            response_headers["etag"] = self.etag
+        return HttpResponse(url, 200, response_headers, f"<p>{self.text}</p>")
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    cache.max_bytes = 25
+    cache.put(_entry("a"))
+    cache.put(_entry("b"))
+    assert cache.get("a") is not None  # "b" is now the least recently used entry
+    cache.put(_entry("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a").content == cache.get("c").content == "0123456789"
+
+
+def test_keys_ignore_url_noise_but_not_options():
+    variant = {"extractContent": True}
+    assert FetchCache.make_key(URL + "#top", variant) == FetchCache.make_key(URL, variant)
+    assert FetchCache.make_key(URL, variant) != FetchCache.make_key(URL, {"extractContent": False})
+
+
+def test_fresh_entries_are_served_without_a_request(cache, make_fetcher):
+    fetcher = make_fetcher(Server(), cache=cache)
+
+    async def main():
+        return await fetcher.fetch(URL, OPTIONS), await fetcher.fetch(URL, OPTIONS)
+
+    first, second = asyncio.run(main())
+
+    assert not first.cached and second.cached
+    assert second.content == first.content == "version one"
+    assert len(fetcher.injected_http.requests) == 1
+
+
+def test_stale_entry_is_kept_when_the_server_answers_304(cache, make_fetcher):
+    fetcher = make_fetcher(Server(), cache=cache)
+    asyncio.run(fetcher.fetch(URL, OPTIONS))
+    _expire(cache)
+
+    result = asyncio.run(fetcher.fetch(URL, OPTIONS))
+
+    assert result.cached and result.content == "version one"
+    assert fetcher.injected_http.requests[-1][1] == {"If-None-Match": '"v1"'}
+    # The entry counts as fresh again
+    asyncio.run(fetcher.fetch(URL, OPTIONS))
+    assert len(fetcher.injected_http.requests) == 2
+
+
+def test_stale_entry_is_replaced_when_the_page_changed(cache, make_fetcher):
+    server = Server()
+    fetcher = make_fetcher(server, cache=cache)
+    asyncio.run(fetcher.fetch(URL, OPTIONS))
+    _expire(cache)
+    server.text, server.etag = "version two", '"v2"'
+
+    result = asyncio.run(fetcher.fetch(URL, OPTIONS))
+
+    assert not result.cached and result.content == "version two"
+    rows = cache.conn.execute("SELECT content, etag FROM fetch_cache").fetchall()
+    assert rows == [("version two", '"v2"')]
+
+
+def test_stale_entry_without_validators_is_fetched_again(cache, make_fetcher):
+    fetcher = make_fetcher(Server(etag=None), cache=cache)
+    asyncio.run(fetcher.fetch(URL, OPTIONS))
+    _expire(cache)
+
+    result = asyncio.run(fetcher.fetch(URL, OPTIONS))
+
+    assert not result.cached
+    assert [headers for _, headers in fetcher.injected_http.requests] == [{}, {}]
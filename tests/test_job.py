@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+from meowdock.cmd.fetch.fetcher import FetchOptions
+from meowdock.cmd.fetch.http_client import HttpResponse
+from meowdock.cmd.fetch.job import Checkpoint, FetchJob
+
+OPTIONS = FetchOptions(engine="http", extractContent=False)
+
+
+def _respond(url, headers):
+    return HttpResponse(url, 200, {"content-type": "text/html"}, f"<p>{url}</p>")
+
+
+def test_checkpoint_watermark_advances_over_contiguous_lines():
+    checkpoint = Checkpoint("unused")
+    for line in [2, 0, 4]:
+        checkpoint.mark(line)
+    assert (checkpoint.watermark, checkpoint.done) == (1, {2, 4})
+
+    checkpoint.mark(1)
+    assert (checkpoint.watermark, checkpoint.done) == (3, {4})
+    assert checkpoint.is_done(0) and checkpoint.is_done(4)
+    assert not checkpoint.is_done(3)
+
+
+def test_checkpoint_round_trip(tmp_path):
+    path = str(tmp_path / "job.checkpoint")
+    checkpoint = Checkpoint(path)
+    checkpoint.input = "urls.txt"
+    for line in [0, 1, 5]:
+        checkpoint.mark(line)
+    checkpoint.save()
+
+    loaded = Checkpoint(path)
+    assert loaded.load()
+    assert (loaded.input, loaded.watermark, loaded.done) == ("urls.txt", 2, {5})
+    assert not Checkpoint(str(tmp_path / "missing")).load()
+
+
+def test_job_resumes_after_the_checkpoint(tmp_path, make_fetcher):
+    urls = [f"https://example.com/{i}" for i in range(6)]
+    source = tmp_path / "urls.txt"
+    source.write_text("\n".join(urls[:3] + ["", "# comment"] + urls[3:]) + "\n", encoding="utf-8")
+    output = tmp_path / "results.jsonl"
+    output.write_text("previous run\n", encoding="utf-8")
+    # Lines 0 and 1 were done before the interruption, and line 6 (urls[4]) as well
+    checkpoint = Checkpoint(f"{output}.checkpoint")
+    checkpoint.input = str(source)
+    for line in [0, 1, 6]:
+        checkpoint.mark(line)
+    checkpoint.save()
+
+    fetcher = make_fetcher(_respond)
+    job = FetchJob(str(source), str(output), options=OPTIONS, fetcher=fetcher)
+    assert asyncio.run(job.run()) == (3, 0)
+
+    fetched = sorted(url for url, _ in fetcher.injected_http.requests)
+    assert fetched == [urls[2], urls[3], urls[5]]
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "previous run"
+    # `index` is the line number of the URL in the input
+    assert sorted(json.loads(line)["index"] for line in lines[1:]) == [2, 5, 7]
+    assert job.checkpoint.watermark == 8
@@ -0,0 +1,81 @@
+from meowdock.cmd.search.scrapers.parsers import parse_baidu_page, parse_bing_page
+
+
+def _baidu_page(*results: str) -> str:
+    return (
+        "<html><head><script>var noise = 1;</script></head><body>"
+        f"<div id='content_left'>{''.join(results)}</div></body></html>"
+    )
+
+
+def _tuples(results):
+    return [(r.rank, r.link, r.title, r.snippet) for r in results]
+
+
+def test_baidu_results_in_page_order():
+    html = _baidu_page(
+        "<div class='result c-container'><h3 class='t'><a href='http://www.baidu.com/link?url=a'>"
+        "<em>First</em> result</a></h3><div class='c-abstract c-gap'>First snippet</div></div>",
+        # Blocks without a heading are not results
+        "<div class='result-op'><div>Related searches</div></div>",
+        "<div class='result c-container'><h3><a href='http://www.baidu.com/link?url=b'>Second</a>"
+        "</h3><span class='content-right_8Zs40'>Second snippet</span></div>",
+    )
+
+    assert _tuples(parse_baidu_page(html, rank=11)) == [
+        (11, "http://www.baidu.com/link?url=a", "First result", "First snippet"),
+        (12, "http://www.baidu.com/link?url=b", "Second", "Second snippet"),
+    ]
+
+
+def test_baidu_snippet_skips_scripts_and_empty_candidates():
+    html = _baidu_page(
+        "<div><h3><a href='http://a'>Title</a></h3>"
+        "<div class='c-abstract'>  </div>"
+        "<p>Paragraph<script>var x = 1;</script> text</p></div>"
+    )
+
+    assert _tuples(parse_baidu_page(html)) == [(1, "http://a", "Title", "Paragraph text")]
+
+
+def test_baidu_snippet_falls_back_to_the_text_without_headings():
+    html = _baidu_page(
+        "<div><h3><a href='http://a'>Title</a></h3><div class='source'><span>"
+        + "x" * 200
+        + "</span></div></div>"
+    )
+
+    [result] = parse_baidu_page(html)
+    assert result.snippet == "x" * 150
+
+
+def test_baidu_skips_headings_without_links():
+    html = _baidu_page("<div><h3>No link</h3><p>text</p></div>")
+    assert parse_baidu_page(html) == []
+
+
+def test_bing_results():
+    html = (
+        "<html><body><ol id='b_results'>"
+        "<li class='b_algo'><div class='b_tpcn'><a href='https://example.com/1'>icon</a></div>"
+        "<h2><a href='https://example.com/1'>Example <strong>one</strong></a></h2>"
+        "<div class='b_caption'><cite>example.com</cite><p class='b_lineclamp2'>"
+        "<span class='news_dt'>May 1, 2024</span> &middot; Description</p></div></li>"
+        "<li class='b_ans'><h2>Related searches</h2></li>"
+        "<li class='b_algo extra'><h2><a href='https://example.com/2'>Two</a></h2>"
+        "<div class='b_caption'><div>No paragraph</div></div></li>"
+        "<li class='b_algo'><h2>No link</h2></li>"
+        "</ol></body></html>"
+    )
+
+    assert _tuples(parse_bing_page(html, rank=1)) == [
+        (1, "https://example.com/1", "Example one", "May 1, 2024 · Description"),
+        (2, "https://example.com/2", "Two", None),
+    ]
+
+
+def test_empty_pages():
+    for parse in (parse_baidu_page, parse_bing_page):
+        assert parse("") == []
+        assert parse("   ") == []
+        assert parse("<html><body>nothing</body></html>") == []
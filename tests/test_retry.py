@@ -0,0 +1,66 @@
+import pytest
+
+from meowdock.cmd.fetch.retry import LatencyTracker, RetryPolicy, classify_error
+
+
+@pytest.mark.parametrize(
+    "error, status, expected",
+    [
+        ("net::ERR_NAME_NOT_RESOLVED at https://nowhere.invalid/", None, "dns"),
+        ("Cannot connect to host nowhere.invalid:443 ssl:default [Errno -2] Name or service not known", None, "dns"),
+        ("HTTP error: 403", 403, "blocked"),
+        ("HTTP error: 429", 429, "blocked"),
+        ("Page shows a captcha", 200, "blocked"),
+        ("百度安全验证", None, "blocked"),
+        ("HTTP error: 503", 503, "http_5xx"),
+        ("HTTP error: 404", 404, "http_4xx"),
+        ("Timeout 30000ms exceeded.", None, "timeout"),
+        ("net::ERR_TIMED_OUT", None, "timeout"),
+        ("Unsupported content type: application/pdf", 200, "other"),
+        (None, None, "other"),
+    ],
+)
+def test_classify_error(error, status, expected):
+    assert classify_error(error, status) == expected
+
+
+def test_policy_retries_only_transient_failures_by_default():
+    policy = RetryPolicy(retries=1)
+    assert policy.should_retry("timeout", 1)
+    assert policy.should_retry("http_5xx", 1)
+    for error_type in ["other", "dns", "blocked", "http_4xx"]:
+        assert not policy.should_retry(error_type, 1)
+
+
+def test_policy_stops_after_the_configured_retries():
+    policy = RetryPolicy(retries=2)
+    assert policy.should_retry("timeout", 2)
+    assert not policy.should_retry("timeout", 3)
+    assert not RetryPolicy(retries=0).should_retry("timeout", 1)
+
+
+def test_policy_delay_doubles_up_to_the_maximum():
+    policy = RetryPolicy(base_delay=0.5, max_delay=3.0, jitter=0.0)
+    assert [policy.delay(attempt) for attempt in range(1, 5)] == [0.5, 1.0, 2.0, 3.0]
+
+    jittered = RetryPolicy(base_delay=1.0, jitter=0.5)
+    assert all(0.5 <= jittered.delay(1) <= 1.0 for _ in range(100))
+
+
+def test_latency_quantile_needs_enough_samples():
+    tracker = LatencyTracker(size=10, min_samples=3)
+    tracker.add(1.0)
+    tracker.add(2.0)
+    assert tracker.quantile(0.5) is None
+
+    for latency in [3.0, 4.0, 5.0]:
+        tracker.add(latency)
+    assert tracker.quantile(0.5) == 3.0
+    assert tracker.quantile(1.0) == 5.0
+
+
+def test_latency_window_drops_old_samples():
+    tracker = LatencyTracker(size=3, min_samples=1)
+    for latency in [100.0, 1.0, 2.0, 3.0]:
+        tracker.add(latency)
+    assert tracker.quantile(1.0) == 3.0
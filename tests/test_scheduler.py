@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+from meowdock.cmd.fetch.scheduler import HostScheduler
+
+
+async def _fetch(scheduler, url, running, peak, duration=0.02):
+    """Hold a slot for `duration`, recording how many fetches per host run at the same time"""
+    host = url.split("/")[2]
+    async with scheduler.slot(url):
+        running[host] = running.get(host, 0) + 1
+        peak.append(dict(running))
+        await asyncio.sleep(duration)
+        running[host] -= 1
+
+
+def test_per_host_and_global_limits():
+    scheduler = HostScheduler(global_limit=3, per_host_limit=2)
+    running, peak = {}, []
+    urls = [f"http://a.com/{i}" for i in range(5)] + [f"http://b.com/{i}" for i in range(5)]
+
+    async def main():
+        await asyncio.gather(*[_fetch(scheduler, url, running, peak) for url in urls])
+
+    asyncio.run(main())
+
+    assert max(state.get("a.com", 0) for state in peak) == 2
+    assert max(state.get("b.com", 0) for state in peak) == 2
+    assert max(sum(state.values()) for state in peak) == 3
+
+
+def test_min_interval_spaces_starts_per_host():
+    scheduler = HostScheduler(per_host_limit=3, min_interval=0.05)
+    starts = []
+
+    async def fetch(url):
+        async with scheduler.slot(url):
+            starts.append(time.monotonic())
+
+    async def main():
+        await asyncio.gather(*[fetch("http://a.com/") for _ in range(3)])
+
+    asyncio.run(main())
+
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert all(gap >= 0.04 for gap in gaps)
+
+
+def test_throttled_host_backs_off_exponentially():
+    scheduler = HostScheduler(backoff=0.05, max_backoff=0.15)
+
+    async def main():
+        waits = []
+        for status in [429, 503, 429, 200, 200]:
+            started = time.monotonic()
+            async with scheduler.slot("http://a.com/"):
+                waits.append(time.monotonic() - started)
+                scheduler.report("http://a.com/", status)
+        return waits
+
+    waits = asyncio.run(main())
+
+    # No wait at first, then 0.05s, 0.1s, 0.15s (capped); a 200 clears the strikes
+    assert waits[0] < 0.03
+    assert 0.04 <= waits[1] < 0.09
+    assert 0.09 <= waits[2] < 0.14
+    assert 0.14 <= waits[3] < 0.2
+    assert waits[4] < 0.03
+
+
+def test_backoff_only_affects_the_throttled_host():
+    scheduler = HostScheduler(backoff=0.2)
+
+    async def main():
+        async with scheduler.slot("http://a.com/"):
+            scheduler.report("http://a.com/", 429)
+        started = time.monotonic()
+        async with scheduler.slot("http://b.com/"):
+            return time.monotonic() - started
+
+    assert asyncio.run(main()) < 0.05
@@ -0,0 +1,85 @@
+import json
+import time
+
+from meowdock.cmd.fetch.strategy import EngineStrategy
+
+
+def _strategy(tmp_path, **kwargs) -> EngineStrategy:
+    return EngineStrategy(str(tmp_path / "strategy.json"), **kwargs)
+
+
+def test_engine_is_trusted_after_min_hits(tmp_path):
+    strategy = _strategy(tmp_path, min_hits=2)
+    strategy.record("https://news.example.com/a", "browser")
+    assert strategy.lookup("https://example.com/") is None
+
+    # Hits count per registrable domain
+    strategy.record("https://www.example.com/b", "browser")
+    assert strategy.lookup("https://example.com/") == "browser"
+
+
+def test_switching_engine_starts_over(tmp_path):
+    strategy = _strategy(tmp_path, min_hits=2)
+    for engine in ["browser", "browser", "http"]:
+        strategy.record("https://example.com/", engine)
+    assert strategy.lookup("https://example.com/") is None
+    assert strategy.entries["example.com"]["hits"] == 1
+
+
+def test_entries_expire_from_when_they_were_learned(tmp_path):
+    strategy = _strategy(tmp_path, ttl=100, min_hits=1)
+    strategy.record("https://example.com/", "browser")
+    learned_at = strategy.entries["example.com"]["learned_at"]
+
+    # Confirmations do not extend the lifetime of the entry
+    strategy.entries["example.com"]["learned_at"] = learned_at - 90
+    strategy.record("https://example.com/", "browser")
+    assert strategy.entries["example.com"]["learned_at"] == learned_at - 90
+    assert strategy.lookup("https://example.com/") == "browser"
+
+    strategy.entries["example.com"]["learned_at"] = learned_at - 101
+    assert strategy.lookup("https://example.com/") is None
+    assert "example.com" not in strategy.entries
+
+
+def test_recording_after_expiry_learns_again(tmp_path):
+    strategy = _strategy(tmp_path, ttl=100, min_hits=2)
+    strategy.record("https://example.com/", "browser")
+    strategy.record("https://example.com/", "browser")
+    strategy.entries["example.com"]["learned_at"] -= 200
+
+    strategy.record("https://example.com/", "browser")
+
+    entry = strategy.entries["example.com"]
+    assert entry["hits"] == 1
+    assert time.time() - entry["learned_at"] < 5
+
+
+def test_save_and_load_drop_expired_entries(tmp_path):
+    strategy = _strategy(tmp_path, ttl=100, min_hits=1)
+    strategy.record("https://fresh.com/", "http")
+    strategy.record("https://stale.com/", "browser")
+    strategy.entries["stale.com"]["learned_at"] -= 200
+    strategy.save()
+
+    loaded = _strategy(tmp_path, ttl=100, min_hits=1)
+    assert set(loaded.entries) == {"fresh.com"}
+    assert loaded.lookup("https://fresh.com/") == "http"
+
+
+def test_tables_without_learned_at_use_updated(tmp_path):
+    now = time.time()
+    path = tmp_path / "strategy.json"
+    path.write_text(
+        json.dumps(
+            {
+                "old.com": {"engine": "browser", "hits": 3, "updated": now - 200},
+                "new.com": {"engine": "browser", "hits": 3, "updated": now},
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    strategy = EngineStrategy(str(path), ttl=100)
+    assert strategy.lookup("https://old.com/") is None
+    assert strategy.lookup("https://new.com/") == "browser"
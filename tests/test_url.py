@@ -0,0 +1,57 @@
+import pytest
+
+from meowdock.library.utils.url import get_host, normalize_url, registrable_domain
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("HTTP://Example.COM/a", "http://example.com/a"),
+        ("https://example.com", "https://example.com/"),
+        ("http://example.com:80/a", "http://example.com/a"),
+        ("https://example.com:443/a", "https://example.com/a"),
+        ("https://example.com:8443/a", "https://example.com:8443/a"),
+        ("http://example.com/a#section", "http://example.com/a"),
+        ("http://example.com/?b=2&a=1", "http://example.com/?a=1&b=2"),
+        ("http://example.com/?utm_source=x&UTM_Medium=y&id=1", "http://example.com/?id=1"),
+        ("http://example.com/?a=&b=1", "http://example.com/?a=&b=1"),
+        ("  http://example.com/a  ", "http://example.com/a"),
+    ],
+)
+def test_normalize_url(url, expected):
+    assert normalize_url(url) == expected
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("http://[::1]/", "http://[::1]/"),
+        ("http://[::1]:8080/p", "http://[::1]:8080/p"),
+        ("http://[2001:DB8::1]:80/", "http://[2001:db8::1]/"),
+    ],
+)
+def test_normalize_url_keeps_ipv6_brackets(url, expected):
+    assert normalize_url(url) == expected
+
+
+def test_normalize_url_keeps_invalid_ports_as_written():
+    assert normalize_url("http://example.com:abc/x") == "http://example.com:abc/x"
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("news.sina.com.cn", "sina.com.cn"),
+        ("https://www.example.com/a", "example.com"),
+        ("https://a.b.example.co.uk/", "example.co.uk"),
+        ("http://192.168.0.1:8080/", "192.168.0.1"),
+        ("localhost", "localhost"),
+    ],
+)
+def test_registrable_domain(url, expected):
+    assert registrable_domain(url) == expected
+
+
+def test_get_host_accepts_bare_hosts():
+    assert get_host("WWW.Example.com") == "www.example.com"
+    assert get_host("https://WWW.Example.com:8080/a") == "www.example.com"